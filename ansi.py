@@ -0,0 +1,93 @@
+"""
+ANSI OUTPUT - Raw Escape-Sequence Backend for FrameBuffer
+Bypasses curses output entirely. Each frame's changed runs are turned into
+cursor-move escapes, SGR attributes and glyphs in one buffer that is
+flushed with a single os.write. Curses is still used for input.
+
+Select it with --backend ansi on any game that draws through FrameBuffer.
+"""
+
+import curses
+import os
+import sys
+
+# Curses attribute bits and the SGR codes they map to
+ATTR_CODES = [
+    (curses.A_BOLD, "1"),
+    (curses.A_DIM, "2"),
+    (curses.A_UNDERLINE, "4"),
+    (curses.A_BLINK, "5"),
+    (curses.A_REVERSE, "7"),
+]
+
+
+class AnsiOutput:
+    name = "ansi"
+
+    def __init__(self, fd=None):
+        self.fd = sys.stdout.fileno() if fd is None else fd
+        self.parts = []
+        self.sgr_cache = {}
+        self.sgr = None
+        self.cursor = None
+        self.width = 0
+        # Counters for the last flushed frame, plus running totals
+        self.bytes = self.writes = 0
+        self.total_bytes = self.total_writes = 0
+
+    def sgr_for(self, attr):
+        """Escape sequence for a curses attribute (color pair plus flags), cached."""
+        sgr = self.sgr_cache.get(attr)
+        if sgr is None:
+            codes = ["0"]
+            codes += [code for bit, code in ATTR_CODES if attr & bit]
+            pair = (attr & curses.A_COLOR) >> 8
+            if pair:
+                fg, bg = curses.pair_content(pair)
+                codes.append(str(30 + fg) if 0 <= fg < 8 else "39")
+                codes.append(str(40 + bg) if 0 <= bg < 8 else "49")
+            sgr = self.sgr_cache[attr] = "\x1b[" + ";".join(codes) + "m"
+        return sgr
+
+    def resize(self, h, w):
+        self.width = w
+        self.cursor = None
+        self.parts.append("\x1b[0m\x1b[2J")
+        self.sgr = 0
+
+    def move(self, y, x):
+        """Shortest cursor motion from the tracked position to (y, x)."""
+        if self.cursor == (y, x):
+            return ""
+        if self.cursor is not None:
+            cy, cx = self.cursor
+            if cy == y:
+                dx = x - cx
+                return ("\x1b[C" if dx == 1 else f"\x1b[{dx}C") if dx > 0 else f"\x1b[{-dx}D"
+            if cx == x:
+                dy = y - cy
+                return f"\x1b[{dy}B" if dy > 0 else f"\x1b[{-dy}A"
+        return f"\x1b[{y + 1};{x + 1}H"
+
+    def put(self, y, x, text, attr, bottom_right=False):
+        self.parts.append(self.move(y, x))
+        if attr != self.sgr:
+            self.parts.append(self.sgr_for(attr))
+            self.sgr = attr
+        self.parts.append(text)
+        end = x + len(text)
+        # After the last column the terminal holds a pending wrap, so forget the cursor
+        self.cursor = (y, end) if end < self.width else None
+
+    def flush(self):
+        data = "".join(self.parts).encode("utf-8")
+        self.parts = []
+        writes = 0
+        view = memoryview(data)
+        while view:
+            n = os.write(self.fd, view)
+            view = view[n:]
+            writes += 1
+        self.bytes, self.writes = len(data), writes
+        self.total_bytes += len(data)
+        self.total_writes += writes
@@ -1,6 +1,8 @@
 """
 RETRO ARCADE LAUNCHER - 8-Bit Edition
 Run with: python arcade.py
+          python arcade.py --isolated [--workers N]   (each game in a warm worker process)
+          python arcade.py --bench                   (cold vs warm launch times)
 
 Controls:
 - ARROWS: Navigate
@@ -8,13 +10,22 @@ Controls:
 - Q: Exit Arcade
 """
 
+import argparse
+import array
 import curses
+import importlib
+import signal
+import socket
+import struct
 import subprocess
 import os
 import time
 import sys
 import shutil
 
+import headless
+import runtime
+
 # --- 8-BIT ARCADE HEADER ---
 ARCADE_LOGO = [
     r" █████╗ ██████╗  ██████╗  █████╗ ██████╗ ███████╗",
@@ -35,6 +46,8 @@ GAMES = [
     {"name": "FROGGER CROSS", "file": "frogger.py"},
 ]
 
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+
 
 def get_python_executable():
     """Detect the correct Python executable for cross-platform compatibility."""
@@ -52,26 +65,310 @@ def get_python_executable():
     return sys.executable
 
 
-def draw_shadow_text(stdscr, y, x, lines, color_pair, shadow_pair):
-    for i, line in enumerate(lines):
+class FirstFrameProbe:
+    """Wraps stdscr and timestamps the first refresh a game issues."""
+
+    def __init__(self, stdscr):
+        self._stdscr = stdscr
+        self.first_frame = None
+
+    def refresh(self):
+        if self.first_frame is None:
+            self.first_frame = time.monotonic()
+        return self._stdscr.refresh()
+
+    def __getattr__(self, name):
+        return getattr(self._stdscr, name)
+
+
+def load_game(game):
+    """Imports a game module from GAMES. Modules are cached after the first load."""
+    return importlib.import_module(os.path.splitext(game["file"])[0])
+
+
+def describe_exit(e):
+    """Menu text for whatever ended a game; empty for a clean SystemExit."""
+    if isinstance(e, SystemExit) and e.code in (None, 0):
+        return ""
+    return f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+
+
+def run_in_process(stdscr, game, start):
+    """
+    Runs a game's main(stdscr) on the launcher's own screen.
+    Returns (launch_ms, error) where launch_ms is the time from `start`
+    (a time.monotonic() stamp) to the game's first frame and error is the
+    exception text if it crashed.
+    """
+    probe = FirstFrameProbe(stdscr)
+    error = None
+    try:
+        load_game(game).main(probe)
+    except BaseException as e:
+        # SystemExit (e.g. a --replay of another game) and Ctrl-C end the
+        # game, not the launcher
+        error = describe_exit(e)
+    finally:
+        # Drop the game's schedulers and framebuffers so they don't outlive it
+        runtime.REPORTS.clear()
+    launch_ms = None
+    if probe.first_frame is not None:
+        launch_ms = (probe.first_frame - start) * 1000
+    return launch_ms, error
+
+
+# --- Warm Worker Pool ---
+# Job: game index, monotonic send time, bench flag. Result: launch seconds (-1 if no frame).
+JOB = struct.Struct("<Bd?")
+RESULT = struct.Struct("<d")
+COLD_PROBE = "import sys, arcade; print(arcade.headless_first_frame(sys.argv[1]))"
+
+
+def preload_games():
+    """Imports every module in GAMES so forked workers inherit them warm."""
+    for game in GAMES:
+        load_game(game)
+
+
+def headless_first_frame(name):
+    """
+    Runs a game on a headless screen until its first frame and returns the
+    time.monotonic() stamp of that frame (None if it never drew one).
+    Cold and warm launches in --bench both stop here.
+    """
+    module = importlib.import_module(name)
+    probe = None
+
+    def run(screen):
+        nonlocal probe
+        probe = FirstFrameProbe(screen)
+        module.main(probe)
+
+    headless.run(run, max_frames=1)
+    return probe.first_frame if probe else None
+
+
+def worker_main(job_r, result_w):
+    """Body of a pre-forked worker. Runs one game, reports, and exits."""
+    data = os.read(job_r, JOB.size)
+    if len(data) < JOB.size:
+        os._exit(0)
+    index, sent_at, bench = JOB.unpack(data)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    module = load_game(GAMES[index])
+
+    if bench:
+        first_frame = headless_first_frame(module.__name__)
+        launch = -1.0 if first_frame is None else first_frame - sent_at
+        os.write(result_w, RESULT.pack(launch))
+        os._exit(0)
+
+    probe = None
+    error = ""
+
+    def run(stdscr):
+        nonlocal probe
+        probe = FirstFrameProbe(stdscr)
+        module.main(probe)
+
+    try:
+        curses.wrapper(run)
+    except BaseException as e:
+        error = describe_exit(e)
+    launch = -1.0
+    if probe is not None and probe.first_frame is not None:
+        launch = probe.first_frame - sent_at
+    os.write(result_w, RESULT.pack(launch) + error.encode("utf-8", "replace"))
+    os._exit(0)
+
+
+def send_fds(sock, data, fds):
+    sock.sendmsg([data], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array("i", fds))])
+
+
+def recv_fds(sock, size, count):
+    fds = array.array("i")
+    data, ancdata, _, _ = sock.recvmsg(size, socket.CMSG_LEN(count * fds.itemsize))
+    for level, kind, payload in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(payload[: len(payload) - len(payload) % fds.itemsize])
+    return data, list(fds)
+
+
+def fork_server(sock):
+    """
+    Body of the pool's fork server. It is forked before curses starts and
+    never touches the terminal, so every worker starts from the same clean
+    state no matter how long the launcher has been running. Each byte read
+    from `sock` forks one worker; its job and result pipes are sent back.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Workers are reaped by the kernel; the launcher only sees their pipes
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    while sock.recv(1):
+        job_r, job_w = os.pipe()
+        result_r, result_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            sock.close()
+            os.close(job_w)
+            os.close(result_r)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            try:
+                worker_main(job_r, result_w)
+            finally:
+                os._exit(1)
+        os.close(job_r)
+        os.close(result_w)
+        send_fds(sock, b"W", [job_w, result_r])
+        os.close(job_w)
+        os.close(result_r)
+    os._exit(0)
+
+
+class WarmPool:
+    """
+    Keeps `size` workers parked on a pipe with curses, random and every
+    game already imported. Workers are forked by a fork server that is
+    split off before the launcher starts curses. A launch writes the game
+    index to one of them and a replacement is requested straight away.
+    """
+
+    def __init__(self, size=1):
+        self.size = max(1, size)
+        self.workers = []  # (job_w, result_r)
+        preload_games()
+        self.server, theirs = socket.socketpair()
+        self.server_pid = os.fork()
+        if self.server_pid == 0:
+            self.server.close()
+            try:
+                fork_server(theirs)
+            finally:
+                os._exit(1)
+        theirs.close()
+        self.fill()
+
+    def fill(self):
+        while len(self.workers) < self.size:
+            self.spawn()
+
+    def spawn(self):
+        self.server.sendall(b"F")
+        _, fds = recv_fds(self.server, 1, 2)
+        self.workers.append(tuple(fds))
+
+    def discard(self, job_w, result_r):
+        os.close(job_w)
+        os.close(result_r)
+
+    def launch(self, index, bench=False, sent_at=None):
+        """
+        Hands a game to a warm worker and waits for it to finish.
+        Returns (launch_seconds, error). launch_seconds is None if no frame was drawn.
+        A worker that died while parked is dropped and the next one is tried.
+        """
+        job = JOB.pack(index, time.monotonic() if sent_at is None else sent_at, bench)
+        previous = signal.signal(signal.SIGINT, signal.SIG_IGN)
         try:
-            stdscr.addstr(y + i + 1, x + 1, line, curses.color_pair(shadow_pair))
-            stdscr.addstr(y + i, x, line, curses.color_pair(color_pair) | curses.A_BOLD)
-        except:
-            pass
+            for _ in range(self.size + 1):
+                self.fill()
+                job_w, result_r = self.workers.pop(0)
+                try:
+                    os.write(job_w, job)
+                except BrokenPipeError:
+                    self.discard(job_w, result_r)
+                    continue
+                os.close(job_w)
+                # Get the replacement ready while the game runs
+                self.fill()
+                data = b""
+                while True:
+                    chunk = os.read(result_r, 4096)
+                    if not chunk:
+                        break
+                    data += chunk
+                os.close(result_r)
+                break
+            else:
+                data = b""
+        finally:
+            signal.signal(signal.SIGINT, previous)
 
+        if len(data) < RESULT.size:
+            return None, "WORKER DIED"
+        launch = RESULT.unpack(data[: RESULT.size])[0]
+        error = data[RESULT.size :].decode("utf-8", "replace")
+        return (launch if launch >= 0 else None), error
 
-def main(stdscr):
-    # Setup Colors
+    def close(self):
+        for job_w, result_r in self.workers:
+            self.discard(job_w, result_r)
+        self.workers = []
+        # EOF on the socket ends the fork server
+        self.server.close()
+        os.waitpid(self.server_pid, 0)
+
+
+def cold_launch(game):
+    """Times a fresh interpreter running a game headless up to its first frame."""
+    start = time.monotonic()
+    out = subprocess.run(
+        [get_python_executable(), "-c", COLD_PROBE, os.path.splitext(game["file"])[0]],
+        cwd=GAME_DIR,
+        capture_output=True,
+        text=True,
+    )
+    return float(out.stdout.strip()) - start
+
+
+def bench(rounds=5, workers=1):
+    """
+    Prints median cold (new interpreter) and warm (pre-forked worker) launch
+    times. Both run the game headless up to its first frame.
+    """
+    pool = WarmPool(workers) if hasattr(os, "fork") else None
+    print(f"{'GAME':<18}{'COLD (ms)':>12}{'WARM (ms)':>12}")
+    try:
+        for index, game in enumerate(GAMES):
+            cold = sorted(cold_launch(game) for _ in range(rounds))[rounds // 2]
+            warm_ms = "n/a"
+            if pool:
+                warm = sorted(pool.launch(index, bench=True)[0] for _ in range(rounds))[rounds // 2]
+                warm_ms = f"{warm * 1000:.2f}"
+            print(f"{game['name']:<18}{cold * 1000:>12.2f}{warm_ms:>12}")
+    finally:
+        if pool:
+            pool.close()
+
+
+def setup_screen(stdscr):
+    # Games change input mode and color pairs, so this runs after each one
     curses.curs_set(0)
     stdscr.nodelay(False)
+    stdscr.timeout(-1)
     curses.start_color()
     curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLACK)
     curses.init_pair(2, curses.COLOR_CYAN, curses.COLOR_BLACK)
     curses.init_pair(3, curses.COLOR_GREEN, curses.COLOR_BLACK)
     curses.init_pair(4, curses.COLOR_YELLOW, curses.COLOR_BLACK)
 
+
+def draw_shadow_text(stdscr, y, x, lines, color_pair, shadow_pair):
+    for i, line in enumerate(lines):
+        try:
+            stdscr.addstr(y + i + 1, x + 1, line, curses.color_pair(shadow_pair))
+            stdscr.addstr(y + i, x, line, curses.color_pair(color_pair) | curses.A_BOLD)
+        except:
+            pass
+
+
+def main(stdscr, pool=None):
+    # Setup Colors
+    setup_screen(stdscr)
+
     current_row = 0
+    status = ""
 
     while True:
         sh, sw = stdscr.getmaxyx()
@@ -97,6 +394,8 @@ def main(stdscr):
         # --- Footer ---
         footer = "USE ARROWS TO NAVIGATE • ENTER TO PLAY • Q TO EXIT"
         stdscr.addstr(sh - 3, (sw - len(footer)) // 2, footer, curses.A_DIM)
+        if status:
+            stdscr.addstr(sh - 2, max(0, (sw - len(status)) // 2), status[: sw - 1], curses.color_pair(2))
 
         stdscr.refresh()
 
@@ -109,15 +408,25 @@ def main(stdscr):
         elif key in [ord("\n"), curses.KEY_ENTER, 10, 13]:
             # Launch Game
             game_file = GAMES[current_row]["file"]
-            if os.path.exists(game_file):
-                # Properly exit curses mode before launching subprocess
-                curses.endwin()
-
-                # Execute the game as a separate process using the correct Python executable
-                python_cmd = get_python_executable()
-                subprocess.run([python_cmd, game_file])
+            if os.path.exists(os.path.join(GAME_DIR, game_file)):
+                start = time.monotonic()
+                if pool:
+                    # Hand the terminal to a warm worker process
+                    curses.endwin()
+                    launch, error = pool.launch(current_row, sent_at=start)
+                    launch_ms = launch * 1000 if launch is not None else None
+                else:
+                    # Run the game on the screen we already have; no new interpreter
+                    launch_ms, error = run_in_process(stdscr, GAMES[current_row], start)
+                if error:
+                    status = f"{GAMES[current_row]['name']} CRASHED: {error}"
+                elif launch_ms is not None:
+                    status = f"LAST LAUNCH: {launch_ms:.1f} MS TO FIRST FRAME"
+                else:
+                    status = ""
 
-                # Re-initialize the terminal/screen after game exits
+                # Restore the menu's terminal state after the game returns
+                setup_screen(stdscr)
                 stdscr.clear()
                 stdscr.refresh()
             else:
@@ -134,4 +443,19 @@ def main(stdscr):
 
 
 if __name__ == "__main__":
-    curses.wrapper(main)
+    parser = argparse.ArgumentParser(description="8-bit arcade launcher")
+    parser.add_argument("--isolated", action="store_true", help="run each game in a pre-forked worker process")
+    parser.add_argument("--workers", type=int, default=1, help="number of warm workers kept ready")
+    parser.add_argument("--bench", action="store_true", help="print cold and warm launch times and exit")
+    args = parser.parse_args()
+
+    if args.bench:
+        bench(workers=args.workers)
+    elif args.isolated and hasattr(os, "fork"):
+        pool = WarmPool(args.workers)
+        try:
+            curses.wrapper(main, pool)
+        finally:
+            pool.close()
+    else:
+        curses.wrapper(main)
@@ -3,14 +3,20 @@ BREAKOUTCLI - 8-Bit Edition
 Controls: [ARROWS] Move, [R] Restart, [Q] Quit
 """
 
-import curses
+import math
 import time
 import random
 
-FPS = 60
+from framebuffer import FrameBuffer, draw_shadow_text
+from keys import KEY_LEFT, KEY_RIGHT, curses
+from runtime import FixedStep, FrameScheduler, lerp, options, print_stats
+
+FPS = 60        # Render rate
+TICK_RATE = 60  # Simulation rate; ball speeds are in cells per tick
 BALL = "█"
 PADDLE = "██████"
 BRICK = "██"
+BRICK_TOP, BRICK_ROWS, BRICK_DX = 8, 5, 3  # First brick row, rows, column spacing
 
 LOGO_MAIN = [
     r" ██████╗ ██████╗ ███████╗ █████╗ ██╗  ██╗ ██████╗ ██╗   ██╗████████╗ ██████╗██╗     ██╗",
@@ -21,102 +27,193 @@ LOGO_MAIN = [
     r" ╚═════╝ ╚═╝  ╚═╝╚══════╝╚═╝  ╚═╝╚═╝  ╚═╝ ╚═════╝  ╚═════╝    ╚═╝    ╚═════╝╚══════╝╚═╝"
 ]
 
-def draw_shadow_text(stdscr, y, x, lines, color_pair, shadow_pair):
-    for i, line in enumerate(lines):
-        try:
-            stdscr.addstr(y + i + 1, x + 1, line, curses.color_pair(shadow_pair))
-            stdscr.addstr(y + i, x, line, curses.color_pair(color_pair) | curses.A_BOLD)
-        except: pass
+def draw_static(screen):
+    """Header. Cached by the framebuffer, redrawn only on resize."""
+    sh, sw = screen.getmaxyx()
+    draw_shadow_text(screen, 1, (sw - len(LOGO_MAIN[0])) // 2, LOGO_MAIN, 1, 2)
 
 class Breakout:
-    def __init__(self, h, w):
+    """
+    Bricks live in a grid: one bytearray per row, holding each brick's
+    colour pair (0 once it is gone), so the ball finds the brick under it
+    by index. Brick c of a row covers x = 2 + 3c to 2 + 3c + 2.
+
+    The ball moves in sub-steps of at most one cell, each checked against
+    walls, paddle and bricks, so a fast ball cannot pass through them
+    between ticks. Below one cell per tick this is a single step, as before.
+    """
+
+    def __init__(self, h, w, rng=None, rows=BRICK_ROWS):
+        self.rng = rng or random.Random()
         self.h, self.w = h, w
         self.px = w // 2 - 3
         self.bx, self.by = float(w // 2), float(h - 5)
         self.vx, self.vy = 0.6, -0.4
-        self.bricks = []
-        for y in range(8, 13):
-            for x in range(2, w - 4, 3):
-                self.bricks.append([x, y, random.randint(3, 5)])
+        self.prev_ball = (self.bx, self.by)
+        cols = len(range(2, w - 4, BRICK_DX))
+        self.grid = [bytearray(self.rng.randint(3, 5) for _ in range(cols)) for _ in range(rows)]
+        self.count = rows * cols
         self.score = 0
         self.lives = 3
 
-    def update(self, key):
-        if key == curses.KEY_LEFT and self.px > 1: self.px -= 2
-        if key == curses.KEY_RIGHT and self.px < self.w - 7: self.px += 2
-
-        self.bx += self.vx
-        self.by += self.vy
+    def bricks(self):
+        """(x, y, colour) of every standing brick."""
+        for r, row in enumerate(self.grid):
+            for c, colour in enumerate(row):
+                if colour: yield 2 + c * BRICK_DX, BRICK_TOP + r, colour
+
+    def brick_at(self, x, y):
+        """(row, col) of the standing brick covering (x, y), or None."""
+        r = int(y) - BRICK_TOP
+        if not 0 <= r < len(self.grid): return None
+        c = int((x - 2) // BRICK_DX)
+        row = self.grid[r]
+        if 0 <= c < len(row) and row[c] and x - (2 + c * BRICK_DX) <= 2: return r, c
+        return None
+
+    def resize(self, sh, sw):
+        """Re-clips bricks, paddle and ball to a new screen size without restarting the round."""
+        self.h, self.w = h, w = sh, sw
+        for row in self.grid:
+            for c in range(len(row)):
+                if row[c] and 2 + c * BRICK_DX + 2 >= w - 1:
+                    row[c] = 0
+                    self.count -= 1
+        self.px = max(1, min(self.px, w - 7))
+        self.bx = max(2.0, min(self.bx, w - 3.0))
+        self.by = min(self.by, h - 4.0)
+        self.prev_ball = (self.bx, self.by)
+
+    def step(self, key):
+        """One fixed tick. False once the last life is lost or every brick is gone."""
+        self.prev_ball = (self.bx, self.by)
+        return self.update(key) and self.count > 0
 
-        # Walls
-        if self.bx <= 1 or self.bx >= self.w - 2: self.vx *= -1
-        if self.by <= 8: self.vy *= -1
-
-        # Paddle
-        if int(self.by) == self.h - 3 and self.px <= self.bx <= self.px + 6:
-            self.vy = -abs(self.vy)
-            self.vx += (self.bx - (self.px + 3)) * 0.1
-
-        # Bricks
-        for b in self.bricks[:]:
-            if int(self.by) == b[1] and b[0] <= self.bx <= b[0] + 2:
-                self.bricks.remove(b)
+    def update(self, key):
+        if key == KEY_LEFT and self.px > 1: self.px -= 2
+        if key == KEY_RIGHT and self.px < self.w - 7: self.px += 2
+
+        steps = max(1, math.ceil(max(abs(self.vx), abs(self.vy))))
+        paddled = False
+        for _ in range(steps):
+            self.bx += self.vx / steps
+            self.by += self.vy / steps
+
+            # Walls
+            if self.bx <= 1 or self.bx >= self.w - 2: self.vx *= -1
+            if self.by <= 8: self.vy *= -1
+
+            # Paddle, deflecting once per tick however many sub-steps touch it
+            if not paddled and int(self.by) == self.h - 3 and self.px <= self.bx <= self.px + 6:
+                self.vy = -abs(self.vy)
+                self.vx += (self.bx - (self.px + 3)) * 0.1
+                paddled = True
+
+            # Bricks
+            hit = self.brick_at(self.bx, self.by)
+            if hit:
+                r, c = hit
+                self.grid[r][c] = 0
+                self.count -= 1
                 self.vy *= -1
                 self.score += 50
-                break
 
-        if self.by >= self.h:
-            self.lives -= 1
-            self.bx, self.by = float(self.px + 3), float(self.h - 5)
-            self.vy = -0.4
-            if self.lives <= 0: return False
+            if self.by >= self.h:
+                self.lives -= 1
+                self.bx, self.by = float(self.px + 3), float(self.h - 5)
+                self.prev_ball = (self.bx, self.by)
+                self.vy = -0.4
+                return self.lives > 0
         return True
 
+def new_game(sh, sw, rng=None):
+    """A fresh round laid out for an sh x sw screen."""
+    return Breakout(sh, sw, rng)
+
 def main(stdscr):
     curses.curs_set(0)
     stdscr.nodelay(True)
-    stdscr.timeout(1000 // FPS)
     curses.start_color()
     curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLACK)
     curses.init_pair(2, curses.COLOR_CYAN, curses.COLOR_BLACK)
     curses.init_pair(3, curses.COLOR_YELLOW, curses.COLOR_BLACK)
     curses.init_pair(4, curses.COLOR_GREEN, curses.COLOR_BLACK)
     curses.init_pair(5, curses.COLOR_RED, curses.COLOR_BLACK)
+    screen = FrameBuffer(stdscr, background=draw_static)
+    clock = FrameScheduler(FPS, "breakout")
+    sim = FixedStep(TICK_RATE, "breakout")
 
     while True:
+        stdscr.nodelay(True)
         sh, sw = stdscr.getmaxyx()
-        game = Breakout(sh, sw)
-        
+        game = sim.start(new_game, sh, sw)
+        playing = True
+
         while True:
             key = stdscr.getch()
             if key in [ord('q'), ord('Q')]: return
-            if not game.update(key): break
-            if not game.bricks: break
-
-            stdscr.erase()
-            logo_x = (sw - len(LOGO_MAIN[0])) // 2
-            draw_shadow_text(stdscr, 1, logo_x, LOGO_MAIN, 1, 2)
-
-            # Draw Bricks
-            for b in game.bricks:
-                stdscr.addstr(b[1], b[0], BRICK, curses.color_pair(b[2]))
+            if key == curses.KEY_RESIZE:
+                sh, sw = stdscr.getmaxyx()
+                sim.resize(sh, sw)
+            else:
+                sim.feed(key)
+            for k in sim.ticks():
+                if not game.step(k):
+                    playing = False
+                    break
+            if not playing: break
+
+            if clock.render_due():
+                screen.erase()
+
+                # Draw Bricks
+                for x, y, colour in game.bricks():
+                    screen.addstr(y, x, BRICK, curses.color_pair(colour))
             
-            # Draw Paddle
-            stdscr.addstr(sh - 3, game.px, PADDLE, curses.color_pair(4))
-            # Draw Ball
-            if 0 <= int(game.by) < sh and 0 <= int(game.bx) < sw:
-                stdscr.addstr(int(game.by), int(game.bx), BALL, curses.color_pair(1))
-
-            stdscr.addstr(7, 2, f"SCORE: {game.score}   LIVES: {game.lives}", curses.A_BOLD)
-            stdscr.refresh()
-
-        stdscr.addstr(sh // 2 + 5, sw // 2 - 5, "GAME OVER", curses.A_REVERSE)
-        stdscr.addstr(sh // 2 + 6, sw // 2 - 11, "Press 'R' to Restart", curses.A_BOLD)
-        stdscr.refresh()
+                # Draw Paddle
+                screen.addstr(sh - 3, game.px, PADDLE, curses.color_pair(4))
+                # Draw Ball
+                bx = int(lerp(game.prev_ball[0], game.bx, sim.alpha))
+                by = int(lerp(game.prev_ball[1], game.by, sim.alpha))
+                if 0 <= by < sh and 0 <= bx < sw:
+                    screen.addstr(by, bx, BALL, curses.color_pair(1))
+
+                screen.addstr(7, 2, f"SCORE: {game.score}   LIVES: {game.lives}", curses.A_BOLD)
+                screen.refresh()
+            clock.wait()
+
+        screen.addstr(sh // 2 + 5, sw // 2 - 5, "GAME OVER", curses.A_REVERSE)
+        screen.addstr(sh // 2 + 6, sw // 2 - 11, "Press 'R' to Restart", curses.A_BOLD)
+        screen.refresh()
+        # A replay moves on to its next recorded round by itself
+        stdscr.timeout(1000 if sim.replaying else -1)
         while True:
             key = stdscr.getch()
-            if key in [ord('r'), ord('R')]: break
+            if key in [ord('r'), ord('R')] or (key == -1 and sim.replaying): break
             if key in [ord('q'), ord('Q')]: return
 
+def bench(ticks=2000):
+    """
+    Tick cost on the standard wall and a 200 x 50 one, at ball speeds up
+    to 8 cells a tick, with the paddle kept under the ball so nothing is
+    lost. Run: python breakout.py --bench
+    """
+    print(f"{'WALL':>8}{'VX':>6}{'US/TICK':>9}{'HITS':>6}")
+    for rows, cols in [(BRICK_ROWS, 32), (50, 200)]:
+        for vx in (0.6, 3.0, 8.0):
+            game = Breakout(BRICK_TOP + rows + 30, cols * BRICK_DX + 6, random.Random(0), rows)
+            game.vx = vx
+            bricks = game.count
+            started = time.perf_counter()
+            for tick in range(1, ticks + 1):
+                game.px = max(1, min(int(game.bx) - 3, game.w - 7))
+                if not game.update(-1) or not game.count: break
+            elapsed = time.perf_counter() - started
+            print(f"{cols:>4}x{rows:<3}{vx:>6.1f}{elapsed / tick * 1e6:>9.1f}{bricks - game.count:>6}")
+
 if __name__ == "__main__":
-    curses.wrapper(main)
+    if options().bench:
+        bench()
+    else:
+        curses.wrapper(main)
+        print_stats()
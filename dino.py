@@ -9,9 +9,11 @@ Controls:
 """
 
 import curses
-import time
 import random
 
+from framebuffer import Sprite, addstr_clipped, blit, draw_shadow_text
+from runtime import FrameScheduler, pause, print_stats
+
 # --- 8-BIT BLOCKY LOGO (Shadowed) ---
 LOGO_MAIN = [
     r" ██████╗ ██╗███╗   ██╗ ██████╗  ██████╗██╗     ██╗",
@@ -23,50 +25,50 @@ LOGO_MAIN = [
 ]
 
 # --- 8-BIT SPRITES ---
-DINO_RUN1 = [
+DINO_RUN1 = Sprite([
     r"      ███████",
     r"      ███ ███",
     r"      ███████",
     r"███████████  ",
     r"███████████  ",
     r"  ███   ███  "
-]
+])
 
-DINO_RUN2 = [
+DINO_RUN2 = Sprite([
     r"      ███████",
     r"      ███ ███",
     r"      ███████",
     r"███████████  ",
     r"███████████  ",
     r"    ███   ███"
-]
+])
 
-DINO_JUMP = [
+DINO_JUMP = Sprite([
     r"      ███████",
     r"      ███ ███",
     r"      ███████",
     r"███████████  ",
     r"███████████  ",
     r"  █████████  "
-]
+])
 
-DINO_DEAD = [
+DINO_DEAD = Sprite([
     r"      ███████",
     r"      ███X███",
     r"      ███████",
     r"███████████  ",
     r"███████████  ",
     r"  ███   ███  "
-]
+])
 
-CACTUS = [
+CACTUS = Sprite([
     r"  ███  ",
     r"  ███  ",
     r"███████",
     r"  ███  ",
     r"  ███  ",
     r"  ███  "
-]
+])
 
 # --- Constants ---
 GRAVITY = 0.6
@@ -100,6 +102,13 @@ class Dino:
                 self.is_jumping = False
         self.frame = (self.frame + 1) % 12
 
+    def move_ground(self, ground_y):
+        """Keeps the dino on the ground when the terminal height changes."""
+        shift = ground_y - self.ground_y
+        self.ground_y = ground_y
+        self.base_y += shift
+        self.y += shift
+
     def get_sprite(self, dead=False):
         if dead: return DINO_DEAD
         if self.is_jumping: return DINO_JUMP
@@ -108,31 +117,18 @@ class Dino:
 class Obstacle:
     def __init__(self, x, ground_y):
         self.sprite = CACTUS
-        self.width = len(self.sprite[0])
-        self.height = len(self.sprite)
+        self.width = self.sprite.width
+        self.height = self.sprite.height
         self.x = float(x)
         self.y = float(ground_y - self.height + 1)
 
     def update(self, speed):
         self.x -= speed
 
-def draw_shadow_text(stdscr, y, x, lines, color_pair, shadow_pair):
-    """Draws text with a drop-shadow effect."""
-    for i, line in enumerate(lines):
-        # Draw shadow first (offset by 1,1)
-        try:
-            stdscr.addstr(y + i + 1, x + 1, line, curses.color_pair(shadow_pair))
-        except: pass
-        # Draw main text
-        try:
-            stdscr.addstr(y + i, x, line, curses.color_pair(color_pair) | curses.A_BOLD)
-        except: pass
-
 def main(stdscr):
     # Setup Colors
     curses.curs_set(0)
     stdscr.nodelay(True)
-    stdscr.timeout(1000 // FPS)
     
     curses.start_color()
     # Color Pairs: (ID, Foreground, Background)
@@ -142,16 +138,18 @@ def main(stdscr):
     curses.init_pair(3, curses.COLOR_CYAN, curses.COLOR_BLACK)   # Shadow color
     curses.init_pair(4, curses.COLOR_GREEN, curses.COLOR_BLACK)  # Dino
     curses.init_pair(5, curses.COLOR_RED, curses.COLOR_BLACK)    # Game Over Shadow
+    clock = FrameScheduler(FPS, "dino")
 
     high_score = 0
 
     while True:
+        stdscr.nodelay(True)
         sh, sw = stdscr.getmaxyx()
         if sh < MIN_HEIGHT or sw < MIN_WIDTH:
             stdscr.erase()
-            stdscr.addstr(0, 0, f"Resize terminal: {sw}/{MIN_WIDTH} x {sh}/{MIN_HEIGHT}")
+            addstr_clipped(stdscr, 0, 0, f"Resize terminal: {sw}/{MIN_WIDTH} x {sh}/{MIN_HEIGHT}")
             stdscr.refresh()
-            time.sleep(1)
+            pause(1)
             continue
 
         ground_y = sh - 6
@@ -165,6 +163,18 @@ def main(stdscr):
         while state == "PLAYING":
             key = stdscr.getch()
             if key in [ord('q'), ord('Q')]: return
+            if key == curses.KEY_RESIZE:
+                sh, sw = stdscr.getmaxyx()
+                for obs in obstacles: obs.y += sh - 6 - ground_y
+                ground_y = sh - 6
+                dino.move_ground(ground_y)
+            if sh < MIN_HEIGHT or sw < MIN_WIDTH:
+                # Too small to play: hold the round until the terminal grows back
+                stdscr.erase()
+                addstr_clipped(stdscr, 0, 0, f"Resize terminal: {sw}/{MIN_WIDTH} x {sh}/{MIN_HEIGHT}")
+                stdscr.refresh()
+                clock.wait()
+                continue
             if key in [ord(' '), curses.KEY_UP]: dino.jump()
 
             dino.update()
@@ -185,32 +195,29 @@ def main(stdscr):
                     dy < obs.y + obs.height and dy + 6 > obs.y):
                     state = "DEAD"
 
-            stdscr.erase()
+            if clock.render_due():
+                stdscr.erase()
             
-            # --- Draw Header with Shadow ---
-            draw_shadow_text(stdscr, 1, (sw - len(LOGO_MAIN[0])) // 2, LOGO_MAIN, 1, 3)
+                # --- Draw Header with Shadow ---
+                draw_shadow_text(stdscr, 1, (sw - len(LOGO_MAIN[0])) // 2, LOGO_MAIN, 1, 3)
             
-            # --- Draw Ground ---
-            stdscr.addstr(ground_y + 1, 0, "█" * (sw - 1), curses.color_pair(1))
+                # --- Draw Ground ---
+                addstr_clipped(stdscr, ground_y + 1, 0, "█" * (sw - 1), curses.color_pair(1))
             
-            # --- Draw Obstacles ---
-            for obs in obstacles:
-                for i, line in enumerate(obs.sprite):
-                    if 0 <= int(obs.x) < sw - len(line):
-                        stdscr.addstr(int(obs.y) + i, int(obs.x), line, curses.color_pair(4))
+                # --- Draw Obstacles ---
+                for obs in obstacles:
+                    blit(stdscr, int(obs.y), int(obs.x), obs.sprite, curses.color_pair(4))
             
-            # --- Draw Dino ---
-            sprite = dino.get_sprite()
-            for i, line in enumerate(sprite):
-                if 0 <= int(dino.x) < sw - len(line):
-                    stdscr.addstr(int(dino.y) + i, int(dino.x), line, curses.color_pair(4))
+                # --- Draw Dino (spaces are transparent, so overlapping cacti stay visible) ---
+                blit(stdscr, int(dino.y), int(dino.x), dino.get_sprite(), curses.color_pair(4))
                 
-            # --- Draw HUD ---
-            high_score = max(high_score, int(score))
-            hud = f" 🏆 SCORE: {int(score):05}   HI: {high_score:05} "
-            stdscr.addstr(sh - 2, (sw - len(hud)) // 2, hud, curses.A_REVERSE | curses.A_BOLD)
+                # --- Draw HUD ---
+                high_score = max(high_score, int(score))
+                hud = f" 🏆 SCORE: {int(score):05}   HI: {high_score:05} "
+                addstr_clipped(stdscr, sh - 2, (sw - len(hud)) // 2, hud, curses.A_REVERSE | curses.A_BOLD)
             
-            stdscr.refresh()
+                stdscr.refresh()
+            clock.wait()
 
         # --- Game Over Screen ---
         stdscr.attron(curses.A_BOLD)
@@ -229,9 +236,10 @@ def main(stdscr):
         draw_shadow_text(stdscr, sh // 2 - 5, (sw - len(go_lines[0])) // 2, go_lines, 1, 5)
         
         retry = "PRESS 'R' TO RESTART OR 'Q' TO QUIT"
-        stdscr.addstr(sh // 2 + 6, (sw - len(retry)) // 2, retry, curses.A_BOLD)
+        addstr_clipped(stdscr, sh // 2 + 6, (sw - len(retry)) // 2, retry, curses.A_BOLD)
         stdscr.refresh()
 
+        stdscr.nodelay(False)
         while True:
             key = stdscr.getch()
             if key in [ord('r'), ord('R')]: break
@@ -239,3 +247,4 @@ def main(stdscr):
 
 if __name__ == "__main__":
     curses.wrapper(main)
+    print_stats()
@@ -8,10 +8,12 @@ Controls:
 - Q: Quit
 """
 
-import curses
-import time
 import random
 
+from framebuffer import FrameBuffer, Sprite, blit, draw_shadow_text
+from keys import KEY_UP, curses
+from runtime import FixedStep, FrameScheduler, lerp, pause, print_stats
+
 # --- 8-BIT BLOCKY LOGO (Shadowed) ---
 LOGO_MAIN = [
     r" ██████╗ ██╗███╗   ██╗ ██████╗  ██████╗██╗     ██╗",
@@ -23,57 +25,63 @@ LOGO_MAIN = [
 ]
 
 # --- 8-BIT SPRITES ---
-DINO_RUN1 = [
+DINO_RUN1 = Sprite([
     r"      ███████",
     r"      ███ ███",
     r"      ███████",
     r"███████████  ",
     r"███████████  ",
     r"  ███   ███  "
-]
+])
 
-DINO_RUN2 = [
+DINO_RUN2 = Sprite([
     r"      ███████",
     r"      ███ ███",
     r"      ███████",
     r"███████████  ",
     r"███████████  ",
     r"    ███   ███"
-]
+])
 
-DINO_JUMP = [
+DINO_JUMP = Sprite([
     r"      ███████",
     r"      ███ ███",
     r"      ███████",
     r"███████████  ",
     r"███████████  ",
     r"  █████████  "
-]
+])
 
-DINO_DEAD = [
+DINO_DEAD = Sprite([
     r"      ███████",
     r"      ███X███",
     r"      ███████",
     r"███████████  ",
     r"███████████  ",
     r"  ███   ███  "
-]
+])
 
-CACTUS = [
+CACTUS = Sprite([
     r"  ███  ",
     r"  ███  ",
     r"███████",
     r"  ███  ",
     r"  ███  ",
     r"  ███  "
-]
+])
 
 # --- Constants ---
 GRAVITY = 0.6
 JUMP_STRENGTH = -4.5  # Increased jump strength to overcome cactus easily
-FPS = 45 
+FPS = 60        # Render rate
+TICK_RATE = 45  # Simulation rate; gravity, jump and speeds are per tick
 MIN_WIDTH = 85
 MIN_HEIGHT = 26
+# Difficulty: run speed (cells per tick) grows per cactus cleared, up to a cap
+SPEED_START = 2.0  # Increased from 1.2
+SPEED_MAX = 5.0
+CACTI_PER_SPEED = 10  # Cacti jumped per +1 speed
+SPAWN_TICKS = (35, 70)  # Ticks between cacti, drawn uniformly
 
 class Dino:
     def __init__(self, x, ground_y):
@@ -81,6 +89,7 @@ class Dino:
         self.ground_y = ground_y
         self.y = float(ground_y - 6)
         self.base_y = self.y
+        self.prev_y = self.y
         self.velocity = 0.0
         self.is_jumping = False
         self.frame = 0
@@ -100,6 +109,14 @@ class Dino:
                 self.is_jumping = False
         self.frame = (self.frame + 1) % 12
 
+    def move_ground(self, ground_y):
+        """Keeps the dino on the ground when the terminal height changes."""
+        shift = ground_y - self.ground_y
+        self.ground_y = ground_y
+        self.base_y += shift
+        self.y += shift
+        self.prev_y += shift
+
     def get_sprite(self, dead=False):
         if dead: return DINO_DEAD
         if self.is_jumping: return DINO_JUMP
@@ -108,31 +125,80 @@ class Dino:
 class Obstacle:
     def __init__(self, x, ground_y):
         self.sprite = CACTUS
-        self.width = len(self.sprite[0])
-        self.height = len(self.sprite)
+        self.width = self.sprite.width
+        self.height = self.sprite.height
         self.x = float(x)
+        self.prev_x = self.x
         self.y = float(ground_y - self.height + 1)
 
     def update(self, speed):
         self.x -= speed
 
-def draw_shadow_text(stdscr, y, x, lines, color_pair, shadow_pair):
-    """Draws text with a drop-shadow effect."""
-    for i, line in enumerate(lines):
-        # Draw shadow first (offset by 1,1)
-        try:
-            stdscr.addstr(y + i + 1, x + 1, line, curses.color_pair(shadow_pair))
-        except: pass
-        # Draw main text
-        try:
-            stdscr.addstr(y + i, x, line, curses.color_pair(color_pair) | curses.A_BOLD)
-        except: pass
+class DinoRun:
+    """One round: the dino, the cacti, score and speed. step() advances one tick."""
+
+    def __init__(self, sh, sw, rng=None):
+        self.rng = rng or random.Random()
+        self.sw = sw
+        self.ground_y = sh - 6
+        self.dino = Dino(12, self.ground_y)
+        self.obstacles = []
+        self.score = 0
+        self.speed = SPEED_START
+        self.spawn_timer = 0
+        self.dead = False
+
+    def resize(self, sh, sw):
+        """Moves the ground line, and everything standing on it, to a new screen size."""
+        for obs in self.obstacles: obs.y += sh - 6 - self.ground_y
+        self.ground_y = sh - 6
+        self.sw = sw
+        self.dino.move_ground(self.ground_y)
+
+    def step(self, key):
+        """One fixed tick. False once the dino has hit a cactus."""
+        dino = self.dino
+        if key in [ord(' '), KEY_UP]: dino.jump()
+
+        dino.prev_y = dino.y
+        dino.update()
+
+        # Increased speed scaling based on cacti jumped over
+        self.speed = min(SPEED_MAX, SPEED_START + self.score / CACTI_PER_SPEED)
+
+        self.spawn_timer -= 1
+        if self.spawn_timer <= 0:
+            self.obstacles.append(Obstacle(self.sw - 8, self.ground_y))
+            self.spawn_timer = self.rng.randint(*SPAWN_TICKS)
+
+        for obs in self.obstacles[:]:
+            obs.prev_x = obs.x
+            obs.update(self.speed)
+            if obs.x < -8:
+                self.obstacles.remove(obs)
+                self.score += 1 # Increment score based on number of cactus jumped over
+
+            # Collision Logic
+            dx, dy = int(dino.x) + 2, int(dino.y)
+            if (dx < obs.x + obs.width and dx + 10 > obs.x and
+                dy < obs.y + obs.height and dy + 6 > obs.y):
+                self.dead = True
+        return not self.dead
+
+def new_game(sh, sw, rng=None):
+    """A fresh round laid out for an sh x sw screen."""
+    return DinoRun(sh, sw, rng)
+
+def draw_static(screen):
+    """Header and ground line. Cached by the framebuffer, redrawn only on resize."""
+    sh, sw = screen.getmaxyx()
+    draw_shadow_text(screen, 1, (sw - len(LOGO_MAIN[0])) // 2, LOGO_MAIN, 1, 3)
+    screen.addstr(sh - 5, 0, "█" * (sw - 1), curses.color_pair(1))
 
 def main(stdscr):
     # Setup Colors
     curses.curs_set(0)
     stdscr.nodelay(True)
-    stdscr.timeout(1000 // FPS)
     
     curses.start_color()
     # Color Pairs: (ID, Foreground, Background)
@@ -142,83 +208,58 @@ def main(stdscr):
     curses.init_pair(3, curses.COLOR_CYAN, curses.COLOR_BLACK)   # Shadow color
     curses.init_pair(4, curses.COLOR_GREEN, curses.COLOR_BLACK)  # Dino
     curses.init_pair(5, curses.COLOR_RED, curses.COLOR_BLACK)    # Game Over Shadow
+    screen = FrameBuffer(stdscr, background=draw_static)
+    clock = FrameScheduler(FPS, "dino2")
+    sim = FixedStep(TICK_RATE, "dino2")
 
     high_score = 0
 
     while True:
+        stdscr.nodelay(True)
         sh, sw = stdscr.getmaxyx()
         if sh < MIN_HEIGHT or sw < MIN_WIDTH:
-            stdscr.erase()
-            stdscr.addstr(0, 0, f"Resize terminal: {sw}/{MIN_WIDTH} x {sh}/{MIN_HEIGHT}")
-            stdscr.refresh()
-            time.sleep(1)
+            screen.erase()
+            screen.addstr(0, 0, f"Resize terminal: {sw}/{MIN_WIDTH} x {sh}/{MIN_HEIGHT}")
+            screen.refresh()
+            pause(1)
             continue
 
-        ground_y = sh - 6
-        dino = Dino(12, ground_y)
-        obstacles = []
-        score = 0
-        speed = 2.0  # Increased from 1.2
-        spawn_timer = 0
-        state = "PLAYING"
+        game = sim.start(new_game, sh, sw)
+        dino = game.dino
 
-        while state == "PLAYING":
+        while not game.dead:
             key = stdscr.getch()
             if key in [ord('q'), ord('Q')]: return
-            if key in [ord(' '), curses.KEY_UP]: dino.jump()
+            if key == curses.KEY_RESIZE:
+                sh, sw = stdscr.getmaxyx()
+                sim.resize(sh, sw)
+            else:
+                sim.feed(key)
+            for k in sim.ticks():
+                if not game.step(k): break
 
-            dino.update()
-            
-            # Increased speed scaling based on cacti jumped over
-            speed = min(5.0, 2.0 + (score / 10)) 
-            
-            spawn_timer -= 1
-            if spawn_timer <= 0:
-                obstacles.append(Obstacle(sw - 8, ground_y))
-                spawn_timer = random.randint(35, 70)
-
-            for obs in obstacles[:]:
-                obs.update(speed)
-                if obs.x < -8:
-                    obstacles.remove(obs)
-                    score += 1 # Increment score based on number of cactus jumped over
-                
-                # Collision Logic
-                dx, dy = int(dino.x) + 2, int(dino.y)
-                if (dx < obs.x + obs.width and dx + 10 > obs.x and 
-                    dy < obs.y + obs.height and dy + 6 > obs.y):
-                    state = "DEAD"
-
-            stdscr.erase()
-            
-            # --- Draw Header with Shadow ---
-            draw_shadow_text(stdscr, 1, (sw - len(LOGO_MAIN[0])) // 2, LOGO_MAIN, 1, 3)
-            
-            # --- Draw Ground ---
-            stdscr.addstr(ground_y + 1, 0, "█" * (sw - 1), curses.color_pair(1))
+            if clock.render_due():
+                # Header and ground come from the cached background layer
+                screen.erase()
             
-            # --- Draw Obstacles ---
-            for obs in obstacles:
-                for i, line in enumerate(obs.sprite):
-                    if 0 <= int(obs.x) < sw - len(line):
-                        stdscr.addstr(int(obs.y) + i, int(obs.x), line, curses.color_pair(4))
+                # --- Draw Obstacles ---
+                # Positions are interpolated between the last two ticks
+                for obs in game.obstacles:
+                    blit(screen, int(obs.y), int(lerp(obs.prev_x, obs.x, sim.alpha)), obs.sprite, curses.color_pair(4))
             
-            # --- Draw Dino ---
-            sprite = dino.get_sprite()
-            for i, line in enumerate(sprite):
-                if 0 <= int(dino.x) < sw - len(line):
-                    stdscr.addstr(int(dino.y) + i, int(dino.x), line, curses.color_pair(4))
+                # --- Draw Dino (spaces are transparent, so overlapping cacti stay visible) ---
+                blit(screen, int(lerp(dino.prev_y, dino.y, sim.alpha)), int(dino.x), dino.get_sprite(), curses.color_pair(4))
                 
-            # --- Draw HUD ---
-            high_score = max(high_score, int(score))
-            # Removed highscore emoji
-            hud = f" SCORE: {int(score):05}   HI: {high_score:05} "
-            stdscr.addstr(sh - 2, (sw - len(hud)) // 2, hud, curses.A_REVERSE | curses.A_BOLD)
+                # --- Draw HUD ---
+                high_score = max(high_score, int(game.score))
+                # Removed highscore emoji
+                hud = f" SCORE: {int(game.score):05}   HI: {high_score:05} "
+                screen.addstr(sh - 2, (sw - len(hud)) // 2, hud, curses.A_REVERSE | curses.A_BOLD)
             
-            stdscr.refresh()
+                screen.refresh()
+            clock.wait()
 
         # --- Game Over Screen ---
-        stdscr.attron(curses.A_BOLD)
         go_lines = [
             r"  ▄████  ▄▄▄       ███▄ ▄███▓▓█████     ▒█████   ██▒   █▓▓█████  ██▀███  ",
             r" ██▒ ▀█▒▒████▄    ▓██▒▀█▀ ██▒▓█   ▀    ▒██▒  ██▒▓██░   █▒▓█   ▀ ▓██ ▒ ██▒",
@@ -231,16 +272,19 @@ def main(stdscr):
             r"      ░       ░  ░       ░      ░  ░         ░ ░        ░     ░  ░   ░     "
         ]
         
-        draw_shadow_text(stdscr, sh // 2 - 5, (sw - len(go_lines[0])) // 2, go_lines, 1, 5)
+        draw_shadow_text(screen, sh // 2 - 5, (sw - len(go_lines[0])) // 2, go_lines, 1, 5)
         
         retry = "PRESS 'R' TO RESTART OR 'Q' TO QUIT"
-        stdscr.addstr(sh // 2 + 6, (sw - len(retry)) // 2, retry, curses.A_BOLD)
-        stdscr.refresh()
+        screen.addstr(sh // 2 + 6, (sw - len(retry)) // 2, retry, curses.A_BOLD)
+        screen.refresh()
 
+        # A replay moves on to its next recorded round by itself
+        stdscr.timeout(1000 if sim.replaying else -1)
         while True:
             key = stdscr.getch()
-            if key in [ord('r'), ord('R')]: break
+            if key in [ord('r'), ord('R')] or (key == -1 and sim.replaying): break
             if key in [ord('q'), ord('Q')]: return
 
 if __name__ == "__main__":
     curses.wrapper(main)
+    print_stats()
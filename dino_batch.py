@@ -0,0 +1,237 @@
+"""
+DINO BATCH - Vectorized Dino Worlds
+Holds N independent dino2 rounds as NumPy arrays (dino height, velocity,
+jumping flag, cactus positions, score, speed, spawn timer) and advances
+all of them with one step() of array operations, collision test included.
+Used to score populations of jump policies at millions of world-steps
+per second, where tournament.py plays one Python world at a time.
+
+World i follows DinoRun(sh, sw, SeededRandom(seeds[i])) tick for tick:
+the xorshift64* generator behind SeededRandom.randint runs here as uint64
+arrays, so both engines draw the same cactus gaps. --check steps both
+side by side and compares every field.
+
+Needs NumPy (pip install numpy); the games themselves do not.
+
+Run with: python dino_batch.py --worlds 30000 --ticks 1000 --policy jumper
+          python dino_batch.py --check 300 --ticks 3000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import dino2
+from dino2 import DinoRun
+from replay import SeededRandom
+
+# --- Seeded RNG, one stream per world ---
+XORSHIFT_MUL = np.uint64(0x2545F4914F6CDD1D)
+
+
+def splitmix64(seeds):
+    """SeededRandom.seed() for an array of seeds -> initial xorshift states."""
+    z = np.asarray(seeds, dtype=np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z = z ^ (z >> np.uint64(31))
+    z[z == 0] = 1
+    return z
+
+
+def next64(state):
+    """Advances the states in place and returns one output per state."""
+    state ^= state >> np.uint64(12)
+    state ^= state << np.uint64(25)
+    state ^= state >> np.uint64(27)
+    return state * XORSHIFT_MUL
+
+
+def randint(state, lo, hi):
+    """SeededRandom.randint(lo, hi) for every state: rejection sampling on the top bits."""
+    n = hi - lo + 1
+    shift = np.uint64(64 - n.bit_length())
+    out = np.empty(len(state), dtype=np.int64)
+    todo = np.arange(len(state))
+    while len(todo):
+        s = state[todo]
+        r = (next64(s) >> shift).astype(np.int64)
+        state[todo] = s
+        ok = r < n
+        out[todo[ok]] = r[ok] + lo
+        todo = todo[~ok]
+    return out
+
+
+class DinoBatch:
+    """
+    N dino2 rounds on one screen size. Cacti live in a fixed number of
+    slots per world (inf = empty), enough for the densest spawn rate the
+    difficulty constants allow. Finished worlds stay frozen in place.
+    """
+
+    def __init__(self, seeds, sh=30, sw=100):
+        self.n = len(seeds)
+        self.sw = sw
+        self.ground_y = sh - 6
+        self.dino_x = 12
+        self.base_y = float(self.ground_y - 6)
+        self.obs_y = float(self.ground_y - dino2.CACTUS.height + 1)
+
+        self.rng = np.empty(self.n, dtype=np.uint64)
+        self.y = np.empty(self.n)
+        self.velocity = np.empty(self.n)
+        self.jumping = np.empty(self.n, dtype=bool)
+        self.frame = np.empty(self.n, dtype=np.int64)
+        self.score = np.empty(self.n, dtype=np.int64)
+        self.speed = np.empty(self.n)
+        self.spawn_timer = np.empty(self.n, dtype=np.int64)
+        self.dead = np.empty(self.n, dtype=bool)
+        self.ticks = np.empty(self.n, dtype=np.int64)
+
+        # A cactus lives (sw - 8 + 8) / speed ticks and a new one comes at most every SPAWN_TICKS[0]
+        slots = int(np.ceil(sw / dino2.SPEED_START / dino2.SPAWN_TICKS[0])) + 1
+        self.obs_x = np.empty((self.n, slots))
+        self.reset(np.arange(self.n), seeds)
+
+    def reset(self, worlds, seeds):
+        """Starts the given worlds (an index array) over as fresh rounds with these seeds."""
+        self.rng[worlds] = splitmix64(seeds)
+        self.y[worlds] = self.base_y
+        self.velocity[worlds] = 0.0
+        self.jumping[worlds] = False
+        self.frame[worlds] = 0
+        self.score[worlds] = 0
+        self.speed[worlds] = float(dino2.SPEED_START)
+        self.spawn_timer[worlds] = 0
+        self.dead[worlds] = False
+        self.ticks[worlds] = 0
+        self.obs_x[worlds] = np.inf
+
+    def step(self, jump):
+        """One tick for every live world; jump is a bool array (or scalar). Returns the live mask."""
+        # Whole-array updates masked with where(): cheaper than indexing by the live mask
+        live = ~self.dead
+        self.ticks += live
+
+        # Dino.jump() and Dino.update()
+        start = live & np.asarray(jump, dtype=bool) & ~self.jumping
+        self.velocity = np.where(start, dino2.JUMP_STRENGTH, self.velocity)
+        self.jumping |= start
+        air = live & self.jumping
+        self.velocity = np.where(air, self.velocity + dino2.GRAVITY, self.velocity)
+        self.y = np.where(air, self.y + self.velocity, self.y)
+        landed = air & (self.y >= self.base_y)
+        self.y[landed] = self.base_y
+        self.velocity[landed] = 0.0
+        self.jumping &= ~landed
+        self.frame = np.where(live, (self.frame + 1) % 12, self.frame)
+
+        self.speed = np.where(live, np.minimum(dino2.SPEED_MAX,
+                                               dino2.SPEED_START + self.score / dino2.CACTI_PER_SPEED),
+                              self.speed)
+
+        # Spawning: a cactus at the right edge, then the gap to the next one
+        self.spawn_timer -= live
+        spawn = np.flatnonzero(live & (self.spawn_timer <= 0))
+        if len(spawn):
+            free = np.isinf(self.obs_x[spawn])
+            if not free.any(axis=1).all():
+                raise RuntimeError("cactus slots exhausted; SPAWN_TICKS/SPEED_START allow denser spawns")
+            self.obs_x[spawn, free.argmax(axis=1)] = float(self.sw - 8)
+            state = self.rng[spawn]
+            self.spawn_timer[spawn] = randint(state, *dino2.SPAWN_TICKS)
+            self.rng[spawn] = state
+
+        # Move, retire and collide every cactus of the live worlds
+        x = np.where(live[:, None], self.obs_x - self.speed[:, None], self.obs_x)
+        gone = x < -8
+        dx = self.dino_x + 2
+        dy = np.trunc(self.y)[:, None]
+        hit = ((dx < x + dino2.CACTUS.width) & (dx + 10 > x) &
+               (dy < self.obs_y + dino2.CACTUS.height) & (dy + 6 > self.obs_y))
+        self.score += gone.sum(axis=1)
+        x[gone] = np.inf
+        self.obs_x = x
+        self.dead |= hit.any(axis=1)
+        return ~self.dead
+
+    def run(self, policy, max_ticks):
+        """Steps until every world is over or max_ticks pass. Returns ticks stepped."""
+        for tick in range(max_ticks):
+            if not self.step(policy(self)).any():
+                return tick + 1
+        return max_ticks
+
+
+# --- Policies: batch -> bool array of jump presses ---
+def idle(batch):
+    return False
+
+
+def jumper(batch):
+    """tournament.jumper for every world: jump when a cactus is within speed * 4 ahead."""
+    gap = batch.obs_x - (batch.dino_x + 12)
+    return ((gap >= 0) & (gap <= batch.speed[:, None] * 4)).any(axis=1)
+
+
+def random_presses(batch, rate=0.05, _rng=np.random.default_rng(0)):
+    return _rng.random(batch.n) < rate
+
+
+POLICIES = {"idle": idle, "jumper": jumper, "random": random_presses}
+
+
+def check(worlds, ticks, policy, sh=30, sw=100):
+    """Steps a batch and scalar DinoRuns with the same presses; returns mismatch descriptions."""
+    seeds = range(worlds)
+    batch = DinoBatch(seeds, sh, sw)
+    runs = [DinoRun(sh, sw, SeededRandom(seed)) for seed in seeds]
+    live = [True] * worlds
+    for tick in range(ticks):
+        presses = np.broadcast_to(policy(batch), (worlds,))
+        batch.step(presses)
+        for i, run in enumerate(runs):
+            if live[i]:
+                live[i] = run.step(ord(' ') if presses[i] else -1)
+        for i, run in enumerate(runs):
+            d = run.dino
+            scalar = (d.y, d.velocity, d.is_jumping, d.frame, run.score, run.speed,
+                      run.spawn_timer, run.dead, sorted(o.x for o in run.obstacles))
+            vector = (batch.y[i], batch.velocity[i], batch.jumping[i], batch.frame[i],
+                      batch.score[i], batch.speed[i], batch.spawn_timer[i], batch.dead[i],
+                      sorted(x for x in batch.obs_x[i] if x != np.inf))
+            if scalar != vector:
+                return [f"world {i} tick {tick + 1}: scalar {scalar} != batch {vector}"]
+        if not any(live):
+            break
+    return []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run many dino2 worlds as NumPy arrays")
+    parser.add_argument("--worlds", type=int, default=30000)
+    parser.add_argument("--ticks", type=int, default=1000, help="most ticks to run")
+    parser.add_argument("--policy", choices=POLICIES, default="jumper")
+    parser.add_argument("--size", default="30x100", help="screen size as ROWSxCOLS")
+    parser.add_argument("--check", type=int, metavar="N",
+                        help="compare N worlds against scalar DinoRun instead of benchmarking")
+    args = parser.parse_args()
+    sh, sw = (int(n) for n in args.size.lower().split("x"))
+    policy = POLICIES[args.policy]
+
+    if args.check:
+        errors = check(args.check, args.ticks, policy, sh, sw)
+        print(errors[0] if errors else f"{args.check} worlds x {args.ticks} ticks: batch matches DinoRun")
+        raise SystemExit(1 if errors else 0)
+
+    batch = DinoBatch(range(args.worlds), sh, sw)
+    start = time.perf_counter()
+    ticks = batch.run(policy, args.ticks)
+    elapsed = time.perf_counter() - start
+    steps = int(batch.ticks.sum())
+    print(f"{args.worlds} worlds / {args.policy}: {ticks} ticks in {elapsed:.2f}s, "
+          f"{steps / elapsed / 1e6:.2f}M world-steps/s")
+    print(f"  score  mean {batch.score.mean():.1f}  p50 {np.percentile(batch.score, 50):.0f}  "
+          f"max {batch.score.max()}  ({int(batch.dead.sum())} of {args.worlds} dead)")
@@ -0,0 +1,361 @@
+"""
+ENVS - Gym-Style Environments for Dino, Snake and Breakout
+Wraps the game worlds behind reset(seed) / step(action) / render() for
+agent training, with no terminal involved: observations are compact
+stdlib arrays and render() returns the playfield as text.
+
+    env = SnakeEnv()
+    obs = env.reset(seed=7)
+    obs, reward, done, info = env.step(env.action_space.index("RIGHT"))
+    print(env.render())
+
+Actions are indices into action_space. Rewards are the change in the
+game's score, and an episode ends when the world does or after max_steps
+(info["truncated"]). reset(seed) seeds the world's SeededRandom, so an
+episode is reproducible from its seed and actions.
+
+VectorEnv steps many copies per call and resets finished ones with the
+next seed, returning every observation in one flat array. make_vector()
+picks DinoVectorEnv for Dino when NumPy is installed, which steps all
+the copies as dino_batch arrays instead of one world at a time.
+
+Nothing here needs curses: key codes come from keys.py.
+
+Run with: python envs.py                    # steps/sec per game, single and vector
+          python envs.py snake --envs 256 --steps 100000
+          python envs.py dino --render
+"""
+
+import argparse
+import time
+from array import array
+from collections.abc import Sequence
+
+import breakout
+import dino2
+import snake
+from keys import KEY_DOWN, KEY_LEFT, KEY_RIGHT, KEY_UP
+from replay import SeededRandom, new_seed
+
+SPACE = ord(' ')
+
+
+def grid(h, w):
+    return [[" "] * w for _ in range(h)]
+
+
+def fill(rows, y, x, h, w, ch):
+    """Paints an h x w box into a character grid, clipped at its edges."""
+    for row in rows[max(0, y) : max(0, y + h)]:
+        for col in range(max(0, x), min(len(row), x + w)):
+            row[col] = ch
+
+
+class Env:
+    """
+    One world of a game module. Subclasses name the module, the actions
+    (ACTIONS: name -> key) and how a world turns into an observation.
+    """
+
+    module = None
+    ACTIONS = {}
+    typecode = "f"
+
+    def __init__(self, sh=30, sw=100, max_steps=10000):
+        self.sh, self.sw = sh, sw
+        self.max_steps = max_steps
+        self.action_space = list(self.ACTIONS)
+        self.keys = list(self.ACTIONS.values())
+        self.game = None
+
+    def reset(self, seed=None):
+        self.seed = new_seed() if seed is None else seed
+        self.game = self.module.new_game(self.sh, self.sw, SeededRandom(self.seed))
+        self.steps = 0
+        self.score = self.game.score
+        return self.observe()
+
+    def step(self, action):
+        """(observation, reward, done, info) after one tick with the given action index."""
+        alive = self.game.step(self.keys[action])
+        self.steps += 1
+        reward = self.game.score - self.score
+        self.score = self.game.score
+        truncated = alive and self.steps >= self.max_steps
+        info = {"score": self.score, "steps": self.steps, "truncated": truncated}
+        return self.observe(), reward, not alive or truncated, info
+
+    def observe(self):
+        raise NotImplementedError
+
+    def render(self):
+        raise NotImplementedError
+
+
+class DinoEnv(Env):
+    """
+    Observation (floats): dino height above the ground, vertical velocity,
+    jumping flag, run speed, then the distance to the next two cacti ahead
+    (the screen width when there are none).
+    """
+
+    module = dino2
+    ACTIONS = {"NOOP": -1, "JUMP": SPACE}
+    size = 6
+
+    def observe(self):
+        g, d = self.game, self.game.dino
+        ahead = sorted(o.x - (d.x + 12) for o in g.obstacles if o.x + o.width > d.x + 2)
+        ahead += [float(self.sw)] * 2
+        return array("f", [d.base_y - d.y, d.velocity, d.is_jumping, g.speed, ahead[0], ahead[1]])
+
+    def render(self):
+        g, d = self.game, self.game.dino
+        rows = grid(self.sh, self.sw)
+        fill(rows, g.ground_y + 1, 0, 1, self.sw, "=")
+        for o in g.obstacles:
+            fill(rows, int(o.y), int(o.x), o.height, o.width, "#")
+        fill(rows, int(d.y), int(d.x) + 2, 6, 10, "X" if g.dead else "D")
+        return "\n".join("".join(r) for r in rows[7:])
+
+
+class SnakeEnv(Env):
+    """
+    Observation (bytes): the board row by row, 0 empty, 1 body, 2 head,
+    3 food. shape is (rows, columns) of the board.
+    """
+
+    module = snake
+    ACTIONS = {"NOOP": -1, "UP": KEY_UP, "DOWN": KEY_DOWN, "LEFT": KEY_LEFT, "RIGHT": KEY_RIGHT}
+    typecode = "B"
+
+    def __init__(self, sh=30, sw=100, max_steps=10000):
+        super().__init__(sh, sw, max_steps)
+        # Snake(sh - 1, sw): rows 8 .. h-1, w // 2 two-character cells
+        self.shape = (sh - 1 - 8, sw // 2)
+        self.size = self.shape[0] * self.shape[1]
+
+    def observe(self):
+        g, cols = self.game, self.shape[1]
+        board = bytearray(self.size)
+        for y, x in g.snake:
+            board[(y - 8) * cols + x] = 1
+        if g.food:
+            board[(g.food[0] - 8) * cols + g.food[1]] = 3
+        y, x = g.snake[0]
+        if 8 <= y < g.h and 0 <= x < cols:
+            board[(y - 8) * cols + x] = 2
+        return array("B", board)
+
+    def render(self):
+        rows, cols = self.shape
+        board = self.observe()
+        lines = ["+" + "-" * cols + "+"]
+        for r in range(rows):
+            lines.append("|" + "".join(" o@*"[c] for c in board[r * cols : (r + 1) * cols]) + "|")
+        lines.append("+" + "-" * cols + "+")
+        return "\n".join(lines)
+
+
+class BreakoutEnv(Env):
+    """
+    Observation (floats): paddle x, ball x, y, vx, vy, lives, then one
+    0/1 per brick slot, row by row (1 while the brick stands).
+    """
+
+    module = breakout
+    ACTIONS = {"NOOP": -1, "LEFT": KEY_LEFT, "RIGHT": KEY_RIGHT}
+
+    def __init__(self, sh=30, sw=100, max_steps=10000):
+        super().__init__(sh, sw, max_steps)
+        self.size = 6 + breakout.BRICK_ROWS * len(range(2, sw - 4, breakout.BRICK_DX))
+
+    def reset(self, seed=None):
+        self.standing = None
+        return super().reset(seed)
+
+    def observe(self):
+        g = self.game
+        # Bricks only ever disappear, so the bitmap is rebuilt just when the count drops
+        if self.standing != g.count:
+            self.standing = g.count
+            self.brick_bits = array("f", [colour > 0 for row in g.grid for colour in row])
+        obs = array("f", [g.px, g.bx, g.by, g.vx, g.vy, g.lives])
+        obs.extend(self.brick_bits)
+        return obs
+
+    def render(self):
+        g = self.game
+        rows = grid(self.sh, self.sw)
+        for x, y, _ in g.bricks():
+            fill(rows, y, x, 1, 2, "#")
+        fill(rows, g.h - 3, g.px, 1, 6, "=")
+        fill(rows, int(g.by), int(g.bx), 1, 1, "o")
+        return "\n".join("".join(r) for r in rows[7:])
+
+
+ENVS = {"dino": DinoEnv, "snake": SnakeEnv, "breakout": BreakoutEnv}
+
+
+class VectorEnv:
+    """
+    n copies of an Env stepped together. step() takes one action per copy;
+    a copy that finishes is reset with the next seed, and its done flag
+    and info (with the final score) describe the episode that just ended.
+    """
+
+    def __init__(self, env_cls, n, **kwargs):
+        self.envs = [env_cls(**kwargs) for _ in range(n)]
+        self.action_space = self.envs[0].action_space
+        self.size = self.envs[0].size
+        self.typecode = env_cls.typecode
+
+    def reset(self, seed=None):
+        self.next_seed = new_seed() if seed is None else seed
+        obs = array(self.typecode)
+        for env in self.envs:
+            obs.extend(env.reset(self.next_seed))
+            self.next_seed += 1
+        return obs
+
+    def step(self, actions):
+        """(observations, rewards, dones, infos); observations are n * size values, env-major."""
+        obs = array(self.typecode)
+        rewards, dones, infos = [], [], []
+        for env, action in zip(self.envs, actions):
+            o, reward, done, info = env.step(action)
+            if done:
+                o = env.reset(self.next_seed)
+                self.next_seed += 1
+            obs.extend(o)
+            rewards.append(reward)
+            dones.append(done)
+            infos.append(info)
+        return obs, rewards, dones, infos
+
+
+class BatchInfos(Sequence):
+    """The per-world info dicts of one batched step, built only for the worlds looked at."""
+
+    def __init__(self, score, steps, truncated):
+        self.score, self.steps, self.truncated = score, steps, truncated
+
+    def __len__(self):
+        return len(self.score)
+
+    def __getitem__(self, i):
+        return {"score": int(self.score[i]), "steps": int(self.steps[i]), "truncated": bool(self.truncated[i])}
+
+
+class DinoVectorEnv:
+    """
+    VectorEnv(DinoEnv, n) on dino_batch: all n worlds step as NumPy arrays
+    in one call, with the same seeds, observations, rewards and resets.
+    """
+
+    def __init__(self, n, sh=30, sw=100, max_steps=10000):
+        self.n, self.sh, self.sw = n, sh, sw
+        self.max_steps = max_steps
+        self.action_space = list(DinoEnv.ACTIONS)
+        self.size = DinoEnv.size
+        self.typecode = DinoEnv.typecode
+
+    def reset(self, seed=None):
+        import dino_batch
+        self.next_seed = new_seed() if seed is None else seed
+        self.batch = dino_batch.DinoBatch(range(self.next_seed, self.next_seed + self.n), self.sh, self.sw)
+        self.next_seed += self.n
+        return self.observe()
+
+    def observe(self):
+        import numpy as np
+        b = self.batch
+        gap = b.obs_x - (b.dino_x + 12)
+        ahead = np.where(b.obs_x + dino2.CACTUS.width > b.dino_x + 2, gap, np.inf)
+        ahead.sort(axis=1)
+        ahead = np.where(np.isinf(ahead[:, :2]), float(self.sw), ahead[:, :2])
+        obs = np.column_stack([b.base_y - b.y, b.velocity, b.jumping, b.speed, ahead])
+        return array(self.typecode, obs.astype(np.float32).tobytes())
+
+    def step(self, actions):
+        """(observations, rewards, dones, infos), as VectorEnv.step."""
+        import numpy as np
+        b = self.batch
+        score = b.score.copy()
+        alive = b.step(np.asarray(actions) == self.action_space.index("JUMP"))
+        truncated = alive & (b.ticks >= self.max_steps)
+        done = ~alive | truncated
+        rewards = (b.score - score).tolist()
+        infos = BatchInfos(b.score.copy(), b.ticks.copy(), truncated)
+        finished = np.flatnonzero(done)
+        if len(finished):
+            b.reset(finished, np.arange(self.next_seed, self.next_seed + len(finished)))
+            self.next_seed += len(finished)
+        return self.observe(), rewards, done.tolist(), infos
+
+
+def make_vector(env_cls, n, **kwargs):
+    """The fastest vector env for env_cls: DinoVectorEnv for Dino when NumPy is installed."""
+    if env_cls is DinoEnv:
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            pass
+        else:
+            return DinoVectorEnv(n, **kwargs)
+    return VectorEnv(env_cls, n, **kwargs)
+
+
+# --- Throughput ---
+def bench_single(env_cls, steps, seed=0):
+    env, rng = env_cls(), SeededRandom(seed)
+    env.reset(seed)
+    n = len(env.action_space)
+    start = time.perf_counter()
+    for _ in range(steps):
+        if env.step(rng.randrange(n))[2]:
+            env.reset()
+    return steps / (time.perf_counter() - start)
+
+
+def bench_vector(env_cls, envs, steps, seed=0):
+    venv, rng = make_vector(env_cls, envs), SeededRandom(seed)
+    venv.reset(seed)
+    n = len(venv.action_space)
+    calls = max(1, steps // envs)
+    # Drawn up front so the timing is the env's, not the RNG's
+    pool = [[rng.randrange(n) for _ in range(envs)] for _ in range(min(calls, 16))]
+    start = time.perf_counter()
+    for i in range(calls):
+        venv.step(pool[i % len(pool)])
+    return calls * envs / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure environment steps per second")
+    parser.add_argument("games", nargs="*", help=f"any of {', '.join(ENVS)} (default: all)")
+    parser.add_argument("--steps", type=int, default=50000, help="steps per measurement")
+    parser.add_argument("--envs", type=int, default=64, help="copies in the vector env")
+    parser.add_argument("--render", action="store_true", help="play one random episode as text instead")
+    args = parser.parse_args()
+    for name in args.games:
+        if name not in ENVS:
+            parser.error(f"unknown game {name}")
+
+    if args.render:
+        env = ENVS[(args.games or ["dino"])[0]]()
+        env.reset(seed=0)
+        rng, done = SeededRandom(0), False
+        while not done:
+            _, _, done, info = env.step(rng.randrange(len(env.action_space)))
+            if info["steps"] % 10 == 0 or done:
+                print(f"\x1b[H\x1b[2J{env.render()}\nstep {info['steps']}  score {info['score']}", flush=True)
+                time.sleep(0.05)
+        raise SystemExit
+
+    print(f"{'GAME':<10}{'OBS':>6}{'STEPS/S':>12}{f'VECTOR x{args.envs}':>14}")
+    for name in args.games or ENVS:
+        env_cls = ENVS[name]
+        single = bench_single(env_cls, args.steps)
+        vector = bench_vector(env_cls, args.envs, args.steps)
+        print(f"{name:<10}{env_cls().size:>6}{single:>12.0f}{vector:>14.0f}")
@@ -0,0 +1,256 @@
+"""
+FRAMEBUFFER - Shared Diff Renderer
+Games draw into an off-screen grid of (glyph, attribute) cells instead of
+straight into stdscr. refresh() compares the grid with what was sent last
+frame and only writes the changed cells to curses, one addstr per run.
+
+Static decoration (logos, borders) goes into a background layer that is
+drawn once per terminal size and copied in by erase(), so it costs nothing
+per frame and never shows up in the diff.
+
+Nothing here raises on off-screen coordinates: text is clipped against
+the screen size before it is written, so games need no try/except around
+drawing. addstr_clipped() gives the same guarantee on a raw stdscr.
+
+Output goes through curses by default. --backend ansi swaps in the raw
+escape-sequence writer from ansi.py (one os.write per frame).
+
+Usage:
+    screen = FrameBuffer(stdscr, background=draw_static)
+    screen.erase()
+    screen.addstr(y, x, "text", curses.color_pair(1))
+    screen.refresh()
+"""
+
+import re
+
+import runtime
+from keys import curses
+
+
+class Sprite:
+    """
+    Sprite rows compiled once into (row, col, text) runs. Spaces are
+    transparent: they are never written, so whatever is behind shows through.
+    """
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.height = len(lines)
+        self.width = max(len(line) for line in lines)
+        self.runs = tuple(
+            (dy, m.start(), m.group())
+            for dy, line in enumerate(lines)
+            for m in re.finditer(r"[^ ]+", line)
+        )
+
+
+def clip(h, w, y, x, text, corner=False):
+    """
+    Visible part of text drawn at (y, x) on an h x w screen, as (x, text).
+    text is empty when nothing shows. The bottom-right cell is left out
+    unless corner=True, since curses' addstr cannot write it.
+    """
+    if y < 0 or y >= h:
+        return x, ""
+    if x < 0:
+        text = text[-x:]
+        x = 0
+    limit = w - 1 if y == h - 1 and not corner else w
+    if x + len(text) > limit:
+        text = text[: max(0, limit - x)]
+    return x, text
+
+
+def addstr_clipped(screen, y, x, text, attr=0):
+    """addstr that writes only the visible slice, on a FrameBuffer or a raw stdscr."""
+    if isinstance(screen, FrameBuffer):
+        screen.addstr(y, x, text, attr)
+        return
+    h, w = screen.getmaxyx()
+    x, text = clip(h, w, y, x, text)
+    if text:
+        screen.addstr(y, x, text, attr)
+
+
+def blit(screen, y, x, sprite, attr=0, opaque=False):
+    """
+    Draws a Sprite with its top-left at (y, x), clipped to the screen bounds.
+    opaque=True writes whole rows, spaces included, to cover what is behind.
+    """
+    h, w = screen.getmaxyx()
+    if opaque:
+        runs = [(dy, 0, line) for dy, line in enumerate(sprite.lines)]
+    else:
+        runs = sprite.runs
+    for dy, dx, text in runs:
+        rx, text = clip(h, w, y + dy, x + dx, text)
+        if text:
+            screen.addstr(y + dy, rx, text, attr)
+
+
+def draw_shadow_text(screen, y, x, lines, color_pair, shadow_pair):
+    """Draws text with a drop-shadow effect (shadow offset by 1,1), clipped to the screen."""
+    for i, line in enumerate(lines):
+        addstr_clipped(screen, y + i + 1, x + 1, line, curses.color_pair(shadow_pair))
+        addstr_clipped(screen, y + i, x, line, curses.color_pair(color_pair) | curses.A_BOLD)
+
+
+class CursesOutput:
+    """Default backend: each changed run is one addstr, then one stdscr.refresh()."""
+
+    name = "curses"
+
+    def __init__(self, stdscr):
+        self.stdscr = stdscr
+
+    def put(self, y, x, text, attr, bottom_right=False):
+        # Writing the bottom-right cell moves the cursor off-screen, so insert it instead
+        if bottom_right:
+            if len(text) > 1:
+                self.stdscr.addstr(y, x, text[:-1], attr)
+            self.stdscr.insstr(y, x + len(text) - 1, text[-1], attr)
+        else:
+            self.stdscr.addstr(y, x, text, attr)
+
+    def resize(self, h, w):
+        self.stdscr.erase()
+
+    def flush(self):
+        self.stdscr.refresh()
+
+
+class FrameBuffer:
+    def __init__(self, stdscr, background=None, backend=None):
+        self.stdscr = stdscr
+        self.background = background
+        self.h, self.w = 0, 0
+        if (backend or runtime.options().backend) == "ansi":
+            from ansi import AnsiOutput
+            self.output = AnsiOutput()
+        else:
+            self.output = CursesOutput(stdscr)
+        # Counters: cells and output calls of the last refresh, plus running totals
+        self.frames = 0
+        self.changed = 0
+        self.calls = 0
+        self.total_changed = 0
+        self.total_calls = 0
+        self.resize()
+        runtime.REPORTS.append(self)
+
+    def resize(self):
+        """Reallocates the grid for the current terminal size and forces a full repaint."""
+        self.h, self.w = self.stdscr.getmaxyx()
+        self.blank_glyphs = [" "] * self.w
+        self.blank_attrs = [0] * self.w
+        self.glyphs = [self.blank_glyphs[:] for _ in range(self.h)]
+        self.attrs = [self.blank_attrs[:] for _ in range(self.h)]
+        self.build_background()
+        # The backend clears the screen, so only non-blank cells need sending
+        self.output.resize(self.h, self.w)
+        self.front_glyphs = [self.blank_glyphs[:] for _ in range(self.h)]
+        self.front_attrs = [self.blank_attrs[:] for _ in range(self.h)]
+
+    def set_background(self, background):
+        """Replaces the static layer. `background(screen)` draws it; None means blank."""
+        self.background = background
+        self.build_background()
+
+    def build_background(self):
+        # Render the static layer into the grid once and keep a copy of its rows
+        for row in self.glyphs:
+            row[:] = self.blank_glyphs
+        for row in self.attrs:
+            row[:] = self.blank_attrs
+        if self.background:
+            self.background(self)
+        self.base_glyphs = [row[:] for row in self.glyphs]
+        self.base_attrs = [row[:] for row in self.attrs]
+
+    def invalidate(self):
+        """Forgets what is on the terminal so the next refresh repaints every cell."""
+        self.front_glyphs = [[None] * self.w for _ in range(self.h)]
+        self.front_attrs = [[None] * self.w for _ in range(self.h)]
+
+    def getmaxyx(self):
+        return self.h, self.w
+
+    def erase(self):
+        """Resets the grid to the background layer."""
+        if self.stdscr.getmaxyx() != (self.h, self.w):
+            self.resize()
+        for row, base in zip(self.glyphs, self.base_glyphs):
+            row[:] = base
+        for row, base in zip(self.attrs, self.base_attrs):
+            row[:] = base
+
+    def addstr(self, y, x, text, attr=0):
+        """Writes text into the grid, silently clipped to the screen."""
+        x, text = clip(self.h, self.w, y, x, text, corner=True)
+        if not text:
+            return
+        end = x + len(text)
+        self.glyphs[y][x:end] = text
+        self.attrs[y][x:end] = [attr] * (end - x)
+
+    def refresh(self):
+        """Sends the cells that differ from the previous frame to the output backend."""
+        changed = calls = 0
+        last_row = self.h - 1
+        put = self.output.put
+        for y in range(self.h):
+            glyphs, attrs = self.glyphs[y], self.attrs[y]
+            front_glyphs, front_attrs = self.front_glyphs[y], self.front_attrs[y]
+            if glyphs == front_glyphs and attrs == front_attrs:
+                continue
+
+            x = 0
+            while x < self.w:
+                if glyphs[x] == front_glyphs[x] and attrs[x] == front_attrs[x]:
+                    x += 1
+                    continue
+                # Extend the run while cells keep changing under the same attribute
+                start, attr = x, attrs[x]
+                x += 1
+                while x < self.w and attrs[x] == attr and (
+                    glyphs[x] != front_glyphs[x] or attr != front_attrs[x]
+                ):
+                    x += 1
+                put(y, start, "".join(glyphs[start:x]), attr, y == last_row and x == self.w)
+                changed += x - start
+                calls += 1
+
+            front_glyphs[:] = glyphs
+            front_attrs[:] = attrs
+
+        self.output.flush()
+        self.frames += 1
+        self.changed, self.calls = changed, calls
+        self.total_changed += changed
+        self.total_calls += calls
+
+    def stats(self):
+        """Per-frame counters: last frame and averages since start."""
+        frames = max(1, self.frames)
+        stats = {
+            "backend": self.output.name,
+            "frames": self.frames,
+            "cells": self.h * self.w,
+            "changed_last": self.changed,
+            "changed_avg": self.total_changed / frames,
+            "calls_last": self.calls,
+            "calls_avg": self.total_calls / frames,
+        }
+        if self.output.name == "ansi":
+            stats["bytes_avg"] = self.output.total_bytes / frames
+            stats["writes_avg"] = self.output.total_writes / frames
+        return stats
+
+    def summary(self):
+        s = self.stats()
+        line = (f"render ({s['backend']}): {s['frames']} frames, {s['changed_avg']:.1f} changed cells/frame "
+                f"of {s['cells']}, {s['calls_avg']:.1f} runs/frame")
+        if "bytes_avg" in s:
+            line += f", {s['bytes_avg']:.0f} bytes/frame, {s['writes_avg']:.2f} write syscalls/frame"
+        return line
@@ -3,14 +3,22 @@ FROGGERCLI - 8-Bit Edition
 Controls: [ARROWS] Move, [R] Restart, [Q] Quit
 """
 
-import curses
+import bisect
 import time
 import random
+from array import array
 
-FPS = 60
+from framebuffer import FrameBuffer, draw_shadow_text
+from keys import KEY_DOWN, KEY_LEFT, KEY_RIGHT, KEY_UP, curses
+from runtime import FixedStep, FrameScheduler, options, print_stats
+
+FPS = 60        # Render rate
+TICK_RATE = 60  # Simulation rate; lane speeds are in cells per tick
 BLOCK = "██"
 FROG = "▄█▄"
 CAR = "████"
+CARS = 3        # Cars per lane
+LANE_TOP = 8    # First lane row; lanes are every other row down to h - 4
 
 LOGO_MAIN = [
     r" ███████╗██████╗  ██████╗  ██████╗  ██████╗ ███████╗██████╗  ██████╗██╗     ██╗",
@@ -21,19 +29,29 @@ LOGO_MAIN = [
     r" ╚═╝     ╚═╝  ╚═╝ ╚═════╝ ╚═════╝ ╚═════╝ ╚══════╝╚═╝  ╚═╝ ╚═════╝╚══════╝╚═╝"
 ]
 
-def draw_shadow_text(stdscr, y, x, lines, color_pair, shadow_pair):
-    for i, line in enumerate(lines):
-        try:
-            stdscr.addstr(y + i + 1, x + 1, line, curses.color_pair(shadow_pair))
-            stdscr.addstr(y + i, x, line, curses.color_pair(color_pair) | curses.A_BOLD)
-        except: pass
+def draw_static(screen):
+    """Header plus goal and start strips. Cached by the framebuffer, redrawn only on resize."""
+    sh, sw = screen.getmaxyx()
+    draw_shadow_text(screen, 1, (sw - len(LOGO_MAIN[0])) // 2, LOGO_MAIN, 1, 2)
+    screen.addstr(7, 0, "█" * (sw - 1), curses.color_pair(3))
+    screen.addstr(sh - 2, 0, "█" * (sw - 1), curses.color_pair(3))
 
 class Frogger:
-    def __init__(self, h, w):
+    """
+    Lanes are closed-form: car k of lane i sits at
+    (cars[i*n + k] + speeds[i] * tick) mod (w + 4) - 4, so a tick only
+    advances the tick counter. Car starts are kept shifted by 4 and sorted
+    per lane, so the frog's lane is checked with a bisect over the interval
+    it stands in, and each lane is drawn by slicing a pre-built strip at its
+    current offset. Lanes and cars cost nothing per tick.
+    """
+
+    def __init__(self, h, w, rng=None, cars=CARS):
+        self.rng = rng or random.Random()
         self.h, self.w = h, w
+        self.cars_per_lane = cars
         self.reset_frog()
         self.level = 1
-        self.lanes = []
         self.setup_lanes()
         self.score = 0
         self.dead = False
@@ -43,17 +61,84 @@ class Frogger:
         self.fx, self.fy = self.w // 2, self.h - 2
 
     def setup_lanes(self):
-        self.lanes = []
-        for y in range(8, self.h - 3, 2):
-            speed = random.uniform(0.1, 0.2 + (self.level * 0.05)) * random.choice([1, -1])
-            self.lanes.append({
-                'y': y,
-                'speed': speed,
-                'cars': [random.randint(0, self.w) for _ in range(3)]
-            })
+        n = self.cars_per_lane
+        self.lane_count = len(range(LANE_TOP, self.h - 3, 2))
+        self.speeds = array("d")
+        starts = []
+        for _ in range(self.lane_count):
+            speed = self.rng.uniform(0.1, 0.2 + (self.level * 0.05)) * self.rng.choice([1, -1])
+            self.speeds.append(speed)
+            starts.append([self.rng.randint(0, self.w) for _ in range(n)])
+        self.place_cars(starts)
+
+    def place_cars(self, starts):
+        """Lays out lanes from each lane's car x positions at tick 0 and builds their strips."""
+        period = self.w + 4
+        self.tick = 0
+        self.cars = array("l")
+        self.strips = []
+        for lane in starts:
+            bases = sorted(int(x + 4) % period for x in lane)
+            self.cars.extend(bases)
+            cells = [" "] * period
+            for b in bases:
+                for j in range(b, b + len(CAR)):
+                    cells[j % period] = CAR[0]
+            self.strips.append("".join(cells) * 2)
+
+    def offset(self, i):
+        return (self.speeds[i] * self.tick) % (self.w + 4)
+
+    def car_xs(self, i):
+        """Current x of every car in lane i."""
+        period, o = self.w + 4, self.offset(i)
+        n = self.cars_per_lane
+        return [(b + o) % period - 4 for b in self.cars[i * n : (i + 1) * n]]
+
+    def lane_row(self, i, width):
+        """Lane i as it looks now: the first `width` columns of its strip at the current offset."""
+        start = (4 - int(self.offset(i))) % (self.w + 4)
+        return self.strips[i][start : start + width]
+
+    def lane_at(self, y):
+        """Index of the lane on row y, or None."""
+        i, odd = divmod(y - LANE_TOP, 2)
+        return i if not odd and 0 <= i < self.lane_count else None
+
+    def hit(self):
+        """True when a car in the frog's lane covers it (car x <= fx <= car x + 4)."""
+        i = self.lane_at(self.fy)
+        if i is None: return False
+        # Car k covers fx when (base_k + offset) mod period lies in [fx, fx + 4]
+        period, n = self.w + 4, self.cars_per_lane
+        lo = (self.fx - self.offset(i)) % period
+        first, end = i * n, (i + 1) * n
+        k = bisect.bisect_left(self.cars, lo, first, end)
+        if k < end and self.cars[k] <= lo + 4: return True
+        return lo + 4 >= period and self.cars[first] <= lo + 4 - period
+
+    def resize(self, sh, sw):
+        """Refits lanes to a new screen size, keeping existing lanes and their traffic."""
+        scale = sw / self.w
+        old = [(self.speeds[i], [x * scale for x in self.car_xs(i)]) for i in range(self.lane_count)]
+        self.h, self.w = h, w = sh, sw
+        self.setup_lanes()
+        n = self.cars_per_lane
+        starts = [[b - 4 for b in self.cars[i * n : (i + 1) * n]] for i in range(self.lane_count)]
+        for i, (speed, xs) in enumerate(old[:self.lane_count]):
+            self.speeds[i] = speed
+            starts[i] = xs
+        self.place_cars(starts)
+        self.fx = max(1, min(self.fx, w - 3))
+        self.fy = max(8, min(self.fy, h - 2))
+
+    def step(self, key):
+        """One fixed tick. False once the frog has been hit."""
+        self.update(key)
+        return not self.dead
 
     def update(self, key):
-        if key == curses.KEY_UP and self.fy > 7: 
+        if key == KEY_UP and self.fy > 7: 
             self.fy -= 1
             if self.fy == 7: # Goal reached
                 self.score += 500
@@ -62,78 +147,94 @@ class Frogger:
                 self.setup_lanes()
                 return
 
-        if key == curses.KEY_DOWN and self.fy < self.h - 2: self.fy += 1
-        if key == curses.KEY_LEFT and self.fx > 1: self.fx -= 2
-        if key == curses.KEY_RIGHT and self.fx < self.w - 3: self.fx += 2
-
-        for lane in self.lanes:
-            for i in range(len(lane['cars'])):
-                lane['cars'][i] += lane['speed']
-                if lane['cars'][i] > self.w: lane['cars'][i] = -4
-                if lane['cars'][i] < -4: lane['cars'][i] = self.w
-                
-                # Collision
-                if int(lane['y']) == self.fy:
-                    if lane['cars'][i] <= self.fx <= lane['cars'][i] + 4:
-                        self.dead = True
+        if key == KEY_DOWN and self.fy < self.h - 2: self.fy += 1
+        if key == KEY_LEFT and self.fx > 1: self.fx -= 2
+        if key == KEY_RIGHT and self.fx < self.w - 3: self.fx += 2
+
+        self.tick += 1
+        if self.hit():
+            self.dead = True
+
+def new_game(sh, sw, rng=None):
+    """A fresh round laid out for an sh x sw screen."""
+    return Frogger(sh, sw, rng)
 
 def main(stdscr):
     curses.curs_set(0)
     stdscr.nodelay(True)
-    stdscr.timeout(1000 // FPS)
     curses.start_color()
-    # Ensure colors exist
-    try:
+    # Monochrome terminals keep the default pair
+    if curses.has_colors():
         curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLACK)
         curses.init_pair(2, curses.COLOR_CYAN, curses.COLOR_BLACK)
         curses.init_pair(3, curses.COLOR_GREEN, curses.COLOR_BLACK)
         curses.init_pair(4, curses.COLOR_RED, curses.COLOR_BLACK)
-    except: pass
+    screen = FrameBuffer(stdscr, background=draw_static)
+    clock = FrameScheduler(FPS, "frogger")
+    sim = FixedStep(TICK_RATE, "frogger")
 
     while True:
+        stdscr.nodelay(True)
         sh, sw = stdscr.getmaxyx()
-        game = Frogger(sh, sw)
+        game = sim.start(new_game, sh, sw)
         
         while not game.dead:
             key = stdscr.getch()
             if key in [ord('q'), ord('Q')]: return
-            game.update(key)
-
-            stdscr.erase()
-            logo_x = (sw - len(LOGO_MAIN[0])) // 2
-            draw_shadow_text(stdscr, 1, logo_x, LOGO_MAIN, 1, 2)
-
-            # Draw Start/Goal areas
-            try:
-                stdscr.addstr(7, 0, "█" * (sw - 1), curses.color_pair(3))
-                stdscr.addstr(sh - 2, 0, "█" * (sw - 1), curses.color_pair(3))
-            except: pass
-
-            # Draw Lanes
-            for lane in game.lanes:
-                for car_x in lane['cars']:
-                    if 0 <= int(car_x) < sw - 4:
-                        try:
-                            stdscr.addstr(lane['y'], int(car_x), CAR, curses.color_pair(4))
-                        except: pass
-
-            # Draw Frog
-            try:
-                stdscr.addstr(game.fy, game.fx, FROG, curses.color_pair(1) | curses.A_BOLD)
-            except: pass
-
-            try:
-                stdscr.addstr(7, 2, f" SCORE: {game.score}   LEVEL: {game.level} ", curses.A_BOLD | curses.A_REVERSE)
-            except: pass
-            stdscr.refresh()
-
-        stdscr.addstr(sh // 2 + 5, sw // 2 - 5, "GAME OVER", curses.A_REVERSE)
-        stdscr.addstr(sh // 2 + 6, sw // 2 - 11, "Press 'R' to Restart", curses.A_BOLD)
-        stdscr.refresh()
+            if key == curses.KEY_RESIZE:
+                sh, sw = stdscr.getmaxyx()
+                sim.resize(sh, sw)
+            else:
+                sim.feed(key)
+            for k in sim.ticks():
+                if not game.step(k): break
+
+            if clock.render_due():
+                screen.erase()
+
+                # Draw Lanes
+                for i in range(game.lane_count):
+                    screen.addstr(LANE_TOP + 2 * i, 0, game.lane_row(i, sw - 1), curses.color_pair(4))
+
+                # Draw Frog
+                screen.addstr(game.fy, game.fx, FROG, curses.color_pair(1) | curses.A_BOLD)
+
+                screen.addstr(7, 2, f" SCORE: {game.score}   LEVEL: {game.level} ", curses.A_BOLD | curses.A_REVERSE)
+                screen.refresh()
+            clock.wait()
+
+        screen.addstr(sh // 2 + 5, sw // 2 - 5, "GAME OVER", curses.A_REVERSE)
+        screen.addstr(sh // 2 + 6, sw // 2 - 11, "Press 'R' to Restart", curses.A_BOLD)
+        screen.refresh()
+        # A replay moves on to its next recorded round by itself
+        stdscr.timeout(1000 if sim.replaying else -1)
         while True:
             key = stdscr.getch()
-            if key in [ord('r'), ord('R')]: break
+            if key in [ord('r'), ord('R')] or (key == -1 and sim.replaying): break
             if key in [ord('q'), ord('Q')]: return
 
+def bench(ticks=5000):
+    """
+    Tick and lane-drawing cost as lanes and cars per lane grow, with the
+    frog standing in a lane. Run: python frogger.py --bench
+    """
+    print(f"{'BOARD':>10}{'LANES':>7}{'CARS':>8}{'US/TICK':>9}{'US/FRAME':>10}")
+    for h, w, cars in [(30, 100, CARS), (200, 400, CARS), (200, 400, 60), (1000, 2000, 300)]:
+        game = Frogger(h, w, random.Random(0), cars)
+        game.fy = LANE_TOP + 2 * (game.lane_count // 2)
+        started = time.perf_counter()
+        for _ in range(ticks): game.update(-1)
+        tick = time.perf_counter() - started
+        started = time.perf_counter()
+        for _ in range(100):
+            for i in range(game.lane_count): game.lane_row(i, w - 1)
+        frame = time.perf_counter() - started
+        print(f"{w:>5}x{h:<4}{game.lane_count:>7}{game.lane_count * cars:>8}"
+              f"{tick / ticks * 1e6:>9.2f}{frame / 100 * 1e6:>10.1f}")
+
 if __name__ == "__main__":
-    curses.wrapper(main)
\ No newline at end of file
+    if options().bench:
+        bench()
+    else:
+        curses.wrapper(main)
+        print_stats()
\ No newline at end of file
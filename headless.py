@@ -0,0 +1,247 @@
+"""
+HEADLESS SCREEN - In-Memory Stand-In for stdscr
+Runs any game's main(stdscr) without a terminal, at full speed, with
+scripted or bot-driven input. Output goes into an in-memory grid.
+
+Run with: python headless.py dino2 --frames 5000 --bot random
+          python headless.py tetris --keys "  q" --show
+"""
+
+import argparse
+import curses
+import importlib
+import random
+import time
+
+import runtime
+
+
+class HeadlessExit(Exception):
+    """Raised inside the game to end a headless run (frame limit or stalled input)."""
+
+
+class HeadlessScreen:
+    """
+    Supports the stdscr subset the games use. `keys` is either an iterable
+    of key codes (one per getch, -1 once exhausted) or a callable
+    keys(screen) -> key used as a bot.
+    """
+
+    def __init__(self, h=30, w=100, keys=(), max_frames=None, max_idle=10000):
+        self.h, self.w = h, w
+        self.keys = keys if callable(keys) else iter(keys)
+        self.max_frames = max_frames
+        self.max_idle = max_idle
+        self.frames = 0
+        self.getch_calls = 0
+        self.idle = 0
+        # Frames drawn since the last getch, e.g. a "terminal too small" loop
+        self.blind = 0
+        # curses.error raised by addstr/insstr, i.e. exceptions a game had to catch
+        self.errors = 0
+        self.delay = -1
+        self.current_attr = 0
+        self.pending = []
+        self.resizes = {}
+        self.erase()
+
+    # --- Output ---
+    def erase(self):
+        self.glyphs = [[" "] * self.w for _ in range(self.h)]
+        self.attrs = [[0] * self.w for _ in range(self.h)]
+
+    clear = erase
+
+    def resize(self, h, w):
+        """Like curses' resizeterm(): new size, blank grid, KEY_RESIZE on the next getch."""
+        self.h, self.w = h, w
+        self.erase()
+        self.pending.append(curses.KEY_RESIZE)
+
+    def addstr(self, y, x, text, attr=None):
+        """Writes with wrap like curses and raises curses.error in the same places."""
+        if attr is None:
+            attr = self.current_attr
+        if not (0 <= y < self.h and 0 <= x < self.w):
+            self.fail("addwstr")
+        for ch in text:
+            if y >= self.h:
+                self.fail("addwstr")
+            self.glyphs[y][x] = ch
+            self.attrs[y][x] = attr
+            x += 1
+            if x == self.w:
+                x, y = 0, y + 1
+        if y >= self.h:
+            # Curses cannot move the cursor past the bottom-right cell
+            self.fail("addwstr")
+
+    def fail(self, call):
+        self.errors += 1
+        raise curses.error(f"{call}() returned ERR")
+
+    def insstr(self, y, x, text, attr=None):
+        if attr is None:
+            attr = self.current_attr
+        if not (0 <= y < self.h and 0 <= x < self.w):
+            self.fail("insnstr")
+        row, attrs = self.glyphs[y], self.attrs[y]
+        row[x:x] = text
+        attrs[x:x] = [attr] * len(text)
+        del row[self.w :], attrs[self.w :]
+
+    def attron(self, attr):
+        self.current_attr |= attr
+
+    def attroff(self, attr):
+        self.current_attr &= ~attr
+
+    def attrset(self, attr):
+        self.current_attr = attr
+
+    def refresh(self):
+        self.frames += 1
+        self.idle = 0
+        self.blind += 1
+        if self.blind > self.max_idle:
+            raise HeadlessExit("input not read")
+        if self.frames in self.resizes:
+            self.resize(*self.resizes.pop(self.frames))
+        if self.max_frames is not None and self.frames >= self.max_frames:
+            raise HeadlessExit("frame limit")
+
+    noutrefresh = refresh
+
+    # --- Input ---
+    def getch(self):
+        self.getch_calls += 1
+        self.idle += 1
+        self.blind = 0
+        if self.idle > self.max_idle:
+            raise HeadlessExit("input stalled")
+        if self.pending:
+            return self.pending.pop(0)
+        if callable(self.keys):
+            return self.keys(self)
+        return next(self.keys, -1)
+
+    def timeout(self, delay):
+        self.delay = delay
+
+    def nodelay(self, flag):
+        self.delay = 0 if flag else -1
+
+    def keypad(self, flag):
+        pass
+
+    def getmaxyx(self):
+        return self.h, self.w
+
+    def dump(self):
+        """Current grid as text, one line per row."""
+        return "\n".join("".join(row).rstrip() for row in self.glyphs)
+
+
+class headless_curses:
+    """
+    Context manager that swaps the curses functions games call on the
+    module (curs_set, start_color, init_pair, color_pair, ...) for versions
+    that work without initscr(). Attribute values match real curses.
+    """
+
+    def __init__(self):
+        self.pairs = {0: (curses.COLOR_WHITE, curses.COLOR_BLACK)}
+        self.saved = {}
+
+    def __enter__(self):
+        fakes = {
+            "curs_set": lambda visibility: 1,
+            "start_color": lambda: None,
+            "use_default_colors": lambda: None,
+            "has_colors": lambda: True,
+            "init_pair": lambda n, fg, bg: self.pairs.__setitem__(n, (fg, bg)),
+            "pair_content": lambda n: self.pairs.get(n, (curses.COLOR_WHITE, curses.COLOR_BLACK)),
+            "color_pair": lambda n: (n << 8) & curses.A_COLOR,
+            "pair_number": lambda attr: (attr & curses.A_COLOR) >> 8,
+            "endwin": lambda: None,
+            "napms": lambda ms: 0,
+        }
+        for name, fake in fakes.items():
+            self.saved[name] = getattr(curses, name, None)
+            setattr(curses, name, fake)
+        return self
+
+    def __exit__(self, *exc):
+        for name, original in self.saved.items():
+            if original is None:
+                delattr(curses, name)
+            else:
+                setattr(curses, name, original)
+        return False
+
+
+def run(main, h=30, w=100, keys=(), max_frames=None, max_idle=10000, resizes=None):
+    """
+    Runs main(stdscr) on a HeadlessScreen until it returns or hits a limit.
+    `resizes` maps a frame number to the (rows, cols) the screen becomes
+    after that frame.
+    """
+    screen = HeadlessScreen(h, w, keys, max_frames, max_idle)
+    screen.resizes = dict(resizes or {})
+    screen.exit_reason = "returned"
+    realtime, runtime.REALTIME = runtime.REALTIME, False
+    with headless_curses():
+        try:
+            main(screen)
+        except HeadlessExit as e:
+            screen.exit_reason = str(e)
+        finally:
+            runtime.REALTIME = realtime
+    return screen
+
+
+def random_bot(seed=None, rate=0.2):
+    """Presses a random game key on `rate` of frames, including R to restart."""
+    rng = random.Random(seed)
+    pool = [curses.KEY_UP, curses.KEY_DOWN, curses.KEY_LEFT, curses.KEY_RIGHT,
+            ord(' '), ord('w'), ord('s'), ord('r')]
+
+    def bot(screen):
+        return rng.choice(pool) if rng.random() < rate else -1
+    return bot
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a game without a terminal")
+    parser.add_argument("game", help="game module, e.g. dino2 or tetris.py")
+    parser.add_argument("--frames", type=int, default=2000, help="stop after this many frames")
+    parser.add_argument("--size", default="30x100", help="screen size as ROWSxCOLS")
+    parser.add_argument("--keys", default="", help="keys to send, one per getch, then none")
+    parser.add_argument("--bot", choices=["random"], help="drive input with a bot instead of --keys")
+    parser.add_argument("--seed", type=int, help="seed for the bot")
+    parser.add_argument("--resize", action="append", default=[],
+                        help="resize after a frame, e.g. 300:24x90 (repeatable)")
+    parser.add_argument("--show", action="store_true", help="print the final screen")
+    # Runtime flags (--seed, --record, --replay, ...) are left for the game
+    args, _ = parser.parse_known_args()
+
+    rows, cols = (int(n) for n in args.size.lower().split("x"))
+    resizes = {}
+    for spec in args.resize:
+        frame, size = spec.split(":")
+        resizes[int(frame)] = tuple(int(n) for n in size.lower().split("x"))
+    module = importlib.import_module(args.game[:-3] if args.game.endswith(".py") else args.game)
+    keys = random_bot(args.seed) if args.bot else [ord(c) for c in args.keys]
+
+    start = time.perf_counter()
+    screen = run(module.main, rows, cols, keys, max_frames=args.frames, resizes=resizes)
+    elapsed = time.perf_counter() - start
+    # Errors per second of play at the game's own frame rate
+    fps = getattr(module, "FPS", 60)
+
+    if args.show:
+        print(screen.dump())
+    print(f"{args.game}: {screen.frames} frames in {elapsed:.3f}s "
+          f"({screen.frames / max(elapsed, 1e-9):.0f} FPS), {screen.getch_calls} getch calls, "
+          f"{screen.errors} curses errors ({screen.errors * fps / max(1, screen.frames):.1f}/s at {fps} FPS), "
+          f"ended: {screen.exit_reason}")
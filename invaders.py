@@ -3,12 +3,17 @@ INVADERS PRO - 8-Bit Edition
 Controls: [ARROWS] Move, [SPACE] Shoot, [R] Restart
 """
 
-import curses
 import time
 import random
 
-FPS = 60
+from framebuffer import FrameBuffer, draw_shadow_text
+from keys import KEY_LEFT, KEY_RIGHT, curses
+from runtime import FixedStep, FrameScheduler, options, print_stats
+
+FPS = 60        # Render rate
+TICK_RATE = 60  # Simulation rate; movement timers count ticks
 ALIEN = "▀▄█▄▀"
+ALIEN_DX, ALIEN_DY = 6, 2  # Formation spacing in cells
 PLAYER = "▄███▄"
 
 LOGO_MAIN = [
@@ -20,115 +25,223 @@ LOGO_MAIN = [
     r" ╚═╝╚═╝  ╚═══╝  ╚═══╝  ╚═╝  ╚═╝╚═════╝ ╚══════╝╚═╝  ╚═╝╚══════╝ ╚═════╝╚══════╝╚═╝"
 ]
 
-def draw_shadow_text(stdscr, y, x, lines, color_pair, shadow_pair):
-    for i, line in enumerate(lines):
-        try:
-            stdscr.addstr(y + i + 1, x + 1, line, curses.color_pair(shadow_pair))
-            stdscr.addstr(y + i, x, line, curses.color_pair(color_pair) | curses.A_BOLD)
-        except: pass
+def draw_static(screen):
+    """Header. Cached by the framebuffer, redrawn only on resize."""
+    sh, sw = screen.getmaxyx()
+    draw_shadow_text(screen, 1, (sw - len(LOGO_MAIN[0])) // 2, LOGO_MAIN, 5, 4)
 
 class Invaders:
-    def __init__(self, h, w):
+    """
+    The alien formation is a fixed grid of COLS x ROWS slots with an alive
+    bitmap, placed at a formation offset (ox, oy). Per-row and per-column
+    alive counts keep the bounding box current as aliens die, so edge
+    checks are O(1) and a bullet finds its target by index, not by scanning.
+    """
+
+    def __init__(self, h, w, rng=None, rows=3):
+        self.rng = rng or random.Random()
         self.h, self.w = h, w
         self.px = w // 2
         self.bullets = []
         self.bombs = []
-        self.aliens = []
-        self.setup_aliens()
+        self.setup_formation(rows)
         self.dir = 1
         self.timer = 0
         self.score = 0
-
-    def setup_aliens(self):
-        for y in range(8, 14, 2):
-            for x in range(5, self.w - 12, 6):
-                self.aliens.append([float(x), y])
+        self.state = "PLAYING"
+
+    def setup_formation(self, rows):
+        self.ox, self.oy = 5.0, 8
+        self.rows, self.cols = rows, len(range(5, self.w - 12, ALIEN_DX))
+        self.alive = bytearray([1]) * (rows * self.cols)
+        self.row_count = [self.cols] * rows
+        self.col_count = [rows] * self.cols
+        self.count = rows * self.cols
+        self.left, self.right, self.bottom = 0, self.cols - 1, rows - 1
+
+    def positions(self):
+        """(x, y) of every living alien, top row first."""
+        for r in range(self.rows):
+            if not self.row_count[r]: continue
+            y = self.oy + r * ALIEN_DY
+            for c in range(self.left, self.right + 1):
+                if self.alive[r * self.cols + c]: yield self.ox + c * ALIEN_DX, y
+
+    def kill(self, r, c):
+        self.alive[r * self.cols + c] = 0
+        self.count -= 1
+        self.row_count[r] -= 1
+        self.col_count[c] -= 1
+        if not self.count: return
+        while not self.col_count[self.left]: self.left += 1
+        while not self.col_count[self.right]: self.right -= 1
+        while not self.row_count[self.bottom]: self.bottom -= 1
+
+    def hit(self, bx, by):
+        """The living alien a bullet at (bx, by) touches, as (row, col), or None."""
+        r, odd = divmod(int(by) - self.oy, ALIEN_DY)
+        if odd or not 0 <= r < self.rows or not self.row_count[r]: return None
+        # Bullet within 3 cells of the alien's centre (x + 2)
+        d = bx - self.ox - 2
+        c = int((d + 3) // ALIEN_DX)
+        if not (abs(d - c * ALIEN_DX) < 3 and 0 <= c < self.cols and self.alive[r * self.cols + c]):
+            return None
+        return r, c
+
+    def nth_alive(self, n):
+        """(x, y) of the n-th living alien in row-major order."""
+        for r in range(self.rows):
+            if n >= self.row_count[r]:
+                n -= self.row_count[r]
+                continue
+            for c in range(self.cols):
+                if self.alive[r * self.cols + c]:
+                    if not n: return self.ox + c * ALIEN_DX, self.oy + r * ALIEN_DY
+                    n -= 1
+
+    def resize(self, sh, sw):
+        """Re-clips the world to a new screen size without restarting the round."""
+        self.h, self.w = h, w = sh - 2, sw
+        self.px = max(1, min(self.px, w - 6))
+        # Slide the formation back inside the right edge if it no longer fits
+        if self.count:
+            overflow = self.ox + self.right * ALIEN_DX - (w - 7)
+            if overflow > 0:
+                self.ox = max(1.0 - self.left * ALIEN_DX, self.ox - overflow)
+        self.bullets = [b for b in self.bullets if b[0] < w]
+        self.bombs = [b for b in self.bombs if b[0] < w and b[1] < h - 1]
+
+    def step(self, key):
+        """One fixed tick. False once the round is won or lost (see state)."""
+        self.state = self.update(key)
+        return self.state == "PLAYING"
 
     def update(self, key):
-        if key == curses.KEY_LEFT and self.px > 1: self.px -= 1
-        if key == curses.KEY_RIGHT and self.px < self.w - 6: self.px += 1
+        if key == KEY_LEFT and self.px > 1: self.px -= 1
+        if key == KEY_RIGHT and self.px < self.w - 6: self.px += 1
         if key == ord(' ') and len(self.bullets) < 3:
             self.bullets.append([self.px + 2, self.h - 3])
 
         self.timer += 1
         move_freq = max(2, 30 - (self.score // 40))
-        if self.timer % move_freq == 0:
-            shift = False
-            for a in self.aliens:
-                if (self.dir == 1 and a[0] >= self.w - 7) or (self.dir == -1 and a[0] <= 1):
-                    self.dir *= -1
-                    shift = True
-                    break
-            for a in self.aliens:
-                if shift: a[1] += 1
-                else: a[0] += self.dir
-                if a[1] >= self.h - 3: return "LOST"
+        if self.timer % move_freq == 0 and self.count:
+            if ((self.dir == 1 and self.ox + self.right * ALIEN_DX >= self.w - 7) or
+                    (self.dir == -1 and self.ox + self.left * ALIEN_DX <= 1)):
+                self.dir *= -1
+                self.oy += 1
+            else:
+                self.ox += self.dir
+            if self.oy + self.bottom * ALIEN_DY >= self.h - 3: return "LOST"
 
-        for b in self.bullets[:]:
+        flying = []
+        for b in self.bullets:
             b[1] -= 0.6
-            if b[1] < 8: self.bullets.remove(b)
+            if b[1] < 8: continue
+            target = self.hit(b[0], b[1])
+            if target:
+                self.kill(*target)
+                self.score += 10
             else:
-                for a in self.aliens[:]:
-                    if abs(b[0] - (a[0] + 2)) < 3 and int(b[1]) == a[1]:
-                        self.aliens.remove(a)
-                        if b in self.bullets: self.bullets.remove(b)
-                        self.score += 10
-                        break
-        
-        for b in self.bombs[:]:
+                flying.append(b)
+        self.bullets = flying
+
+        falling = []
+        for b in self.bombs:
             b[1] += 0.4
-            if b[1] >= self.h - 1: self.bombs.remove(b)
-            elif int(b[1]) == self.h - 2 and abs(b[0] - (self.px + 2)) < 3: return "LOST"
+            if b[1] >= self.h - 1: continue
+            if int(b[1]) == self.h - 2 and abs(b[0] - (self.px + 2)) < 3: return "LOST"
+            falling.append(b)
+        self.bombs = falling
+
+        if self.count and self.rng.random() < 0.02:
+            x, y = self.nth_alive(self.rng.randrange(self.count))
+            self.bombs.append([x + 2, y + 1])
 
-        if self.aliens and random.random() < 0.02:
-            a = random.choice(self.aliens)
-            self.bombs.append([a[0] + 2, a[1] + 1])
-        
-        return "WON" if not self.aliens else "PLAYING"
+        return "WON" if not self.count else "PLAYING"
+
+def new_game(sh, sw, rng=None):
+    """A fresh round laid out for an sh x sw screen."""
+    return Invaders(sh - 2, sw, rng)
 
 def main(stdscr):
     curses.curs_set(0)
     stdscr.nodelay(True)
-    stdscr.timeout(1000 // FPS)
     curses.start_color()
     curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK)
     curses.init_pair(2, curses.COLOR_RED, curses.COLOR_BLACK)
     curses.init_pair(3, curses.COLOR_YELLOW, curses.COLOR_BLACK)
     curses.init_pair(4, curses.COLOR_CYAN, curses.COLOR_BLACK)
     curses.init_pair(5, curses.COLOR_WHITE, curses.COLOR_BLACK)
+    screen = FrameBuffer(stdscr, background=draw_static)
+    clock = FrameScheduler(FPS, "invaders")
+    sim = FixedStep(TICK_RATE, "invaders")
 
     while True:
+        stdscr.nodelay(True)
         sh, sw = stdscr.getmaxyx()
-        game = Invaders(sh - 2, sw)
+        game = sim.start(new_game, sh, sw)
         state = "PLAYING"
 
         while state == "PLAYING":
             key = stdscr.getch()
             if key in [ord('q'), ord('Q')]: return
-            res = game.update(key)
-            if res != "PLAYING": state = res
-
-            stdscr.erase()
-            logo_x = (sw - len(LOGO_MAIN[0])) // 2
-            draw_shadow_text(stdscr, 1, logo_x, LOGO_MAIN, 5, 4)
-
-            try:
-                stdscr.addstr(game.h - 2, game.px, PLAYER, curses.color_pair(1))
-                for a in game.aliens: stdscr.addstr(int(a[1]), int(a[0]), ALIEN, curses.color_pair(2))
-                for b in game.bullets: stdscr.addstr(int(b[1]), int(b[0]), "┃", curses.color_pair(3))
-                for b in game.bombs: stdscr.addstr(int(b[1]), int(b[0]), "░", curses.color_pair(2))
-                stdscr.addstr(7, 2, f"SCORE: {game.score}", curses.A_BOLD)
-            except: pass
-            stdscr.refresh()
+            if key == curses.KEY_RESIZE:
+                sh, sw = stdscr.getmaxyx()
+                sim.resize(sh, sw)
+            else:
+                sim.feed(key)
+            for k in sim.ticks():
+                if not game.step(k):
+                    state = game.state
+                    break
+
+            if clock.render_due():
+                screen.erase()
+
+                screen.addstr(game.h - 2, game.px, PLAYER, curses.color_pair(1))
+                for x, y in game.positions(): screen.addstr(int(y), int(x), ALIEN, curses.color_pair(2))
+                for b in game.bullets: screen.addstr(int(b[1]), int(b[0]), "┃", curses.color_pair(3))
+                for b in game.bombs: screen.addstr(int(b[1]), int(b[0]), "░", curses.color_pair(2))
+                screen.addstr(7, 2, f"SCORE: {game.score}", curses.A_BOLD)
+                screen.refresh()
+            clock.wait()
 
         msg = "YOU WIN!" if state == "WON" else "GAME OVER"
-        stdscr.addstr(sh // 2 + 5, sw // 2 - 4, msg, curses.A_REVERSE)
-        stdscr.addstr(sh // 2 + 6, sw // 2 - 11, "Press 'R' to Restart", curses.A_BOLD)
-        stdscr.refresh()
+        screen.addstr(sh // 2 + 5, sw // 2 - 4, msg, curses.A_REVERSE)
+        screen.addstr(sh // 2 + 6, sw // 2 - 11, "Press 'R' to Restart", curses.A_BOLD)
+        screen.refresh()
+        # A replay moves on to its next recorded round by itself
+        stdscr.timeout(1000 if sim.replaying else -1)
         while True:
             key = stdscr.getch()
-            if key in [ord('r'), ord('R')]: break
+            if key in [ord('r'), ord('R')] or (key == -1 and sim.replaying): break
             if key in [ord('q'), ord('Q')]: return
 
+def stress(ticks=300, volley=4):
+    """
+    Tick cost as the formation grows: each row is a taller, wider board
+    with more aliens, fired at by `volley` bullets a tick at random columns.
+    Bombs are cleared so the round never ends early. Run: python invaders.py --stress
+    """
+    print(f"{'ALIENS':>8}{'BULLETS':>9}{'KILLS':>7}{'US/TICK':>9}")
+    for rows, w in [(3, 100), (6, 200), (12, 400), (24, 800), (48, 1600)]:
+        rng = random.Random(rows)
+        game = Invaders(8 + rows * ALIEN_DY + 60, w, rng, rows)
+        start_count, flying = game.count, 0
+        started = time.perf_counter()
+        for _ in range(ticks):
+            for _ in range(volley):
+                game.bullets.append([rng.randrange(w), game.h - 3])
+            game.bombs.clear()
+            game.update(-1)
+            flying += len(game.bullets)
+        elapsed = time.perf_counter() - started
+        print(f"{start_count:>8}{flying // ticks:>9}{start_count - game.count:>7}"
+              f"{elapsed / ticks * 1e6:>9.1f}")
+
 if __name__ == "__main__":
-    curses.wrapper(main)
+    if options().bench:
+        stress()
+    else:
+        curses.wrapper(main)
+        print_stats()
@@ -0,0 +1,21 @@
+"""
+KEYS - Key Codes Without a Terminal
+The curses key codes the game worlds react to. They come from curses
+when it can be imported and fall back to ncurses' own values when it
+cannot (e.g. Windows without windows-curses), so worlds, envs.py and
+other headless tools import and run with no curses at all.
+
+curses is re-exported as None in that case; only code that draws (the
+games' main()) needs the real module.
+"""
+
+try:
+    import curses
+except ImportError:
+    curses = None
+
+KEY_DOWN = getattr(curses, "KEY_DOWN", 258)
+KEY_UP = getattr(curses, "KEY_UP", 259)
+KEY_LEFT = getattr(curses, "KEY_LEFT", 260)
+KEY_RIGHT = getattr(curses, "KEY_RIGHT", 261)
+KEY_RESIZE = getattr(curses, "KEY_RESIZE", 410)
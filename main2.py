@@ -7,54 +7,56 @@ Controls: [SPACE/UP] Jump, [R] Restart, [Q] Quit
 """
 
 import curses
-import time
 import random
 
+from framebuffer import Sprite, addstr_clipped, blit
+from runtime import FrameScheduler, pause, print_stats
+
 # --- 8-BIT PIXEL ART (Refined Proportions) ---
 # Dino is 6x12 pixels. Designed for a "chunky" 8-bit look.
-DINO_RUN1 = [
+DINO_RUN1 = Sprite([
     r"      ▄█████",
     r"      ██████",
     r"      ███▀▀▀",
     r"▄█████████  ",
     r"██████████  ",
     r"  █▄   █    "
-]
+])
 
-DINO_RUN2 = [
+DINO_RUN2 = Sprite([
     r"      ▄█████",
     r"      ██████",
     r"      ███▀▀▀",
     r"▄█████████  ",
     r"██████████  ",
     r"   █   █▄   "
-]
+])
 
-DINO_JUMP = [
+DINO_JUMP = Sprite([
     r"      ▄█████",
     r"      ██████",
     r"      ███▀▀▀",
     r"▄█████████  ",
     r"██████████  ",
     r"  ▄█   ▄█   "
-]
+])
 
-DINO_DEAD = [
+DINO_DEAD = Sprite([
     r"      ▄█████",
     r"      ███▀█▀",
     r"      ███▀▀▀",
     r"▄█████████  ",
     r"██████████  ",
     r"  █▄   █▄   "
-]
+])
 
 # Cacti are shorter (4 lines) to ensure the jump clears them comfortably.
-CACTUS = [
+CACTUS = Sprite([
     r"  █  ",
     r"▄ █ ▄",
     r"█▀█▀█",
     r"  █  "
-]
+])
 
 # --- ARCADE PHYSICS CONSTANTS (Fine-Tuned) ---
 GRAVITY = 0.52          # Pull per frame
@@ -96,6 +98,13 @@ class ProDino:
         
         self.frame_count += 1
 
+    def move_ground(self, ground_y):
+        """Keeps the dino on the ground when the terminal height changes."""
+        shift = ground_y - self.ground_y
+        self.ground_y = ground_y
+        self.base_y += shift
+        self.y += shift
+
     def get_sprite(self, dead=False):
         if dead: return DINO_DEAD
         if self.is_jumping: return DINO_JUMP
@@ -116,24 +125,24 @@ def main(stdscr):
     # --- Curses Prep ---
     curses.curs_set(0)
     stdscr.nodelay(True)
-    # Using small timeout to prevent blocking while maintaining FPS
-    stdscr.timeout(1)
     
     curses.start_color()
     curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK)  # Dino/Cactus
     curses.init_pair(2, curses.COLOR_YELLOW, curses.COLOR_BLACK) # Score
     curses.init_pair(3, curses.COLOR_WHITE, curses.COLOR_BLACK)  # Ground
     curses.init_pair(4, curses.COLOR_RED, curses.COLOR_BLACK)    # Game Over
+    clock = FrameScheduler(FPS, "main2")
 
     high_score = 0
 
     while True: # Outer loop for Restart
+        stdscr.nodelay(True)
         sh, sw = stdscr.getmaxyx()
         if sh < MIN_HEIGHT or sw < MIN_WIDTH:
             stdscr.erase()
-            stdscr.addstr(0, 0, "TERMINAL TOO SMALL! RE-SIZE TO 80x20")
+            addstr_clipped(stdscr, 0, 0, "TERMINAL TOO SMALL! RE-SIZE TO 80x20")
             stdscr.refresh()
-            time.sleep(1)
+            pause(1)
             continue
 
         ground_y = sh - 6
@@ -145,18 +154,22 @@ def main(stdscr):
         state = "PLAYING"
         space_pressed = False
 
-        last_time = time.time()
-
         while state == "PLAYING":
-            # --- Frame Timing (Locked 60 FPS) ---
-            current_time = time.time()
-            elapsed = current_time - last_time
-            if elapsed < (1.0 / FPS):
-                continue
-            last_time = current_time
-
             # --- Input Handling ---
             key = stdscr.getch()
+            if key == curses.KEY_RESIZE:
+                sh, sw = stdscr.getmaxyx()
+                for obs in obstacles: obs.y += sh - 6 - ground_y
+                ground_y = sh - 6
+                dino.move_ground(ground_y)
+            if sh < MIN_HEIGHT or sw < MIN_WIDTH:
+                # Too small to play: hold the round until the terminal grows back
+                if key in [ord('q'), ord('Q')]: return
+                stdscr.erase()
+                addstr_clipped(stdscr, 0, 0, "TERMINAL TOO SMALL! RE-SIZE TO 80x20")
+                stdscr.refresh()
+                clock.wait()
+                continue
             if key in [ord(' '), curses.KEY_UP]:
                 dino.jump()
                 space_pressed = True
@@ -190,43 +203,41 @@ def main(stdscr):
                     dy + 1 < oy + 4 and dy + 5 > oy):
                     state = "DEAD"
 
-            # --- Rendering ---
-            stdscr.erase()
+            if clock.render_due():
+                # --- Rendering ---
+                stdscr.erase()
             
-            # Draw Ground Line
-            stdscr.addstr(ground_y + 1, 0, "█" * (sw - 1), curses.color_pair(3))
+                # Draw Ground Line
+                addstr_clipped(stdscr, ground_y + 1, 0, "█" * (sw - 1), curses.color_pair(3))
             
-            # Draw Obstacles
-            for obs in obstacles:
-                for i, line in enumerate(CACTUS):
-                    if 0 <= int(obs.x) < sw - 6:
-                        stdscr.addstr(int(obs.y) + i, int(obs.x), line, curses.color_pair(1))
+                # Draw Obstacles
+                for obs in obstacles:
+                    blit(stdscr, int(obs.y), int(obs.x), CACTUS, curses.color_pair(1))
             
-            # Draw Dino
-            sprite = dino.get_sprite()
-            for i, line in enumerate(sprite):
-                if 0 <= int(dino.x) < sw - 12:
-                    stdscr.addstr(int(dino.y) + i, int(dino.x), line, curses.color_pair(1))
+                # Draw Dino (spaces are transparent, so overlapping cacti stay visible)
+                blit(stdscr, int(dino.y), int(dino.x), dino.get_sprite(), curses.color_pair(1))
             
-            # Scoreboard
-            high_score = max(high_score, int(score))
-            stdscr.addstr(1, sw - 22, f"HI-SCORE: {high_score:05}", curses.color_pair(2) | curses.A_BOLD)
-            stdscr.addstr(2, sw - 22, f"SCORE:    {int(score):05}", curses.color_pair(2))
+                # Scoreboard
+                high_score = max(high_score, int(score))
+                addstr_clipped(stdscr, 1, sw - 22, f"HI-SCORE: {high_score:05}", curses.color_pair(2) | curses.A_BOLD)
+                addstr_clipped(stdscr, 2, sw - 22, f"SCORE:    {int(score):05}", curses.color_pair(2))
             
-            stdscr.refresh()
+                stdscr.refresh()
+
+            # --- Frame Timing (Locked 60 FPS, sleeps instead of spinning) ---
+            clock.wait()
 
         # --- Game Over Screen ---
-        sprite = dino.get_sprite(dead=True)
-        for i, line in enumerate(sprite):
-            stdscr.addstr(int(dino.y) + i, int(dino.x), line, curses.color_pair(4))
+        blit(stdscr, int(dino.y), int(dino.x), dino.get_sprite(dead=True), curses.color_pair(4), opaque=True)
         
         msg = "  █▀▀ █▀█ █▀▄▀█ █▀▀   █▀█ █░█ █▀▀ █▀█  "
         msg2 = "  █▄█ █▀█ █░▀░█ ██▄   █▄█ ▀▄▀ ██▄ █▀▄  "
-        stdscr.addstr(sh // 2 - 1, (sw - len(msg)) // 2, msg, curses.color_pair(4))
-        stdscr.addstr(sh // 2, (sw - len(msg2)) // 2, msg2, curses.color_pair(4))
-        stdscr.addstr(sh // 2 + 2, (sw - 18) // 2, "PRESS 'R' TO RETRY", curses.A_BOLD)
+        addstr_clipped(stdscr, sh // 2 - 1, (sw - len(msg)) // 2, msg, curses.color_pair(4))
+        addstr_clipped(stdscr, sh // 2, (sw - len(msg2)) // 2, msg2, curses.color_pair(4))
+        addstr_clipped(stdscr, sh // 2 + 2, (sw - 18) // 2, "PRESS 'R' TO RETRY", curses.A_BOLD)
         stdscr.refresh()
 
+        stdscr.nodelay(False)
         while True:
             key = stdscr.getch()
             if key in [ord('r'), ord('R')]: break
@@ -234,3 +245,4 @@ def main(stdscr):
 
 if __name__ == "__main__":
     curses.wrapper(main)
+    print_stats()
@@ -1,15 +1,24 @@
 """
 PINGPONG DELUXE - 8-Bit Edition
 Controls: [W/S] Left Player, [UP/DOWN] Right Player, [R] Restart
+Run with --cpu to play the left paddle against the computer, or --demo
+to watch it play itself.
 """
 
-import curses
+import sys
 import time
 import random
 
+from framebuffer import FrameBuffer, draw_shadow_text
+from keys import KEY_DOWN, KEY_UP, curses
+from runtime import FixedStep, FrameScheduler, lerp, options, print_stats
+
 PADDLE_H = 4
 BALL = "█"
-FPS = 60
+FPS = 60        # Render rate
+TICK_RATE = 60  # Simulation rate; ball speeds are in cells per tick
+TOP = 8         # Ball rows run from TOP to h - 1, reflecting off both
+CPU_PLAYERS = 0 # Paddles the computer plays: 0, 1 (right) or 2 (both)
 
 LOGO_MAIN = [
     r" ██████╗ ██╗███╗   ██╗ ██████╗      ██████╗  ██████╗ ███╗   ██╗ ██████╗  ██████╗██╗     ██╗",
@@ -20,16 +29,40 @@ LOGO_MAIN = [
     r" ╚═╝     ╚═╝╚═╝  ╚═══╝ ╚═════╝      ╚═╝      ╚═════╝ ╚═╝  ╚═══╝ ╚═════╝  ╚═════╝╚══════╝╚═╝"
 ]
 
-def draw_shadow_text(stdscr, y, x, lines, color_pair, shadow_pair):
-    for i, line in enumerate(lines):
-        try:
-            stdscr.addstr(y + i + 1, x + 1, line, curses.color_pair(shadow_pair))
-            stdscr.addstr(y + i, x, line, curses.color_pair(color_pair) | curses.A_BOLD)
-        except: pass
+def draw_static(screen):
+    """Header and net. Cached by the framebuffer, redrawn only on resize."""
+    sh, sw = screen.getmaxyx()
+    draw_shadow_text(screen, 1, (sw - len(LOGO_MAIN[0])) // 2, LOGO_MAIN, 1, 3)
+    for y in range(8, sh - 2, 2): screen.addstr(y, sw // 2, "╎")
+
+def bounce(y, top, bottom):
+    """
+    (y folded into top..bottom as if reflected off both walls, +1 or -1):
+    the sign is -1 when the ball ends up travelling the other way.
+    """
+    span = bottom - top
+    if span <= 0: return float(top), 1
+    m = (y - top) % (2 * span)
+    return (top + m, 1) if m <= span else (top + 2 * span - m, -1)
 
 class Pong:
-    def __init__(self, h, sw):
+    """
+    The ball is swept along its whole path each tick. A paddle catches it
+    if the ball's rows while crossing the paddle's column (x 3..4 on the
+    left, sw - 4..sw - 3 on the right) overlap the paddle's, and the ball
+    bounces back from the paddle face, possibly more than once in a tick.
+    Walls reflect the ball's position, not just its velocity. So the ball
+    cannot skip a paddle however fast rallies get.
+
+    A computer paddle predicts where the ball will cross its column by
+    folding the straight path off the walls (intercept), once per hit,
+    and moves one row a tick towards it, like a player holding a key.
+    """
+
+    def __init__(self, h, sw, rng=None, cpu=0):
+        self.rng = rng or random.Random()
         self.h, self.sw = h, sw
+        self.cpu = cpu
         self.p1_y = h // 2 - 2
         self.p2_y = h // 2 - 2
         self.reset_ball()
@@ -37,26 +70,78 @@ class Pong:
 
     def reset_ball(self):
         self.bx, self.by = self.sw // 2, self.h // 2 + 3
-        self.vx = 0.8 if random.random() > 0.5 else -0.8
-        self.vy = 0.4 if random.random() > 0.5 else -0.4
+        self.prev_ball = (self.bx, self.by)
+        self.vx = 0.8 if self.rng.random() > 0.5 else -0.8
+        self.vy = 0.4 if self.rng.random() > 0.5 else -0.4
+        self.aim = None
+
+    def resize(self, sh, sw):
+        """Re-clips paddles and ball to a new screen size without restarting the round."""
+        self.h, self.sw = h, sw = sh - 2, sw
+        self.p1_y = max(8, min(self.p1_y, h - PADDLE_H))
+        self.p2_y = max(8, min(self.p2_y, h - PADDLE_H))
+        self.bx = min(self.bx, sw - 5)
+        self.by = max(8, min(self.by, h - 1))
+        self.prev_ball = (self.bx, self.by)
+        self.aim = None
+
+    def intercept(self, x):
+        """The row the ball will be on when it reaches column x, or None if it is heading away."""
+        if (x - self.bx) * self.vx <= 0: return None
+        return bounce(self.by + self.vy * (x - self.bx) / self.vx, TOP, self.h - 1)[0]
+
+    def track(self, paddle_y, towards):
+        """One CPU move: the paddle's new top row."""
+        if towards:
+            if self.aim is None:
+                self.aim = self.intercept(3.5 if self.vx < 0 else self.sw - 3.5)
+            # Past the aim column already: just follow the ball
+            target = self.by if self.aim is None else self.aim
+        else:
+            target = (TOP + self.h) / 2
+        want = max(8, min(round(target - PADDLE_H / 2), self.h - PADDLE_H))
+        return paddle_y + (want > paddle_y) - (want < paddle_y)
+
+    def step(self, key):
+        """One fixed tick. False once a player reaches 10."""
+        self.prev_ball = (self.bx, self.by)
+        return self.update(key)
 
     def update(self, key):
-        if key == ord('w') and self.p1_y > 8: self.p1_y -= 1
-        if key == ord('s') and self.p1_y < self.h - PADDLE_H: self.p1_y += 1
-        if key == curses.KEY_UP and self.p2_y > 8: self.p2_y -= 1
-        if key == curses.KEY_DOWN and self.p2_y < self.h - PADDLE_H: self.p2_y += 1
-
-        self.bx += self.vx
-        self.by += self.vy
-
-        if self.by <= 8 or self.by >= self.h - 1: self.vy *= -1
-
-        if int(self.bx) == 3 and self.p1_y <= self.by <= self.p1_y + PADDLE_H:
-            self.vx = abs(self.vx) + 0.05
-            self.vy += (random.random() - 0.5) * 0.2
-        if int(self.bx) == self.sw - 4 and self.p2_y <= self.by <= self.p2_y + PADDLE_H:
-            self.vx = -abs(self.vx) - 0.05
-            self.vy += (random.random() - 0.5) * 0.2
+        if self.cpu >= 2:
+            self.p1_y = self.track(self.p1_y, self.vx < 0)
+        else:
+            if key == ord('w') and self.p1_y > 8: self.p1_y -= 1
+            if key == ord('s') and self.p1_y < self.h - PADDLE_H: self.p1_y += 1
+        if self.cpu >= 1:
+            self.p2_y = self.track(self.p2_y, self.vx > 0)
+        else:
+            if key == KEY_UP and self.p2_y > 8: self.p2_y -= 1
+            if key == KEY_DOWN and self.p2_y < self.h - PADDLE_H: self.p2_y += 1
+
+        left_time = 1.0
+        while True:
+            # The paddle column the ball is heading into, and when it enters and reaches the face
+            if self.vx < 0:
+                enter, face, paddle_y = (self.bx - 4) / -self.vx, (self.bx - 3) / -self.vx, self.p1_y
+            else:
+                enter, face, paddle_y = (self.sw - 4 - self.bx) / self.vx, (self.sw - 3 - self.bx) / self.vx, self.p2_y
+            enter, end = max(enter, 0.0), min(face, left_time)
+            hit = False
+            if face >= 0 and enter <= end:
+                ya = bounce(self.by + self.vy * enter, TOP, self.h - 1)[0]
+                yb = bounce(self.by + self.vy * end, TOP, self.h - 1)[0]
+                hit = paddle_y <= max(ya, yb) and min(ya, yb) <= paddle_y + PADDLE_H
+            dt = end if hit else left_time
+            self.bx += self.vx * dt
+            self.by, turn = bounce(self.by + self.vy * dt, TOP, self.h - 1)
+            self.vy *= turn
+            left_time -= dt
+            if not hit: break
+            self.vx = abs(self.vx) + 0.05 if self.vx < 0 else -abs(self.vx) - 0.05
+            self.vy += (self.rng.random() - 0.5) * 0.2
+            self.aim = None
+            if left_time <= 0: break
 
         if self.bx < 0:
             self.s2 += 1
@@ -67,45 +152,86 @@ class Pong:
         
         return self.s1 < 10 and self.s2 < 10
 
+def new_game(sh, sw, rng=None, cpu=None):
+    """A fresh round laid out for an sh x sw screen; cpu defaults to CPU_PLAYERS."""
+    return Pong(sh - 2, sw, rng, CPU_PLAYERS if cpu is None else cpu)
+
 def main(stdscr):
     curses.curs_set(0)
     stdscr.nodelay(True)
-    stdscr.timeout(1000 // FPS)
     curses.start_color()
     curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLACK)
     curses.init_pair(3, curses.COLOR_CYAN, curses.COLOR_BLACK)
+    screen = FrameBuffer(stdscr, background=draw_static)
+    clock = FrameScheduler(FPS, "pong")
+    cpu = 2 if "--demo" in sys.argv else 1 if "--cpu" in sys.argv else CPU_PLAYERS
+    # The cpu mode goes into recordings, and a replay uses the recorded one
+    sim = FixedStep(TICK_RATE, "pong", game_options={"cpu": cpu})
 
     while True:
+        stdscr.nodelay(True)
         sh, sw = stdscr.getmaxyx()
-        game = Pong(sh - 2, sw)
+        game = sim.start(new_game, sh, sw)
         state = "PLAYING"
 
         while state == "PLAYING":
             key = stdscr.getch()
             if key in [ord('q'), ord('Q')]: return
-            if not game.update(key): state = "GAMEOVER"
-
-            stdscr.erase()
-            logo_x = (sw - len(LOGO_MAIN[0])) // 2
-            draw_shadow_text(stdscr, 1, logo_x, LOGO_MAIN, 1, 3)
-
-            for y in range(8, sh - 2, 2): stdscr.addstr(y, sw // 2, "╎")
-            for i in range(PADDLE_H):
-                stdscr.addstr(int(game.p1_y) + i, 2, "█")
-                stdscr.addstr(int(game.p2_y) + i, sw - 3, "█")
-            if 8 <= int(game.by) < sh - 2 and 0 <= int(game.bx) < sw:
-                stdscr.addstr(int(game.by), int(game.bx), BALL)
+            if key == curses.KEY_RESIZE:
+                sh, sw = stdscr.getmaxyx()
+                sim.resize(sh, sw)
+            else:
+                sim.feed(key)
+            for k in sim.ticks():
+                if not game.step(k):
+                    state = "GAMEOVER"
+                    break
+
+            if clock.render_due():
+                screen.erase()
+                for i in range(PADDLE_H):
+                    screen.addstr(int(game.p1_y) + i, 2, "█")
+                    screen.addstr(int(game.p2_y) + i, sw - 3, "█")
+                bx = int(lerp(game.prev_ball[0], game.bx, sim.alpha))
+                by = int(lerp(game.prev_ball[1], game.by, sim.alpha))
+                if 8 <= by < sh - 2 and 0 <= bx < sw:
+                    screen.addstr(by, bx, BALL)
             
-            stdscr.addstr(sh - 2, sw // 2 - 10, f"P1: {game.s1}   P2: {game.s2}", curses.A_BOLD)
-            stdscr.refresh()
-
-        stdscr.addstr(sh // 2 + 5, sw // 2 - 5, "GAME OVER", curses.A_REVERSE)
-        stdscr.addstr(sh // 2 + 6, sw // 2 - 11, "Press 'R' to Restart", curses.A_BOLD)
-        stdscr.refresh()
+                screen.addstr(sh - 2, sw // 2 - 10, f"P1: {game.s1}   P2: {game.s2}", curses.A_BOLD)
+                screen.refresh()
+            clock.wait()
+
+        screen.addstr(sh // 2 + 5, sw // 2 - 5, "GAME OVER", curses.A_REVERSE)
+        screen.addstr(sh // 2 + 6, sw // 2 - 11, "Press 'R' to Restart", curses.A_BOLD)
+        screen.refresh()
+        # A replay moves on to its next recorded round by itself
+        stdscr.timeout(1000 if sim.replaying else -1)
         while True:
             key = stdscr.getch()
-            if key in [ord('r'), ord('R')]: break
+            if key in [ord('r'), ord('R')] or (key == -1 and sim.replaying): break
             if key in [ord('q'), ord('Q')]: return
 
+def bench(games=10):
+    """
+    Computer against computer, headless, on a few screen sizes: ticks per
+    second, and the top ball speed reached before a paddle could no longer
+    get there in time. Run: python pong.py --bench
+    """
+    print(f"{'SCREEN':>9}{'GAMES':>7}{'TICKS':>10}{'TICKS/S':>10}{'TOP VX':>8}")
+    for sh, sw in [(30, 100), (60, 200), (30, 200)]:
+        ticks, top = 0, 0.0
+        started = time.perf_counter()
+        for seed in range(games):
+            game = new_game(sh, sw, random.Random(seed), cpu=2)
+            while game.update(-1):
+                ticks += 1
+                top = max(top, abs(game.vx))
+        elapsed = time.perf_counter() - started
+        print(f"{sw:>5}x{sh:<3}{games:>7}{ticks:>10}{ticks / elapsed:>10.0f}{top:>8.2f}")
+
 if __name__ == "__main__":
-    curses.wrapper(main)
+    if options().bench:
+        bench()
+    else:
+        curses.wrapper(main)
+        print_stats()
@@ -0,0 +1,182 @@
+"""
+PTY HARNESS - Terminal Output Bandwidth and Syscall Recorder
+Launches a game under a pseudo-terminal, feeds it scripted keys and records
+what it pushes to the terminal: bytes, write syscalls and the gaps between
+frames. Each run is saved as a JSON report so rendering cost can be
+tracked over time.
+
+Run with: python ptyharness.py --all
+          python ptyharness.py "PONG CLASSIC" --duration 5 --game-args="--backend ansi"
+          python ptyharness.py tetris.py --script "0.5:LEFT 1:SPACE 2:UP"
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import pty
+import select
+import shlex
+import signal
+import struct
+import sys
+import termios
+import time
+
+from arcade import GAME_DIR, GAMES
+from runtime import percentile
+
+KEYS = {
+    "SPACE": b" ",
+    "ENTER": b"\r",
+    "UP": b"\x1b[A",
+    "DOWN": b"\x1b[B",
+    "RIGHT": b"\x1b[C",
+    "LEFT": b"\x1b[D",
+}
+
+# Output separated by less than this much silence belongs to the same frame
+FRAME_GAP = 0.002
+
+
+def parse_script(text):
+    """'0.5:SPACE 1:UP 2:q' -> [(0.5, b' '), (1.0, b'\\x1b[A'), (2.0, b'q')]"""
+    events = []
+    for token in text.split():
+        at, key = token.split(":", 1)
+        events.append((float(at), KEYS.get(key.upper(), key.encode())))
+    return sorted(events)
+
+
+def resolve(target):
+    """A GAMES name or file, or a path to a game script -> (label, path)."""
+    for game in GAMES:
+        if target in (game["name"], game["file"], os.path.splitext(game["file"])[0]):
+            return os.path.splitext(game["file"])[0], os.path.join(GAME_DIR, game["file"])
+    return os.path.splitext(os.path.basename(target))[0], os.path.abspath(target)
+
+
+def read_proc_io(pid):
+    """Write counters of a running process from /proc (Linux only), else None."""
+    try:
+        with open(f"/proc/{pid}/io") as f:
+            fields = dict(line.split(": ") for line in f.read().splitlines())
+        return int(fields["syscw"]), int(fields["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def record(path, script, duration, rows=30, cols=100, game_args=()):
+    """Runs one game under a pty and returns its measurements."""
+    pid, fd = pty.fork()
+    if pid == 0:
+        try:
+            fcntl.ioctl(0, termios.TIOCSWINSZ, struct.pack("HHHH", rows, cols, 0, 0))
+            os.environ["TERM"] = os.environ.get("TERM", "xterm-256color")
+            os.chdir(GAME_DIR)
+            os.execv(sys.executable, [sys.executable, path, *game_args])
+        except OSError as e:
+            # Never fall through into the parent's recording loop
+            os.write(2, f"cannot start {path}: {e}\n".encode())
+        finally:
+            os._exit(127)
+
+    chunks = []  # (timestamp, size) for every read from the master
+    start = time.monotonic()
+    io_start = read_proc_io(pid)
+    pending = list(script)
+    io_end, next_sample = io_start, 0.0
+    try:
+        while True:
+            now = time.monotonic() - start
+            # Sample while the game is alive; /proc may be gone once it exits
+            if now >= next_sample:
+                io_end = read_proc_io(pid) or io_end
+                next_sample = now + 0.1
+            while pending and pending[0][0] <= now:
+                os.write(fd, pending.pop(0)[1])
+            if now >= duration:
+                break
+            ready, _, _ = select.select([fd], [], [], 0.001)
+            if ready:
+                try:
+                    data = os.read(fd, 65536)
+                except OSError:
+                    break
+                if not data:
+                    break
+                chunks.append((time.monotonic() - start, len(data)))
+        io_end = read_proc_io(pid) or io_end
+    finally:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        os.waitpid(pid, 0)
+        os.close(fd)
+
+    # Group reads into frames by the silence between them
+    frames = []
+    for at, size in chunks:
+        if frames and at - frames[-1][1] < FRAME_GAP:
+            frames[-1][1] = at
+            frames[-1][2] += size
+        else:
+            frames.append([at, at, size])
+    gaps = [(b[0] - a[0]) * 1000 for a, b in zip(frames, frames[1:])]
+
+    total = sum(size for _, size in chunks)
+    report = {
+        "rows": rows,
+        "cols": cols,
+        "duration_s": duration,
+        "game_args": list(game_args),
+        "bytes": total,
+        "reads": len(chunks),
+        "frames": len(frames),
+        "bytes_per_frame": total / max(1, len(frames)),
+        "bytes_per_s": total / duration,
+        "frame_gap_ms": {
+            "p50": percentile(gaps, 50),
+            "p95": percentile(gaps, 95),
+            "p99": percentile(gaps, 99),
+            "max": max(gaps, default=0.0),
+        },
+        "write_syscalls": None,
+        "bytes_written": None,
+    }
+    if io_start and io_end:
+        report["write_syscalls"] = io_end[0] - io_start[0]
+        report["bytes_written"] = io_end[1] - io_start[1]
+        report["writes_per_frame"] = report["write_syscalls"] / max(1, len(frames))
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure terminal output of games under a pty")
+    parser.add_argument("targets", nargs="*", help="GAMES names, game files, or paths")
+    parser.add_argument("--all", action="store_true", help="run every entry in GAMES")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per game")
+    parser.add_argument("--script", default="", help="timed keys, e.g. '0.5:SPACE 1:UP 2:q'")
+    parser.add_argument("--size", default="30x100", help="terminal size as ROWSxCOLS")
+    parser.add_argument("--game-args", default="", help="extra arguments for the game")
+    parser.add_argument("--out", default="pty_reports", help="directory for JSON reports")
+    args = parser.parse_args()
+
+    targets = [g["file"] for g in GAMES] if args.all else args.targets
+    if not targets:
+        parser.error("name a game or pass --all")
+    rows, cols = (int(n) for n in args.size.lower().split("x"))
+    script = parse_script(args.script)
+    os.makedirs(args.out, exist_ok=True)
+
+    print(f"{'GAME':<12}{'BYTES':>10}{'FRAMES':>8}{'B/FRAME':>10}{'WRITES':>8}{'GAP p95':>10}")
+    for target in targets:
+        label, path = resolve(target)
+        report = record(path, script, args.duration, rows, cols, shlex.split(args.game_args))
+        report.update(game=label, file=os.path.basename(path), recorded_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+        with open(os.path.join(args.out, f"{label}.json"), "w") as f:
+            json.dump(report, f, indent=2)
+        writes = report["write_syscalls"] if report["write_syscalls"] is not None else "n/a"
+        print(f"{label:<12}{report['bytes']:>10}{report['frames']:>8}{report['bytes_per_frame']:>10.1f}"
+              f"{writes:>8}{report['frame_gap_ms']['p95']:>10.2f}")
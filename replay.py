@@ -0,0 +1,427 @@
+"""
+REPLAY - Session Recording and Deterministic Playback
+A recording is the RNG seed plus every input event, tagged with the
+simulation tick it landed on. Worlds only change inside step(key) and
+draw randomness from the seeded RNG, so feeding the same events back
+reproduces the session exactly.
+
+Keyframes make seeking cheap: every so many ticks the recorder stores a
+zlib-compressed pickle of the whole world, RNG included. Games are handed
+a SeededRandom, whose state is one 64-bit word, because Mersenne Twister
+state would add 2.5 KB of incompressible bytes to every keyframe. seek() restores
+the nearest keyframe at or before the target and simulates only the
+ticks after it, so seek time is bounded by the keyframe interval rather
+than the length of the recording.
+
+File layout (all integers are unsigned LEB128 varints):
+    b"DCRP" version tick_rate seed len(game) game
+    count, then count x (len(name) name value)   options new_game() took
+    then records:  tick_delta code [args]
+        code 0  ROUND   sh sw   new round on an sh x sw screen
+        code 1  RESIZE  sh sw   terminal resized before this tick
+        code 2  END             session over; tick_delta covers the last ticks
+        code 3  KEYFRAME n data n bytes of zlib(pickle((world, alive)))
+        code 4+ key             key + 4 handed to step() on this tick
+Options are the keyword arguments a game passes to new_game() besides
+the screen size and RNG (pong's cpu mode), so replays rebuild the same
+world however the replaying process was started.
+
+A keypress costs 2-3 bytes. Keyframes dominate the size, so the interval
+(--keyframe-interval, or replay.py --keyframes to rewrite a file) trades
+file size against seek time.
+
+Record and play back with any arcade game:
+    python dino2.py --record run.dcr
+    python dino2.py --replay run.dcr            # rendered, in real time
+    python replay.py run.dcr                    # headless, as fast as possible
+    python replay.py run.dcr --seek 90000       # world state at a tick
+    python dino2.py --replay run.dcr --seek 90000
+"""
+
+import argparse
+import bisect
+import importlib
+import os
+import pickle
+import random
+import time
+import zlib
+
+MAGIC = b"DCRP"
+VERSION = 3
+ROUND, RESIZE, END, KEYFRAME, KEY = 0, 1, 2, 3, 4
+
+
+def write_varint(out, n):
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def read_varint(data, pos):
+    """-> (value, next position)"""
+    n = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return n, pos
+        shift += 7
+
+
+MASK64 = (1 << 64) - 1
+
+
+def new_seed():
+    return random.SystemRandom().getrandbits(63)
+
+
+class SeededRandom(random.Random):
+    """
+    random.Random driven by xorshift64* instead of Mersenne Twister. All
+    the usual methods (randint, choice, uniform, ...) work; getstate() is
+    a single int, so worlds holding one pickle small.
+    """
+
+    def seed(self, a=None, version=2):
+        if a is None:
+            a = new_seed()
+        # splitmix64 so that small neighbouring seeds start far apart
+        z = (int(a) + 0x9E3779B97F4A7C15) & MASK64
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+        self.state = (z ^ (z >> 31)) or 1
+        self.gauss_next = None
+
+    def getstate(self):
+        return self.state
+
+    def setstate(self, state):
+        self.state = state
+        self.gauss_next = None
+
+    def next64(self):
+        x = self.state
+        x ^= x >> 12
+        x ^= (x << 25) & MASK64
+        x ^= x >> 27
+        self.state = x
+        return (x * 0x2545F4914F6CDD1D) & MASK64
+
+    def random(self):
+        return (self.next64() >> 11) * (1.0 / 9007199254740992.0)
+
+    def getrandbits(self, k):
+        n = bits = 0
+        while bits < k:
+            n = (n << 64) | self.next64()
+            bits += 64
+        return n >> (bits - k)
+
+
+class Recorder:
+    """Appends events to a recording file. Ticks must not go backwards."""
+
+    def __init__(self, path, game, seed, tick_rate, options=None):
+        self.file = open(path, "wb")
+        self.last_tick = 0
+        header = bytearray(MAGIC)
+        name = game.encode()
+        for n in (VERSION, int(tick_rate), seed, len(name)):
+            write_varint(header, n)
+        header += name
+        options = options or {}
+        write_varint(header, len(options))
+        for key, value in sorted(options.items()):
+            write_varint(header, len(key))
+            header += key.encode()
+            write_varint(header, value)
+        self.file.write(header)
+
+    def event(self, tick, code, *args):
+        out = bytearray()
+        write_varint(out, tick - self.last_tick)
+        write_varint(out, code)
+        for n in args:
+            write_varint(out, n)
+        self.file.write(out)
+        self.last_tick = tick
+
+    def key(self, tick, key):
+        self.event(tick, KEY + key)
+
+    def keyframe(self, tick, game, alive=True):
+        blob = zlib.compress(pickle.dumps((game, alive), pickle.HIGHEST_PROTOCOL))
+        self.event(tick, KEYFRAME, len(blob))
+        self.file.write(blob)
+
+    def close(self, tick):
+        if not self.file.closed:
+            self.event(tick, END)
+            self.file.close()
+
+
+class Recording:
+    """
+    A parsed recording: game, seed, tick_rate, options (new_game keyword
+    arguments) and events as (tick, code, args). keyframe_ticks and
+    keyframe_pos index the KEYFRAME events.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:4] != MAGIC:
+            raise ValueError(f"{path}: not a recording")
+        pos = 4
+        version, pos = read_varint(data, pos)
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported recording version {version}")
+        self.tick_rate, pos = read_varint(data, pos)
+        self.seed, pos = read_varint(data, pos)
+        size, pos = read_varint(data, pos)
+        self.game = data[pos : pos + size].decode()
+        pos += size
+        self.options = {}
+        count, pos = read_varint(data, pos)
+        for _ in range(count):
+            size, pos = read_varint(data, pos)
+            key = data[pos : pos + size].decode()
+            self.options[key], pos = read_varint(data, pos + size)
+
+        self.events = []
+        self.keyframe_ticks = []
+        self.keyframe_pos = []
+        self.keyframe_bytes = 0
+        tick = 0
+        while pos < len(data):
+            delta, pos = read_varint(data, pos)
+            code, pos = read_varint(data, pos)
+            tick += delta
+            args = ()
+            if code in (ROUND, RESIZE):
+                sh, pos = read_varint(data, pos)
+                sw, pos = read_varint(data, pos)
+                args = (sh, sw)
+            elif code == KEYFRAME:
+                size, pos = read_varint(data, pos)
+                args = (data[pos : pos + size],)
+                pos += size
+                self.keyframe_ticks.append(tick)
+                self.keyframe_pos.append(len(self.events))
+                self.keyframe_bytes += size
+            self.events.append((tick, code, args))
+        self.ticks = tick
+        self.size = len(data)
+
+    def rounds(self):
+        return sum(1 for _, code, _ in self.events if code == ROUND)
+
+    def new_rng(self):
+        """The RNG the session was recorded with, freshly seeded."""
+        return SeededRandom(self.seed)
+
+
+class Player:
+    """
+    Feeds a recording back to a running game, tick by tick. next_round()
+    gives the screen size the next round started on; key(tick, game) applies
+    resizes to the world and returns the key for that tick.
+    """
+
+    def __init__(self, recording):
+        self.recording = recording
+        self.events = recording.events
+        self.pos = 0
+
+    @property
+    def finished(self):
+        return self.pos >= len(self.events) or self.events[self.pos][1] == END
+
+    def next_round(self):
+        """Screen size of the next recorded round, or None once there are no more."""
+        while not self.finished:
+            _, code, args = self.events[self.pos]
+            self.pos += 1
+            if code == ROUND:
+                return args
+        return None
+
+    def key(self, tick, game):
+        """Key for this tick (-1 for none), applying any resize recorded before it."""
+        key = -1
+        while not self.finished:
+            at, code, args = self.events[self.pos]
+            if at > tick or code in (ROUND, END):
+                break
+            self.pos += 1
+            if code == RESIZE:
+                game.resize(*args)
+            elif code >= KEY:
+                key = code - KEY
+                break
+        return key
+
+
+class Replayer(Player):
+    """
+    Re-runs a recording without a screen. run(until) simulates forward;
+    seek(tick) jumps through the nearest keyframe. game, tick and alive
+    describe the world at the current position.
+    """
+
+    def __init__(self, recording, new_game=None):
+        super().__init__(recording)
+        self.new_game = new_game or importlib.import_module(recording.game).new_game
+        self.rewind()
+
+    def rewind(self):
+        self.pos = 0
+        self.tick = 0
+        self.rng = self.recording.new_rng()
+        self.game = None
+        self.alive = False
+        # Worlds of the rounds played since the last rewind or restore
+        self.worlds = []
+
+    def run(self, until=None):
+        """Simulates every tick before `until` (default: to the end). Returns the world."""
+        end = self.recording.ticks if until is None else min(until, self.recording.ticks)
+        while self.tick < end:
+            if not self.alive:
+                size = self.next_round()
+                if size is None:
+                    break
+                self.game = self.new_game(*size, self.rng, **self.recording.options)
+                self.worlds.append(self.game)
+                self.alive = True
+            self.alive = self.game.step(self.key(self.tick, self.game))
+            self.tick += 1
+        return self.game
+
+    def restore(self, index):
+        """Jumps to the index-th keyframe."""
+        pos = self.recording.keyframe_pos[index]
+        tick, _, (blob,) = self.events[pos]
+        self.game, self.alive = pickle.loads(zlib.decompress(blob))
+        self.rng = self.game.rng
+        self.pos = pos + 1
+        self.tick = tick
+        self.worlds = [self.game]
+
+    def seek(self, tick):
+        """World as it stood before `tick`, via the nearest keyframe."""
+        index = bisect.bisect_right(self.recording.keyframe_ticks, tick) - 1
+        # Only restore when the keyframe is ahead of where we already are
+        if index >= 0 and (tick < self.tick or self.recording.keyframe_ticks[index] > self.tick):
+            self.restore(index)
+        elif tick < self.tick:
+            self.rewind()
+        return self.run(tick)
+
+
+def simulate(recording, module=None):
+    """
+    Re-runs a recording from tick 0. Returns the worlds of every round, in
+    order, as they stood when the round ended.
+    """
+    replayer = Replayer(recording, module.new_game if module else None)
+    replayer.run()
+    return replayer.worlds
+
+
+def add_keyframes(recording, interval, path):
+    """Writes a copy of the recording to path with a keyframe every `interval` ticks."""
+    replayer = Replayer(recording)
+    out = Recorder(path, recording.game, recording.seed, recording.tick_rate, recording.options)
+    due = interval
+    for tick, code, args in recording.events:
+        if code == KEYFRAME:
+            continue
+        while interval and due <= tick and due < recording.ticks:
+            replayer.run(due)
+            out.keyframe(due, replayer.game, replayer.alive)
+            due += interval
+        if code == END:
+            out.close(tick)
+        elif code >= KEY:
+            out.key(tick, code - KEY)
+        else:
+            out.event(tick, code, *args)
+    out.file.close()
+
+
+def outcome(game):
+    """Score-like fields of a finished world, for comparing runs."""
+    return {name: getattr(game, name) for name in ("score", "s1", "s2", "lives", "level", "state")
+            if hasattr(game, name)}
+
+
+if __name__ == "__main__":
+    # Keyframes must pickle replay.SeededRandom, not __main__.SeededRandom
+    from replay import Recording, Replayer, add_keyframes, outcome
+
+    parser = argparse.ArgumentParser(description="Re-run a recorded session headless")
+    parser.add_argument("recording")
+    parser.add_argument("--repeat", type=int, default=1, help="run it this many times (as a workload)")
+    parser.add_argument("--seek", type=int, help="show the world before this tick")
+    parser.add_argument("--seek-bench", type=int, metavar="N", help="time N seeks to random ticks")
+    parser.add_argument("--keyframes", type=int, metavar="TICKS",
+                        help="rewrite the recording with a keyframe every TICKS ticks (0 strips them)")
+    parser.add_argument("--out", help="file for --keyframes (default: overwrite the recording)")
+    args = parser.parse_args()
+
+    recording = Recording(args.recording)
+    print(f"{recording.game}: seed {recording.seed}, {recording.rounds()} rounds, "
+          f"{recording.ticks} ticks at {recording.tick_rate} Hz, {len(recording.events)} events, "
+          f"{recording.size} bytes ({len(recording.keyframe_ticks)} keyframes, "
+          f"{recording.keyframe_bytes} bytes)")
+
+    if args.keyframes is not None:
+        out = args.out or args.recording
+        add_keyframes(recording, args.keyframes, out + ".tmp")
+        os.replace(out + ".tmp", out)
+        rewritten = Recording(out)
+        print(f"wrote {out}: {len(rewritten.keyframe_ticks)} keyframes, {rewritten.size} bytes")
+        raise SystemExit
+
+    if args.seek is not None:
+        replayer = Replayer(recording)
+        start = time.perf_counter()
+        game = replayer.seek(args.seek)
+        elapsed = time.perf_counter() - start
+        print(f"tick {replayer.tick}, round {'alive' if replayer.alive else 'over'}, "
+              f"{outcome(game)} ({elapsed * 1000:.2f} ms)")
+        raise SystemExit
+
+    if args.seek_bench:
+        rng = random.Random(0)
+        targets = [rng.randrange(recording.ticks) for _ in range(args.seek_bench)]
+        times = []
+        for target in targets:
+            replayer = Replayer(recording)
+            start = time.perf_counter()
+            replayer.seek(target)
+            times.append((time.perf_counter() - start) * 1000)
+        times.sort()
+        print(f"{len(times)} cold seeks: mean {sum(times) / len(times):.2f} ms, "
+              f"p95 {times[int(len(times) * 0.95)]:.2f} ms, max {times[-1]:.2f} ms")
+        raise SystemExit
+
+    module = importlib.import_module(recording.game)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        worlds = simulate(recording, module)
+    elapsed = time.perf_counter() - start
+
+    for i, game in enumerate(worlds, 1):
+        print(f"  round {i}: {outcome(game)}")
+    ticks = recording.ticks * args.repeat
+    print(f"{ticks} ticks in {elapsed:.3f}s ({ticks / max(elapsed, 1e-9):.0f} ticks/s, "
+          f"{ticks / recording.tick_rate / max(elapsed, 1e-9):.0f}x real time)")
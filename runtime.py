@@ -0,0 +1,336 @@
+"""
+RUNTIME - Shared Game Loop Timing
+FrameScheduler paces a game loop against a monotonic deadline. It sleeps
+for most of each frame and spins only for the last fraction of a
+millisecond, so 60 FPS holds steady without pinning a core.
+
+When output is slow (a blocking refresh over SSH) the loop falls behind.
+The scheduler then drops renders, up to a limit in a row, while update()
+keeps running at the nominal rate, so game speed does not follow the
+terminal's throughput.
+
+FixedStep decouples simulation from rendering. Games advance their world
+in fixed ticks drawn from a time accumulator, so play speed is the same
+on fast and slow hosts, and the renderer interpolates moving objects
+between the last two ticks with lerp(). Headless runs take exactly one
+tick per frame and go as fast as the CPU allows. FixedStep also owns the
+round's seeded RNG and, with --record/--replay, the input recording
+(see replay.py).
+
+Command-line options read by every game:
+    --fps N             override the game's target frame rate
+    --stats             print frame timing and render counters on exit
+    --backend ansi      draw with raw escape sequences instead of curses
+    --max-skip N        most renders dropped in a row to catch up (0 disables)
+    --seed N            seed the game's RNG for a reproducible session
+    --record FILE       record the seed and every input to FILE
+    --replay FILE       play back a recording instead of reading the keyboard
+    --seek TICK         with --replay, start from this tick via the nearest keyframe
+    --keyframe-interval N  ticks between world snapshots in a recording (0 disables)
+"""
+
+import argparse
+import atexit
+import collections
+import sys
+import time
+
+import replay
+
+# Headless runs turn pacing off so games run as fast as the CPU allows
+REALTIME = True
+
+# Schedulers and framebuffers created in this process; each has summary() for --stats
+REPORTS = []
+
+_options = None
+
+
+def pause(seconds):
+    """time.sleep() for waiting screens; returns at once when REALTIME is off."""
+    if REALTIME:
+        time.sleep(seconds)
+
+
+def options():
+    """Runtime flags from sys.argv. Unknown arguments are left for the caller."""
+    global _options
+    if _options is None:
+        parser = argparse.ArgumentParser(add_help=False)
+        parser.add_argument("--fps", type=float)
+        parser.add_argument("--stats", action="store_true")
+        parser.add_argument("--backend", choices=["curses", "ansi"], default="curses")
+        parser.add_argument("--max-skip", type=int, default=5)
+        parser.add_argument("--seed", type=int)
+        parser.add_argument("--record")
+        parser.add_argument("--replay")
+        parser.add_argument("--seek", type=int)
+        parser.add_argument("--keyframe-interval", type=int, default=600)
+        # Headless benchmark instead of the game; invaders calls its one --stress
+        parser.add_argument("--bench", "--stress", action="store_true")
+        _options, _ = parser.parse_known_args(sys.argv[1:])
+    return _options
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+class FrameScheduler:
+    """
+    Call wait() once per frame and draw only when render_due() says so. The
+    deadline advances by exactly one period each frame, so early wake-ups
+    and slow frames do not accumulate drift. A loop that is behind skips
+    renders to catch up, and resyncs only once it is further behind than
+    max_skip frames can recover.
+    """
+
+    def __init__(self, fps, name="", max_skip=None):
+        self.fps = options().fps or fps
+        self.period = 1.0 / self.fps
+        self.name = name
+        self.max_skip = options().max_skip if max_skip is None else max_skip
+        self.rendered = 0
+        self.skipped = 0
+        self.skip_run = 0
+        self.deadline = None
+        # Spin margin adapts to how far time.sleep() overshoots on this host
+        self.oversleep = 0.0005
+        self.frames = 0
+        self.started = None
+        self.last = None
+        self.last_cpu = None
+        self.intervals = collections.deque(maxlen=100000)
+        self.cpu = collections.deque(maxlen=100000)
+        REPORTS.append(self)
+
+    def wait(self):
+        now = time.perf_counter()
+        if self.deadline is None:
+            self.deadline = self.started = now
+        self.deadline += self.period
+
+        if REALTIME:
+            spin = min(0.004, max(0.0002, self.oversleep * 2))
+            remaining = self.deadline - now - spin
+            if remaining > 0:
+                time.sleep(remaining)
+                woke = time.perf_counter()
+                overshoot = max(0.0, woke - (now + remaining))
+                self.oversleep += (overshoot - self.oversleep) * 0.1
+            while time.perf_counter() < self.deadline:
+                pass
+
+        now = time.perf_counter()
+        if now - self.deadline > self.period * (self.max_skip + 1):
+            self.deadline = now
+        self.record(now)
+
+    def render_due(self):
+        """False when this frame started more than a period late and a render may be dropped."""
+        late = (
+            REALTIME
+            and self.deadline is not None
+            and time.perf_counter() - self.deadline > self.period
+        )
+        if late and self.skip_run < self.max_skip:
+            self.skip_run += 1
+            self.skipped += 1
+            return False
+        self.skip_run = 0
+        self.rendered += 1
+        return True
+
+    def record(self, now):
+        cpu = time.process_time()
+        if self.last is not None:
+            self.intervals.append(now - self.last)
+            self.cpu.append(cpu - self.last_cpu)
+        self.last, self.last_cpu = now, cpu
+        self.frames += 1
+
+    def report(self):
+        """Achieved FPS, frame-interval jitter percentiles (ms) and CPU ms per frame."""
+        elapsed = (self.last - self.started) if self.frames > 1 else 0.0
+        jitter = [abs(i - self.period) * 1000 for i in self.intervals]
+        return {
+            "target_fps": self.fps,
+            "fps": (self.frames - 1) / elapsed if elapsed > 0 else 0.0,
+            "frames": self.frames,
+            "jitter_p50_ms": percentile(jitter, 50),
+            "jitter_p95_ms": percentile(jitter, 95),
+            "jitter_p99_ms": percentile(jitter, 99),
+            "cpu_ms_per_frame": sum(self.cpu) * 1000 / max(1, len(self.cpu)),
+            "rendered": self.rendered,
+            "skipped": self.skipped,
+        }
+
+    def summary(self):
+        r = self.report()
+        return (f"{self.name or 'loop'}: {r['fps']:.1f}/{r['target_fps']:g} FPS over {r['frames']} frames, "
+                f"jitter p50 {r['jitter_p50_ms']:.3f} ms p95 {r['jitter_p95_ms']:.3f} ms "
+                f"p99 {r['jitter_p99_ms']:.3f} ms, CPU {r['cpu_ms_per_frame']:.3f} ms/frame, "
+                f"{r['rendered']} rendered / {r['skipped']} skipped")
+
+
+def lerp(a, b, alpha):
+    """Position between the previous tick (a) and the current one (b)."""
+    return a + (b - a) * alpha
+
+
+class FixedStep:
+    """
+    Fixed-timestep accumulator. Each frame, feed() the key read from getch
+    and run one world step per key yielded by ticks(). Keys are queued and
+    handed out one per tick, so input that arrives between ticks is not
+    lost. alpha is how far real time has moved past the last tick, as a
+    fraction of a tick, for interpolating the render.
+
+    Rounds begin with start(new_game, sh, sw) and terminal resizes go
+    through resize(sh, sw), so a recording captures everything that
+    changes the world. game_options are extra keyword arguments for
+    new_game (e.g. pong's cpu mode); they are saved in the recording, and
+    a replay uses the recorded ones. While replaying, keyboard input other than the
+    caller's own quit handling is ignored until the recording runs out, and
+    replaying tells game-over screens to start the next recorded round
+    without waiting for a key.
+    """
+
+    def __init__(self, tick_rate, name="", max_ticks=None, game_options=None):
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.name = name
+        # Catch up at most a quarter second per frame, then drop the backlog
+        self.max_ticks = max_ticks or max(1, int(tick_rate // 4))
+        self.keys = collections.deque(maxlen=4)
+        # Index of the next tick (a seek can jump it), and ticks actually stepped here
+        self.tick = 0
+        self.ticks_run = 0
+        self.dropped = 0
+        # Real time spent inside rounds, for the achieved tick rate
+        self.elapsed = 0.0
+        self.game = None
+        self.player = self.recorder = None
+        self.game_options = dict(game_options or {})
+
+        opts = options()
+        if opts.replay:
+            recording = replay.Recording(opts.replay)
+            if recording.game != name:
+                raise SystemExit(f"{opts.replay} is a recording of {recording.game}, not {name}")
+            self.player = replay.Player(recording)
+            self.replay_end = recording.ticks
+            self.seek = opts.seek
+            self.seed = recording.seed
+            self.rng = recording.new_rng()
+            self.game_options = recording.options
+        else:
+            self.seed = opts.seed if opts.seed is not None else replay.new_seed()
+            self.rng = replay.SeededRandom(self.seed)
+        if opts.record:
+            self.recorder = replay.Recorder(opts.record, name, self.seed, tick_rate, self.game_options)
+            self.keyframe_interval = opts.keyframe_interval
+            atexit.register(lambda: self.recorder.close(self.tick))
+
+        self.reset()
+        REPORTS.append(self)
+
+    def reset(self):
+        """Starts a new round: no backlog, no queued keys."""
+        self.last = None
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.keys.clear()
+
+    def start(self, new_game, sh, sw):
+        """Begins a round with new_game(sh, sw, rng, **game_options) and returns the world."""
+        self.reset()
+        if self.player and self.seek:
+            # Jump into the recording: restore the nearest keyframe and simulate the rest
+            replayer = replay.Replayer(self.player.recording, new_game)
+            replayer.seek(self.seek)
+            self.seek = None
+            self.player.pos, self.tick, self.rng = replayer.pos, replayer.tick, replayer.rng
+            if replayer.alive:
+                self.game = replayer.game
+                return self.game
+        if self.player:
+            size = self.player.next_round()
+            if size:
+                sh, sw = size
+            else:
+                self.player = None
+        if self.recorder:
+            self.recorder.event(self.tick, replay.ROUND, sh, sw)
+        self.game = new_game(sh, sw, self.rng, **self.game_options)
+        return self.game
+
+    @property
+    def replaying(self):
+        """True while the recording still has rounds to play."""
+        return self.player is not None and not self.player.finished
+
+    def resize(self, sh, sw):
+        """Refits the world to a new screen size. A replayed world keeps its recorded size."""
+        if self.player:
+            return
+        if self.recorder:
+            self.recorder.event(self.tick, replay.RESIZE, sh, sw)
+        self.game.resize(sh, sw)
+
+    def feed(self, key):
+        if key != -1 and not self.player:
+            self.keys.append(key)
+
+    def ticks(self):
+        """Yields the input key (or -1) for every tick due since the last call."""
+        if REALTIME:
+            now = time.perf_counter()
+            if self.last is None:
+                # The first frame of a round runs one tick straight away
+                self.last = now - self.dt
+            self.accumulator += now - self.last
+            self.elapsed += now - self.last
+            self.last = now
+            due = int(self.accumulator / self.dt)
+            if due > self.max_ticks:
+                self.dropped += due - self.max_ticks
+                self.accumulator -= (due - self.max_ticks) * self.dt
+                due = self.max_ticks
+            self.accumulator -= due * self.dt
+            self.alpha = self.accumulator / self.dt
+        else:
+            due = 1
+            self.alpha = 1.0
+        for _ in range(due):
+            tick = self.tick
+            self.tick += 1
+            self.ticks_run += 1
+            if self.player and tick >= self.replay_end:
+                self.player = None
+            if self.player:
+                yield self.player.key(tick, self.game)
+                continue
+            key = self.keys.popleft() if self.keys else -1
+            if self.recorder:
+                if self.keyframe_interval and tick and tick % self.keyframe_interval == 0:
+                    self.recorder.keyframe(tick, self.game)
+                if key != -1:
+                    self.recorder.key(tick, key)
+            yield key
+
+    def summary(self):
+        rate = f"{self.ticks_run / self.elapsed:.1f}" if self.elapsed > 0 else "n/a"
+        return (f"{self.name or 'sim'} ticks: {self.ticks_run} at {self.tick_rate:g} Hz "
+                f"({rate}/s achieved), {self.dropped} dropped while behind")
+
+
+def print_stats():
+    """Prints every registered report when --stats was given."""
+    if not options().stats:
+        return
+    for item in REPORTS:
+        print(item.summary())
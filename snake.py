@@ -3,11 +3,16 @@ SNAKECLI - 8-Bit Edition
 Controls: [ARROWS] Move, [R] Restart, [Q] Quit
 """
 
-import curses
+import collections
 import time
 import random
 
-FPS = 15 # Snake is better at lower FPS for precision
+from framebuffer import FrameBuffer, draw_shadow_text
+from keys import KEY_DOWN, KEY_LEFT, KEY_RIGHT, KEY_UP, curses
+from runtime import FixedStep, FrameScheduler, options, print_stats
+
+FPS = 60        # Render rate; input is polled every frame
+TICK_RATE = 15  # Snake moves one cell per tick, slower for precision
 BLOCK = "██"
 
 LOGO_MAIN = [
@@ -19,104 +24,205 @@ LOGO_MAIN = [
     r" ╚══════╝╚═╝  ╚═══╝╚═╝  ╚═╝╚═╝  ╚═╝╚══════╝ ╚═════╝╚══════╝╚═╝"
 ]
 
-def draw_shadow_text(stdscr, y, x, lines, color_pair, shadow_pair):
-    for i, line in enumerate(lines):
-        try:
-            stdscr.addstr(y + i + 1, x + 1, line, curses.color_pair(shadow_pair))
-            stdscr.addstr(y + i, x, line, curses.color_pair(color_pair) | curses.A_BOLD)
-        except: pass
+def draw_static(screen):
+    """Header and border. Cached by the framebuffer, redrawn only on resize."""
+    sh, sw = screen.getmaxyx()
+    draw_shadow_text(screen, 1, (sw - len(LOGO_MAIN[0])) // 2, LOGO_MAIN, 1, 2)
+    for y in range(8, sh):
+        screen.addstr(y, 0, "┃")
+        screen.addstr(y, (sw // 2) * 2 - 1, "┃")
+    screen.addstr(7, 0, "┏" + "━" * ((sw // 2) * 2 - 2) + "┓")
+    screen.addstr(sh - 1, 0, "┗" + "━" * ((sw // 2) * 2 - 2) + "┛")
 
 class Snake:
-    def __init__(self, h, w):
+    """
+    The body is a deque of (y, x) cells, head first, mirrored by an
+    occupancy set, so moving and collision tests are O(1). Once the board
+    is crowded enough that random food draws start missing, cells where
+    food may appear and the snake is not are kept in a free list with a
+    position index (swap-remove), so food placement stays O(1) however
+    full the board gets.
+    """
+
+    def __init__(self, h, w, rng=None):
+        self.rng = rng or random.Random()
         self.h, self.w = h, w
         self.reset()
 
     def reset(self):
-        self.snake = [[10, 10], [10, 9], [10, 8]]
-        self.dir = curses.KEY_RIGHT
+        self.snake = collections.deque([(10, 10), (10, 9), (10, 8)])
+        self.body = set(self.snake)
+        self.free = None
+        self.dir = KEY_RIGHT
         self.food = self.spawn_food()
         self.score = 0
         self.dead = False
 
+    # --- Free cells: food goes anywhere in rows 8..h-2, columns 1..w//2-2 off the body ---
+    def food_cell(self, cell):
+        return 8 <= cell[0] < self.h - 1 and 1 <= cell[1] < self.w // 2 - 1
+
+    def index_free(self):
+        self.free = [(y, x) for y in range(8, self.h - 1) for x in range(1, self.w // 2 - 1)
+                     if (y, x) not in self.body]
+        self.slot = {cell: i for i, cell in enumerate(self.free)}
+
+    def take(self, cell):
+        if self.free is None: return
+        i = self.slot.pop(cell, None)
+        if i is None: return
+        last = self.free.pop()
+        if i < len(self.free):
+            self.free[i] = last
+            self.slot[last] = i
+
+    def release(self, cell):
+        if self.free is not None and self.food_cell(cell):
+            self.slot[cell] = len(self.free)
+            self.free.append(cell)
+
     def spawn_food(self):
-        while True:
-            f = [random.randint(8, self.h - 2), random.randint(1, self.w // 2 - 2)]
-            if f not in self.snake: return f
+        """A random free cell, or None once the board is full."""
+        # A few rejection draws first, as before, so seeded rounds keep their food
+        if self.h - 2 >= 8 and self.w // 2 - 2 >= 1:
+            for _ in range(8):
+                f = (self.rng.randint(8, self.h - 2), self.rng.randint(1, self.w // 2 - 2))
+                if f not in self.body: return f
+        if self.free is None: self.index_free()
+        return self.free[self.rng.randrange(len(self.free))] if self.free else None
+
+    def resize(self, sh, sw):
+        """Adopts a new board size mid-round. Food that fell outside the food area is placed again."""
+        self.h, self.w = sh - 1, sw
+        self.free = None
+        if not self.food or not self.food_cell(self.food):
+            self.food = self.spawn_food()
+
+    def step(self, key):
+        """One fixed tick. False once the snake has died."""
+        self.update(key)
+        return not self.dead
 
     def update(self, key):
-        if key in [curses.KEY_UP, curses.KEY_DOWN, curses.KEY_LEFT, curses.KEY_RIGHT]:
+        if key in [KEY_UP, KEY_DOWN, KEY_LEFT, KEY_RIGHT]:
             # Prevent 180-degree turns - Wrapped in parentheses for safe line continuation
-            if ((key == curses.KEY_UP and self.dir != curses.KEY_DOWN) or 
-                (key == curses.KEY_DOWN and self.dir != curses.KEY_UP) or 
-                (key == curses.KEY_LEFT and self.dir != curses.KEY_RIGHT) or 
-                (key == curses.KEY_RIGHT and self.dir != curses.KEY_LEFT)):
+            if ((key == KEY_UP and self.dir != KEY_DOWN) or 
+                (key == KEY_DOWN and self.dir != KEY_UP) or 
+                (key == KEY_LEFT and self.dir != KEY_RIGHT) or 
+                (key == KEY_RIGHT and self.dir != KEY_LEFT)):
                 self.dir = key
 
-        head = list(self.snake[0])
-        if self.dir == curses.KEY_UP: head[0] -= 1
-        elif self.dir == curses.KEY_DOWN: head[0] += 1
-        elif self.dir == curses.KEY_LEFT: head[1] -= 1
-        elif self.dir == curses.KEY_RIGHT: head[1] += 1
+        y, x = self.snake[0]
+        if self.dir == KEY_UP: y -= 1
+        elif self.dir == KEY_DOWN: y += 1
+        elif self.dir == KEY_LEFT: x -= 1
+        elif self.dir == KEY_RIGHT: x += 1
+        head = (y, x)
 
         # Death conditions
-        if head[0] < 8 or head[0] >= self.h or head[1] < 0 or head[1] >= self.w // 2 or head in self.snake:
+        if y < 8 or y >= self.h or x < 0 or x >= self.w // 2 or head in self.body:
             self.dead = True
             return
 
-        self.snake.insert(0, head)
+        self.snake.appendleft(head)
+        self.body.add(head)
+        self.take(head)
         if head == self.food:
             self.score += 10
             self.food = self.spawn_food()
         else:
-            self.snake.pop()
+            tail = self.snake.pop()
+            self.body.discard(tail)
+            self.release(tail)
+            if self.food is None: self.food = self.spawn_food()
+
+def new_game(sh, sw, rng=None):
+    """A fresh round laid out for an sh x sw screen."""
+    return Snake(sh - 1, sw, rng)
 
 def main(stdscr):
     curses.curs_set(0)
     stdscr.nodelay(True)
-    stdscr.timeout(1000 // FPS)
     curses.start_color()
     curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLACK)
     curses.init_pair(2, curses.COLOR_CYAN, curses.COLOR_BLACK)
     curses.init_pair(3, curses.COLOR_GREEN, curses.COLOR_BLACK)
     curses.init_pair(4, curses.COLOR_RED, curses.COLOR_BLACK)
+    screen = FrameBuffer(stdscr, background=draw_static)
+    clock = FrameScheduler(FPS, "snake")
+    sim = FixedStep(TICK_RATE, "snake")
 
     while True:
+        stdscr.nodelay(True)
         sh, sw = stdscr.getmaxyx()
-        game = Snake(sh - 1, sw)
+        game = sim.start(new_game, sh, sw)
         
         while not game.dead:
             key = stdscr.getch()
             if key in [ord('q'), ord('Q')]: return
-            game.update(key)
-
-            stdscr.erase()
-            logo_x = (sw - len(LOGO_MAIN[0])) // 2
-            draw_shadow_text(stdscr, 1, logo_x, LOGO_MAIN, 1, 2)
-
-            # Draw Food
-            stdscr.addstr(game.food[0], game.food[1] * 2, BLOCK, curses.color_pair(4))
-            # Draw Snake
-            for i, p in enumerate(game.snake):
-                color = curses.color_pair(3) if i == 0 else curses.color_pair(1)
-                stdscr.addstr(p[0], p[1] * 2, BLOCK, color)
-
-            # Border
-            for y in range(8, sh):
-                stdscr.addstr(y, 0, "┃")
-                stdscr.addstr(y, (sw // 2) * 2 - 1, "┃")
-            stdscr.addstr(7, 0, "┏" + "━" * ((sw // 2) * 2 - 2) + "┓")
-            stdscr.addstr(sh - 1, 0, "┗" + "━" * ((sw // 2) * 2 - 2) + "┛")
-            
-            stdscr.addstr(7, 5, f" SCORE: {game.score} ", curses.A_BOLD)
-            stdscr.refresh()
-
-        stdscr.addstr(sh // 2 + 5, sw // 2 - 5, "GAME OVER", curses.A_REVERSE)
-        stdscr.addstr(sh // 2 + 6, sw // 2 - 11, "Press 'R' to Restart", curses.A_BOLD)
-        stdscr.refresh()
+            if key == curses.KEY_RESIZE:
+                sh, sw = stdscr.getmaxyx()
+                sim.resize(sh, sw)
+            else:
+                sim.feed(key)
+            for k in sim.ticks():
+                if not game.step(k): break
+
+            if clock.render_due():
+                screen.erase()
+
+                # Draw Food
+                if game.food: screen.addstr(game.food[0], game.food[1] * 2, BLOCK, curses.color_pair(4))
+                # Draw Snake
+                for i, p in enumerate(game.snake):
+                    color = curses.color_pair(3) if i == 0 else curses.color_pair(1)
+                    screen.addstr(p[0], p[1] * 2, BLOCK, color)
+
+                screen.addstr(7, 5, f" SCORE: {game.score} ", curses.A_BOLD)
+                screen.refresh()
+            clock.wait()
+
+        screen.addstr(sh // 2 + 5, sw // 2 - 5, "GAME OVER", curses.A_REVERSE)
+        screen.addstr(sh // 2 + 6, sw // 2 - 11, "Press 'R' to Restart", curses.A_BOLD)
+        screen.refresh()
+        # A replay moves on to its next recorded round by itself
+        stdscr.timeout(1000 if sim.replaying else -1)
         while True:
             key = stdscr.getch()
-            if key in [ord('r'), ord('R')]: break
+            if key in [ord('r'), ord('R')] or (key == -1 and sim.replaying): break
             if key in [ord('q'), ord('Q')]: return
 
+def bench(ticks=2000):
+    """
+    Tick and food-spawn cost for long snakes on large boards. The body is
+    laid out as a serpentine over part of the board and the head carries
+    on along it, eating every 20 ticks. Run: python snake.py --bench
+    """
+    moves = {(0, 1): KEY_RIGHT, (0, -1): KEY_LEFT, (-1, 0): KEY_UP}
+    print(f"{'BOARD':>9}{'LENGTH':>8}{'FULL':>6}{'US/TICK':>9}{'US/FOOD':>9}")
+    for rows, cols, full in [(20, 40, 0.5), (100, 200, 0.5), (200, 400, 0.5), (200, 400, 0.95)]:
+        game = Snake(rows + 8, cols * 2, random.Random(0))
+        path = [(y, x) for i, y in enumerate(range(rows + 7, 7, -1))
+                for x in (range(cols) if i % 2 == 0 else range(cols - 1, -1, -1))]
+        length = int(len(path) * full)
+        game.snake = collections.deque(reversed(path[:length]))
+        game.body = set(game.snake)
+        game.index_free()  # Already crowded: index up front rather than on the first miss
+        run = path[length - 1 : length + ticks]
+        keys = [moves[(b[0] - a[0], b[1] - a[1])] for a, b in zip(run, run[1:])]
+        started = time.perf_counter()
+        for i, key in enumerate(keys):
+            if i % 20 == 0: game.food = run[i + 1]
+            game.update(key)
+        elapsed = time.perf_counter() - started
+        started = time.perf_counter()
+        for _ in range(1000): game.spawn_food()
+        spawn = time.perf_counter() - started
+        print(f"{cols:>4}x{rows:<4}{length:>8}{full:>6.0%}{elapsed / len(keys) * 1e6:>9.1f}{spawn * 1e3:>9.1f}")
+
 if __name__ == "__main__":
-    curses.wrapper(main)
\ No newline at end of file
+    if options().bench:
+        bench()
+    else:
+        curses.wrapper(main)
+        print_stats()
\ No newline at end of file
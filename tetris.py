@@ -1,14 +1,25 @@
 """
 TETRIS PRO - 8-Bit Edition
 Controls: [ARROWS] Move/Rotate, [SPACE] Drop, [R] Restart
+Run with --autoplay to watch the placement search (tetris_ai.py) play.
 """
 
-import curses
+import sys
 import time
 import random
 
-FPS = 60
+from framebuffer import FrameBuffer, draw_shadow_text
+from keys import KEY_DOWN, KEY_LEFT, KEY_RIGHT, KEY_UP, curses
+from runtime import FixedStep, FrameScheduler, print_stats
+
+FPS = 60        # Render rate
+TICK_RATE = 60  # Simulation rate; gravity counts ticks
 BLOCK = "██"
+BOARD_W, BOARD_H = 10, 20
+# Difficulty: seconds per row of gravity, shrinking as the score grows
+FALL_START = 0.6
+FALL_MIN = 0.1
+FALL_POINTS = 2000  # Points that take a second off the fall interval
 
 LOGO_MAIN = [
     r" ████████╗███████╗████████╗██████╗ ██╗███████╗ ██████╗██╗     ██╗",
@@ -29,112 +40,222 @@ SHAPES = {
     'Z': [[1, 1, 0], [0, 1, 1]]
 }
 
-def draw_shadow_text(stdscr, y, x, lines, color_pair, shadow_pair):
-    for i, line in enumerate(lines):
-        try:
-            stdscr.addstr(y + i + 1, x + 1, line, curses.color_pair(shadow_pair))
-            stdscr.addstr(y + i, x, line, curses.color_pair(color_pair) | curses.A_BOLD)
-        except: pass
+# --- Rotation tables: every clockwise turn of every piece, built once ---
+PIECES = list(SHAPES)
+
+def build_rotations(shape):
+    """
+    Four clockwise turns -> (shape, width, row masks, column masks, lowest
+    filled row per column). Masks are relative to the piece's top-left.
+    """
+    turns = []
+    for _ in range(4):
+        width = len(shape[0])
+        rows = tuple(sum(1 << x for x, c in enumerate(row) if c) for row in shape)
+        cols = tuple(sum(1 << y for y, row in enumerate(shape) if row[x]) for x in range(width))
+        bottoms = tuple(c.bit_length() - 1 for c in cols)
+        turns.append((shape, width, rows, cols, bottoms))
+        shape = [list(r) for r in zip(*shape[::-1])]
+    return turns
+
+ROTATIONS = {name: build_rotations(shape) for name, shape in SHAPES.items()}
+
+def draw_static(screen):
+    """Header and well frame. Cached by the framebuffer, redrawn only on resize."""
+    sh, sw = screen.getmaxyx()
+    tw, th = BOARD_W, BOARD_H
+    draw_shadow_text(screen, 1, (sw - len(LOGO_MAIN[0])) // 2, LOGO_MAIN, 1, 3)
+    ox, oy = (sw - tw*2) // 2, (sh - th) // 2 + 3
+    screen.addstr(oy-1, ox-1, "┏"+"━"*(tw*2)+"┓")
+    screen.addstr(oy+th, ox-1, "┗"+"━"*(tw*2)+"┛")
 
 class Tetris:
-    def __init__(self, h, w):
+    """
+    The well is a bitboard: board[y] is an int with bit x set for every
+    filled cell, and cols[x] holds the same cells by column (bit y). A
+    piece is a rotation index into ROTATIONS, so collision is one AND per
+    piece row, and a full row is one compare. Hard drops read the gap under
+    each piece column straight from cols.
+    """
+
+    def __init__(self, h, w, rng=None):
+        self.rng = rng or random.Random()
         self.h, self.w = h, w
-        self.board = [[0]*w for _ in range(h)]
+        self.full = (1 << w) - 1
+        self.board = [0] * h
+        self.cols = [0] * w
         self.score = 0
+        self.fall_ticks = 0
+        self.pieces = 0
+        # One piece of preview; pieces are still drawn from the RNG in the same order
+        self.next = self.rng.choice(PIECES)
         self.new_piece()
 
+    @property
+    def shape(self):
+        return ROTATIONS[self.type][self.rot][0]
+
+    def cells(self):
+        """(x, y) of every filled cell in the well."""
+        for y, row in enumerate(self.board):
+            while row:
+                low = row & -row
+                yield low.bit_length() - 1, y
+                row ^= low
+
     def new_piece(self):
-        self.type = random.choice(list(SHAPES.keys()))
-        self.shape = SHAPES[self.type]
+        self.type, self.next = self.next, self.rng.choice(PIECES)
+        self.pieces += 1
+        self.rot = 0
         self.px = self.w // 2 - len(self.shape[0]) // 2
         self.py = 0
         return not self.collide(self.px, self.py)
 
-    def collide(self, nx, ny, shape=None):
-        if shape is None: shape = self.shape
-        for y, row in enumerate(shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    if not (0 <= nx + x < self.w and 0 <= ny + y < self.h) or self.board[ny+y][nx+x]:
-                        return True
+    def collide(self, nx, ny, rot=None):
+        _, width, masks, _, _ = ROTATIONS[self.type][self.rot if rot is None else rot]
+        if nx < 0 or nx + width > self.w or ny < 0 or ny + len(masks) > self.h:
+            return True
+        board = self.board
+        for mask in masks:
+            if board[ny] & (mask << nx): return True
+            ny += 1
         return False
 
     def rotate(self):
-        ns = [list(r) for r in zip(*self.shape[::-1])]
-        if not self.collide(self.px, self.py, ns): self.shape = ns
+        rot = (self.rot + 1) % 4
+        if not self.collide(self.px, self.py, rot): self.rot = rot
+
+    def drop_distance(self):
+        """Rows the piece can fall before it lands."""
+        floor = 1 << self.h
+        bottoms = ROTATIONS[self.type][self.rot][4]
+        gap = self.h
+        for x, b in enumerate(bottoms, self.px):
+            below = (self.cols[x] | floor) >> (self.py + b + 1)
+            gap = min(gap, (below & -below).bit_length() - 1)
+        return gap
+
+    def hard_drop(self):
+        self.py += self.drop_distance()
+
+    def resize(self, sh, sw):
+        """The well is a fixed size; only its on-screen position follows the terminal."""
+
+    def step(self, key):
+        """One fixed tick: apply the key, then gravity when it is due. False on game over."""
+        if key == KEY_LEFT: self.move(-1, 0)
+        if key == KEY_RIGHT: self.move(1, 0)
+        if key == KEY_UP: self.rotate()
+        if key == KEY_DOWN: self.move(0, 1)
+        if key == ord(' '): self.hard_drop()
+
+        self.fall_ticks += 1
+        if self.fall_ticks > max(FALL_MIN, FALL_START - self.score / FALL_POINTS) * TICK_RATE:
+            self.fall_ticks = 0
+            return self.update()
+        return True
 
     def update(self):
         if not self.move(0, 1):
-            for y, row in enumerate(self.shape):
-                for x, cell in enumerate(row):
-                    if cell: self.board[self.py+y][self.px+x] = 1
-            nb = [r for r in self.board if not all(r)]
-            cleared = self.h - len(nb)
-            self.score += cleared * 100
-            for _ in range(cleared): nb.insert(0, [0]*self.w)
-            self.board = nb
-            return self.new_piece()
+            return self.lock()
         return True
 
+    def lock(self):
+        """Fixes the piece in place, clears full rows and spawns the next piece."""
+        _, _, rows, columns, _ = ROTATIONS[self.type][self.rot]
+        board, cols = self.board, self.cols
+        for y, mask in enumerate(rows, self.py):
+            board[y] |= mask << self.px
+        for x, mask in enumerate(columns, self.px):
+            cols[x] |= mask << self.py
+        full = [y for y in range(self.py, self.py + len(rows)) if board[y] == self.full]
+        if full:
+            self.score += len(full) * 100
+            self.board = [0] * len(full) + [r for r in board if r != self.full]
+            # Drop bit y from every column, moving the bits above it down one row
+            for y in full:
+                low = (1 << y) - 1
+                self.cols = [((c & low) << 1) | (c >> (y + 1) << (y + 1)) for c in self.cols]
+        return self.new_piece()
+
     def move(self, dx, dy):
         if not self.collide(self.px + dx, self.py + dy):
             self.px += dx; self.py += dy
             return True
         return False
 
+def new_game(sh, sw, rng=None):
+    """A fresh round. The well is a fixed size whatever the screen."""
+    return Tetris(BOARD_H, BOARD_W, rng)
+
 def main(stdscr):
     curses.curs_set(0)
     stdscr.nodelay(True)
-    stdscr.timeout(1000 // FPS)
     curses.start_color()
     curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLACK)
     curses.init_pair(3, curses.COLOR_CYAN, curses.COLOR_BLACK)
+    screen = FrameBuffer(stdscr, background=draw_static)
+    clock = FrameScheduler(FPS, "tetris")
+    sim = FixedStep(TICK_RATE, "tetris")
+    # Attract mode: the placement search plays, one key per frame
+    bot = None
+    if "--autoplay" in sys.argv:
+        from tetris_ai import Autoplayer
+        bot = Autoplayer(lookahead=True)
     
     while True:
+        stdscr.nodelay(True)
         sh, sw = stdscr.getmaxyx()
-        tw, th = 10, 20
-        game = Tetris(th, tw)
-        last_fall = time.time()
+        tw, th = BOARD_W, BOARD_H
+        game = sim.start(new_game, sh, sw)
         state = "PLAYING"
+        plan, planned = [], 0
 
         while state == "PLAYING":
             key = stdscr.getch()
             if key in [ord('q'), ord('Q')]: return
-            if key == curses.KEY_LEFT: game.move(-1, 0)
-            if key == curses.KEY_RIGHT: game.move(1, 0)
-            if key == curses.KEY_UP: game.rotate()
-            if key == curses.KEY_DOWN: game.move(0, 1)
-            if key == ord(' '):
-                while game.move(0, 1): pass
-
-            if time.time() - last_fall > max(0.1, 0.6 - (game.score/2000)):
-                if not game.update(): state = "GAMEOVER"
-                last_fall = time.time()
-
-            stdscr.erase()
-            logo_x = (sw - len(LOGO_MAIN[0])) // 2
-            draw_shadow_text(stdscr, 1, logo_x, LOGO_MAIN, 1, 3)
-
-            ox, oy = (sw - tw*2) // 2, (sh - th) // 2 + 3
-            for y, r in enumerate(game.board):
-                for x, c in enumerate(r):
-                    if c: stdscr.addstr(oy+y, ox+x*2, BLOCK)
-            for y, r in enumerate(game.shape):
-                for x, c in enumerate(r):
-                    if c: stdscr.addstr(oy+game.py+y, ox+(game.px+x)*2, BLOCK)
-            
-            stdscr.addstr(oy-1, ox-1, "┏"+"━"*(tw*2)+"┓")
-            stdscr.addstr(oy+th, ox-1, "┗"+"━"*(tw*2)+"┛")
-            stdscr.addstr(oy, ox+tw*2+4, f"SCORE: {game.score}")
-            stdscr.refresh()
-
-        stdscr.addstr(sh // 2 + 5, sw // 2 - 5, "GAME OVER", curses.A_REVERSE)
-        stdscr.addstr(sh // 2 + 6, sw // 2 - 11, "Press 'R' to Restart", curses.A_BOLD)
-        stdscr.refresh()
+            if key == curses.KEY_RESIZE:
+                sh, sw = stdscr.getmaxyx()
+                sim.resize(sh, sw)
+            else:
+                if bot and key == -1:
+                    if game.pieces != planned:
+                        plan, planned = bot.keys(game), game.pieces
+                    if plan: key = plan.pop(0)
+                sim.feed(key)
+            for k in sim.ticks():
+                if not game.step(k):
+                    state = "GAMEOVER"
+                    break
+
+            if clock.render_due():
+                screen.erase()
+
+                ox, oy = (sw - tw*2) // 2, (sh - th) // 2 + 3
+                for x, y in game.cells():
+                    screen.addstr(oy+y, ox+x*2, BLOCK)
+                for y, r in enumerate(game.shape):
+                    for x, c in enumerate(r):
+                        if c: screen.addstr(oy+game.py+y, ox+(game.px+x)*2, BLOCK)
+
+                screen.addstr(oy, ox+tw*2+4, f"SCORE: {game.score}")
+                screen.addstr(oy+2, ox+tw*2+4, "NEXT:")
+                for y, r in enumerate(SHAPES[game.next]):
+                    for x, c in enumerate(r):
+                        if c: screen.addstr(oy+3+y, ox+tw*2+4+x*2, BLOCK)
+                screen.refresh()
+            clock.wait()
+
+        screen.addstr(sh // 2 + 5, sw // 2 - 5, "GAME OVER", curses.A_REVERSE)
+        screen.addstr(sh // 2 + 6, sw // 2 - 11, "Press 'R' to Restart", curses.A_BOLD)
+        screen.refresh()
+        # A replay moves on to its next recorded round by itself
+        stdscr.timeout(1000 if sim.replaying else -1)
         while True:
             key = stdscr.getch()
-            if key in [ord('r'), ord('R')]: break
+            if key in [ord('r'), ord('R')] or (key == -1 and sim.replaying): break
             if key in [ord('q'), ord('Q')]: return
 
 if __name__ == "__main__":
-    curses.wrapper(main)
\ No newline at end of file
+    curses.wrapper(main)
+    print_stats()
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""
+TETRIS AI - Placement Search Autoplayer
+Finds the best spot for the falling piece by trying every distinct
+rotation and every column it can slide to, dropping it on a copy of the
+bitboard and scoring the result on aggregate height, lines cleared,
+holes and bumpiness. With lookahead it also places the preview piece on
+each result and keeps the best pair. Used by tetris.py --autoplay for
+attract-mode demos and here for long headless soak runs.
+
+Run with: python tetris_ai.py --pieces 5000
+          python tetris_ai.py --pieces 1000 --lookahead --games 3
+"""
+
+import argparse
+import time
+
+from keys import KEY_LEFT, KEY_RIGHT, KEY_UP
+from replay import SeededRandom
+from tetris import BOARD_H, BOARD_W, ROTATIONS, SHAPES, Tetris
+
+# Board weights from the well-known near-perfect linear Tetris bot
+WEIGHTS = {"height": -0.510066, "lines": 0.760666, "holes": -0.35663, "bumpiness": -0.184483}
+FULL = (1 << BOARD_W) - 1
+FLOOR = 1 << BOARD_H
+
+
+def fits(board, x, y, width, rows):
+    if x < 0 or x + width > BOARD_W or y + len(rows) > BOARD_H:
+        return False
+    for mask in rows:
+        if board[y] & (mask << x): return False
+        y += 1
+    return True
+
+
+def placements(board, cols, piece, px, py, rot):
+    """
+    Every distinct resting place reachable by turning at (px, py), sliding
+    and hard-dropping: (turns, column, board, cols, lines cleared).
+    """
+    seen = set()
+    for turns in range(4):
+        _, width, rows, columns, bottoms = ROTATIONS[piece][(rot + turns) % 4]
+        if not fits(board, px, py, width, rows):
+            break  # rotate() would refuse this turn and every later one
+        if rows in seen:
+            continue
+        seen.add(rows)
+        lo = hi = px
+        while fits(board, lo - 1, py, width, rows): lo -= 1
+        while fits(board, hi + 1, py, width, rows): hi += 1
+        for col in range(lo, hi + 1):
+            y = BOARD_H
+            for x, b in enumerate(bottoms, col):
+                below = (cols[x] | FLOOR) >> (py + b + 1)
+                y = min(y, (below & -below).bit_length() - 1)
+            y += py
+            nb, nc = board[:], cols[:]
+            for i, mask in enumerate(rows, y):
+                nb[i] |= mask << col
+            for x, mask in enumerate(columns, col):
+                nc[x] |= mask << y
+            full = [i for i in range(y, y + len(rows)) if nb[i] == FULL]
+            if full:
+                nb = [0] * len(full) + [r for r in nb if r != FULL]
+                for i in full:
+                    low = (1 << i) - 1
+                    nc = [((c & low) << 1) | (c >> (i + 1) << (i + 1)) for c in nc]
+            yield turns, col, nb, nc, len(full)
+
+
+def evaluate(cols, lines):
+    heights = [BOARD_H - (c & -c).bit_length() + 1 if c else 0 for c in cols]
+    holes = sum(h - bin(c).count("1") for h, c in zip(heights, cols))
+    bumpiness = sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+    return (WEIGHTS["height"] * sum(heights) + WEIGHTS["lines"] * lines +
+            WEIGHTS["holes"] * holes + WEIGHTS["bumpiness"] * bumpiness)
+
+
+class Autoplayer:
+    """Picks placements for a Tetris game; searched counts boards scored, for the search rate."""
+
+    def __init__(self, lookahead=False):
+        self.lookahead = lookahead
+        self.searched = 0
+
+    def best_move(self, game):
+        """(turns, column) of the best placement, or None when nothing fits."""
+        best, move = None, None
+        spawn_x = BOARD_W // 2 - len(SHAPES[game.next][0]) // 2
+        for turns, col, board, cols, lines in placements(game.board, game.cols, game.type,
+                                                           game.px, game.py, game.rot):
+            if self.lookahead:
+                if not fits(board, spawn_x, 0, *ROTATIONS[game.next][0][1:3]):
+                    continue  # the preview piece could not even spawn
+                score = None
+                for _, _, _, cols2, lines2 in placements(board, cols, game.next, spawn_x, 0, 0):
+                    value = evaluate(cols2, lines + lines2)
+                    self.searched += 1
+                    if score is None or value > score: score = value
+                if score is None: continue
+            else:
+                score = evaluate(cols, lines)
+                self.searched += 1
+            if best is None or score > best:
+                best, move = score, (turns, col)
+        return move
+
+    def keys(self, game):
+        """The key presses that carry out the best move: turns, slides, then a hard drop."""
+        move = self.best_move(game)
+        if move is None:
+            return [ord(' ')]
+        turns, col = move
+        slide = KEY_LEFT if col < game.px else KEY_RIGHT
+        return [KEY_UP] * turns + [slide] * abs(col - game.px) + [ord(' ')]
+
+
+def play(game, bot, pieces):
+    """Plays up to `pieces` placements straight through the Tetris API. False on game over."""
+    for _ in range(pieces):
+        move = bot.best_move(game)
+        if move is None:
+            return False
+        turns, col = move
+        for _ in range(turns): game.rotate()
+        while game.px > col and game.move(-1, 0): pass
+        while game.px < col and game.move(1, 0): pass
+        game.hard_drop()
+        if not game.update():
+            return False
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Soak-run Tetris with the placement search")
+    parser.add_argument("--pieces", type=int, default=5000, help="most pieces per game")
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument("--lookahead", action="store_true", help="also search the preview piece")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    bot = Autoplayer(args.lookahead)
+    pieces = lines = 0
+    started = time.perf_counter()
+    for i in range(args.games):
+        game = Tetris(BOARD_H, BOARD_W, SeededRandom(args.seed + i))
+        alive = play(game, bot, args.pieces)
+        # game.pieces counts the piece still falling (or the one that could not spawn)
+        pieces += game.pieces - 1
+        lines += game.score // 100
+        print(f"game {i}: {game.pieces - 1} pieces, {game.score // 100} lines"
+              f"{'' if alive else ', topped out'}")
+    elapsed = time.perf_counter() - started
+    print(f"{pieces} pieces in {elapsed:.2f}s: {bot.searched / elapsed:.0f} placements searched/s, "
+          f"{pieces / elapsed:.0f} pieces/s, {lines * 60 / elapsed:.0f} lines/min "
+          f"({lines / max(1, pieces):.3f} lines/piece)")
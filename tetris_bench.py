@@ -0,0 +1,169 @@
+"""
+TETRIS BENCH - Bitboard Engine vs the List Engine
+Plays the same placements through tetris.Tetris (row bitmasks, rotation
+tables) and ListTetris, the cell-by-cell list engine it replaced, kept
+here as the reference. Reports placements per second for both, and with
+--check compares the two worlds after every placement.
+
+A placement is what a player does with one piece: turn it, slide it to
+a column, hard-drop it and lock it. Placements come from a seeded RNG,
+either anywhere (random) or at the deepest landing spot (deep, which
+clears lines often).
+
+Run with: python tetris_bench.py
+          python tetris_bench.py --check --placements 20000 --policy deep
+"""
+
+import argparse
+import time
+
+import tetris
+from replay import SeededRandom
+from tetris import BOARD_H, BOARD_W, SHAPES, Tetris
+
+
+class ListTetris:
+    """The pre-bitboard engine: a list of rows of 0/1, shapes rotated with zip()."""
+
+    def __init__(self, h, w, rng):
+        self.rng = rng
+        self.h, self.w = h, w
+        self.board = [[0]*w for _ in range(h)]
+        self.score = 0
+        self.new_piece()
+
+    def new_piece(self):
+        self.type = self.rng.choice(list(SHAPES.keys()))
+        self.shape = SHAPES[self.type]
+        self.px = self.w // 2 - len(self.shape[0]) // 2
+        self.py = 0
+        return not self.collide(self.px, self.py)
+
+    def collide(self, nx, ny, shape=None):
+        if shape is None: shape = self.shape
+        for y, row in enumerate(shape):
+            for x, cell in enumerate(row):
+                if cell:
+                    if not (0 <= nx + x < self.w and 0 <= ny + y < self.h) or self.board[ny+y][nx+x]:
+                        return True
+        return False
+
+    def rotate(self):
+        ns = [list(r) for r in zip(*self.shape[::-1])]
+        if not self.collide(self.px, self.py, ns): self.shape = ns
+
+    def hard_drop(self):
+        while self.move(0, 1): pass
+
+    def update(self):
+        if not self.move(0, 1):
+            for y, row in enumerate(self.shape):
+                for x, cell in enumerate(row):
+                    if cell: self.board[self.py+y][self.px+x] = 1
+            nb = [r for r in self.board if not all(r)]
+            cleared = self.h - len(nb)
+            self.score += cleared * 100
+            for _ in range(cleared): nb.insert(0, [0]*self.w)
+            self.board = nb
+            return self.new_piece()
+        return True
+
+    def move(self, dx, dy):
+        if not self.collide(self.px + dx, self.py + dy):
+            self.px += dx; self.py += dy
+            return True
+        return False
+
+
+def place(game, rot, col):
+    """Turns, slides, drops and locks the current piece. False on game over."""
+    for _ in range(rot): game.rotate()
+    while game.px > col and game.move(-1, 0): pass
+    while game.px < col and game.move(1, 0): pass
+    game.hard_drop()
+    return game.update()
+
+
+# --- Placement policies: (Tetris, rng) -> (turns, column) ---
+def random_spot(game, rng):
+    return rng.randrange(4), rng.randrange(BOARD_W)
+
+
+def deep_spot(game, rng):
+    """The placement whose piece lands lowest, ties broken at random."""
+    best, spots = -1, []
+    for rot in range(4):
+        _, width, rows, _, _ = tetris.ROTATIONS[game.type][rot]
+        for col in range(BOARD_W - width + 1):
+            if game.collide(col, game.py, rot): continue
+            saved = game.px, game.rot
+            game.px, game.rot = col, rot
+            depth = game.py + game.drop_distance() + len(rows)
+            game.px, game.rot = saved
+            if depth > best: best, spots = depth, []
+            if depth == best: spots.append((rot, col))
+    return rng.choice(spots) if spots else (0, game.px)
+
+
+POLICIES = {"random": random_spot, "deep": deep_spot}
+
+
+def plan(count, policy, seed=0):
+    """A fixed list of (game seed, placements) runs totalling `count` placements."""
+    runs, total, rng = [], 0, SeededRandom(seed)
+    while total < count:
+        game_seed = len(runs) + seed
+        game, spots = Tetris(BOARD_H, BOARD_W, SeededRandom(game_seed)), []
+        while total < count:
+            spot = policy(game, rng)
+            spots.append(spot)
+            total += 1
+            if not place(game, *spot): break
+        runs.append((game_seed, spots))
+    return runs
+
+
+def play(engine, runs):
+    """Seconds to play every run from scratch with one engine."""
+    started = time.perf_counter()
+    for game_seed, spots in runs:
+        game = engine(BOARD_H, BOARD_W, SeededRandom(game_seed))
+        for spot in spots:
+            place(game, *spot)
+    return time.perf_counter() - started
+
+
+def check(runs):
+    """First placement where the two engines disagree, or None."""
+    for game_seed, spots in runs:
+        a = Tetris(BOARD_H, BOARD_W, SeededRandom(game_seed))
+        b = ListTetris(BOARD_H, BOARD_W, SeededRandom(game_seed))
+        for i, spot in enumerate(spots):
+            alive = place(a, *spot), place(b, *spot)
+            rows = [[row >> x & 1 for x in range(BOARD_W)] for row in a.board]
+            cols = [sum(b.board[y][x] << y for y in range(BOARD_H)) for x in range(BOARD_W)]
+            if (rows, a.cols, a.shape, a.px, a.py, a.score) != (b.board, cols, b.shape, b.px, b.py, b.score) \
+                    or alive[0] != alive[1]:
+                return f"seed {game_seed} placement {i}: engines differ"
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the bitboard and list Tetris engines")
+    parser.add_argument("--placements", type=int, default=20000)
+    parser.add_argument("--policy", choices=POLICIES, default="deep")
+    parser.add_argument("--check", action="store_true", help="compare worlds after every placement")
+    args = parser.parse_args()
+
+    runs = plan(args.placements, POLICIES[args.policy])
+    if args.check:
+        error = check(runs)
+        print(error or f"{args.placements} placements over {len(runs)} games: engines agree")
+        raise SystemExit(1 if error else 0)
+
+    print(f"{args.placements} {args.policy} placements over {len(runs)} games")
+    base = None
+    for name, engine in [("list", ListTetris), ("bitboard", Tetris)]:
+        rate = args.placements / play(engine, runs)
+        base = base or rate
+        print(f"  {name:<9}{rate:>10.0f} placements/s  {rate / base:>5.1f}x")
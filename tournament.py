@@ -0,0 +1,231 @@
+"""
+TOURNAMENT - Multiprocess Headless Episode Runner
+Plays thousands of episodes of a game with a bot policy and no screen,
+spread over a process pool, and reports score and episode-length
+distributions with episodes per second. Module constants can be
+overridden for a run (--set), which is how the difficulty curves in
+dino2.py (SPAWN_TICKS, SPEED_*, CACTI_PER_SPEED) and tetris.py (FALL_*) get tuned.
+
+Episode i is seeded with --seed + i, so results do not depend on the
+number of workers or the order episodes finish in.
+
+A policy is any function policy(game, rng) -> key, called once per tick
+with the world and a seeded RNG of its own. Built-ins are listed in
+POLICIES; anything else is loaded as module:function.
+
+Run with: python tournament.py dino2 --episodes 5000 --policy jumper
+          python tournament.py dino2 --policy jumper --set SPAWN_TICKS=30,60 --set SPEED_MAX=6
+          python tournament.py tetris --episodes 2000 --scaling
+          python tournament.py snake --policy mybots:greedy
+"""
+
+import argparse
+import ast
+import importlib
+import json
+import multiprocessing
+import os
+import statistics
+import time
+
+from keys import KEY_DOWN, KEY_LEFT, KEY_RIGHT, KEY_UP
+from replay import SeededRandom
+from runtime import percentile
+
+# --- Policies ---
+RANDOM_KEYS = [KEY_UP, KEY_DOWN, KEY_LEFT, KEY_RIGHT,
+               ord(' '), ord('w'), ord('s')]
+
+
+def idle(game, rng):
+    return -1
+
+
+def random_keys(game, rng):
+    """Presses a random game key on a fifth of the ticks."""
+    return rng.choice(RANDOM_KEYS) if rng.random() < 0.2 else -1
+
+
+def jumper(game, rng):
+    """Dino: jumps when the nearest cactus ahead is within reach at the current speed."""
+    dino = game.dino
+    for obs in game.obstacles:
+        gap = obs.x - (dino.x + 12)
+        if 0 <= gap <= game.speed * 4:
+            return ord(' ')
+    return -1
+
+
+def tracker(game, rng):
+    """Pong (left paddle) and Breakout: keeps the paddle under the ball."""
+    if hasattr(game, "p1_y"):
+        if game.by < game.p1_y + 1: return ord('w')
+        if game.by > game.p1_y + 3: return ord('s')
+        return -1
+    if game.bx < game.px + 2: return KEY_LEFT
+    if game.bx > game.px + 4: return KEY_RIGHT
+    return -1
+
+
+POLICIES = {"idle": idle, "random": random_keys, "jumper": jumper, "tracker": tracker}
+
+
+def load_policy(spec):
+    if spec in POLICIES:
+        return POLICIES[spec]
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def score_of(game):
+    """Points scored in a finished world (the left player's, for Pong)."""
+    return game.score if hasattr(game, "score") else game.s1
+
+
+# --- Workers ---
+_worker = None
+
+
+def init_worker(game, overrides, policy, size, max_ticks):
+    global _worker
+    module = importlib.import_module(game)
+    for name, value in overrides.items():
+        setattr(module, name, value)
+    _worker = (module, load_policy(policy), size, max_ticks)
+
+
+def play(seed):
+    """One episode -> (score, ticks, timed_out)."""
+    module, policy, (sh, sw), max_ticks = _worker
+    game = module.new_game(sh, sw, SeededRandom(seed))
+    bot_rng = SeededRandom(~seed)
+    ticks = 0
+    while ticks < max_ticks:
+        ticks += 1
+        if not game.step(policy(game, bot_rng)):
+            return score_of(game), ticks, False
+    return score_of(game), ticks, True
+
+
+def play_batch(seeds):
+    return [play(seed) for seed in seeds]
+
+
+def run(game, episodes, workers, policy="random", overrides=None, size=(30, 100),
+        max_ticks=20000, seed=0, chunk=16):
+    """Plays `episodes` episodes on `workers` processes. Returns (results, seconds)."""
+    initargs = (game, overrides or {}, policy, size, max_ticks)
+    seeds = range(seed, seed + episodes)
+    chunks = [seeds[i : i + chunk] for i in range(0, episodes, chunk)]
+    start = time.perf_counter()
+    if workers == 1:
+        init_worker(*initargs)
+        results = [r for c in chunks for r in play_batch(c)]
+    else:
+        with multiprocessing.Pool(workers, initializer=init_worker, initargs=initargs) as pool:
+            results = [r for batch in pool.imap_unordered(play_batch, chunks) for r in batch]
+    return results, time.perf_counter() - start
+
+
+def summarize(results, elapsed):
+    scores = [r[0] for r in results]
+    lengths = [r[1] for r in results]
+    return {
+        "episodes": len(results),
+        "seconds": elapsed,
+        "episodes_per_s": len(results) / elapsed,
+        "ticks_per_s": sum(lengths) / elapsed,
+        "timeouts": sum(1 for r in results if r[2]),
+        "score": {
+            "mean": statistics.fmean(scores),
+            "stdev": statistics.pstdev(scores),
+            "p10": percentile(scores, 10),
+            "p50": percentile(scores, 50),
+            "p90": percentile(scores, 90),
+            "p99": percentile(scores, 99),
+            "max": max(scores),
+        },
+        "ticks": {
+            "mean": statistics.fmean(lengths),
+            "p50": percentile(lengths, 50),
+            "p99": percentile(lengths, 99),
+            "max": max(lengths),
+        },
+    }
+
+
+def histogram(values, bins=10, width=40):
+    lo, hi = min(values), max(values)
+    step = (hi - lo) / bins or 1
+    counts = [0] * bins
+    for v in values:
+        counts[min(bins - 1, int((v - lo) / step))] += 1
+    top = max(counts)
+    return [f"{lo + i * step:>10.1f} {'█' * round(c * width / top):<{width}} {c}"
+            for i, c in enumerate(counts)]
+
+
+def parse_set(text):
+    """'SPAWN_TICKS=30,60' -> ('SPAWN_TICKS', (30, 60))"""
+    name, _, value = text.partition("=")
+    return name, ast.literal_eval(value)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run many headless episodes with a bot policy")
+    parser.add_argument("game", help="game module, e.g. dino2 or tetris.py")
+    parser.add_argument("--episodes", type=int, default=1000)
+    parser.add_argument("--policy", default="random", help=f"{', '.join(POLICIES)} or module:function")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="override a game module constant (repeatable)")
+    parser.add_argument("--size", default="30x100", help="screen size as ROWSxCOLS")
+    parser.add_argument("--max-ticks", type=int, default=20000, help="end an episode after this many ticks")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first episode")
+    parser.add_argument("--scaling", action="store_true", help="repeat with 1, 2, 4, ... workers")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    game = args.game[:-3] if args.game.endswith(".py") else args.game
+    module = importlib.import_module(game)
+    overrides = dict(parse_set(s) for s in args.set)
+    for name in overrides:
+        if not hasattr(module, name):
+            parser.error(f"{game} has no constant {name}")
+    size = tuple(int(n) for n in args.size.lower().split("x"))
+    options = dict(policy=args.policy, overrides=overrides, size=size,
+                   max_ticks=args.max_ticks, seed=args.seed)
+
+    if args.scaling:
+        counts, n = [], 1
+        while n < args.workers:
+            counts.append(n)
+            n *= 2
+        counts.append(args.workers)
+        base = None
+        print(f"{'WORKERS':>8}{'EPISODES/S':>12}{'TICKS/S':>12}{'SPEEDUP':>9}")
+        for workers in counts:
+            report = summarize(*run(game, args.episodes, workers, **options))
+            base = base or report["episodes_per_s"]
+            print(f"{workers:>8}{report['episodes_per_s']:>12.1f}{report['ticks_per_s']:>12.0f}"
+                  f"{report['episodes_per_s'] / base:>8.2f}x")
+        raise SystemExit
+
+    results, elapsed = run(game, args.episodes, args.workers, **options)
+    report = summarize(results, elapsed)
+    report.update(game=game, policy=args.policy, workers=args.workers, overrides=overrides)
+
+    s, t = report["score"], report["ticks"]
+    print(f"{game} / {args.policy}: {report['episodes']} episodes on {args.workers} workers in "
+          f"{elapsed:.2f}s ({report['episodes_per_s']:.1f} episodes/s, {report['ticks_per_s']:.0f} ticks/s)")
+    if overrides:
+        print(f"  overrides: {overrides}")
+    print(f"  score  mean {s['mean']:.1f} (sd {s['stdev']:.1f})  p10 {s['p10']}  p50 {s['p50']}  "
+          f"p90 {s['p90']}  p99 {s['p99']}  max {s['max']}")
+    print(f"  ticks  mean {t['mean']:.0f}  p50 {t['p50']}  p99 {t['p99']}  max {t['max']}  "
+          f"({report['timeouts']} hit --max-ticks)")
+    for line in histogram([r[0] for r in results]):
+        print(line)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, default=list)